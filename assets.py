@@ -0,0 +1,55 @@
+import hashlib
+import os
+
+from flask import current_app, request, url_for
+
+# Fingerprinted URLs never change content, so browsers may keep them for a year
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", str(365 * 24 * 3600)))
+
+_fingerprints = {}
+
+
+# --- Fingerprinting ---
+# static_url('css/login.css') -> /static/css/login.css?v=<content hash>.
+# A deploy that changes the file changes the URL, so the far-future
+# Cache-Control below never serves a stale stylesheet.
+def fingerprint(filename):
+    path = os.path.join(current_app.static_folder, filename)
+    if current_app.debug:
+        # Edits show up without a restart while developing
+        return file_hash(path)
+    digest = _fingerprints.get(path)
+    if digest is None:
+        digest = _fingerprints[path] = file_hash(path)
+    return digest
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def static_url(filename):
+    return url_for("static", filename=filename, v=fingerprint(filename))
+
+
+def cache_static(response):
+    if request.endpoint != "static" or response.status_code not in (200, 304):
+        return response
+
+    version = request.args.get("v")
+    if version and version == fingerprint(request.view_args["filename"]):
+        response.cache_control.no_cache = False
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        # Unversioned or outdated URL: let the browser revalidate
+        response.cache_control.public = True
+        response.cache_control.no_cache = True
+    return response
+
+
+def init_app(app):
+    app.add_template_global(static_url)
+    app.after_request(cache_static)
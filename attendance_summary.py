@@ -0,0 +1,247 @@
+import os
+
+import business_time
+
+# Clock-ins after this time of day count as late (HH:MM, business local time)
+WORK_START_TIME = os.getenv("WORK_START_TIME", "08:00")
+
+# Upsert tail shared by every incremental update: the VALUES/SELECT supplies
+# deltas and they are added onto the existing (day, role) row.
+UPSERT_DELTAS = """
+    ON CONFLICT (day, role) DO UPDATE SET
+        present = daily_attendance_summary.present + EXCLUDED.present,
+        late = daily_attendance_summary.late + EXCLUDED.late,
+        open_sessions = daily_attendance_summary.open_sessions + EXCLUDED.open_sessions,
+        closed_sessions = daily_attendance_summary.closed_sessions + EXCLUDED.closed_sessions
+"""
+
+# One row per employee per day: the building block for rebuilds and for
+# removing a deleted employee's contribution.
+PER_EMPLOYEE_DAYS = """
+    SELECT DATE(a.clockIn) AS day, LOWER(e.role) AS role, a.employee_id,
+           (MIN(a.clockIn)::time > %(start_time)s::time) AS is_late,
+           COUNT(*) FILTER (WHERE a.clockOut IS NULL) AS open_sessions,
+           COUNT(*) FILTER (WHERE a.clockOut IS NOT NULL) AS closed_sessions
+    FROM AttendanceRegister a
+    JOIN MaxeloClientTable e ON e.id = a.employee_id
+    WHERE a.clockIn IS NOT NULL {where}
+    GROUP BY DATE(a.clockIn), LOWER(e.role), a.employee_id
+"""
+
+
+# --- Incremental maintenance (call inside the writer's transaction) ---
+def record_clock_in(cur, employee_id, clock_in):
+    # Must run before the AttendanceRegister INSERT so "first clock-in of the
+    # day" can be decided from the existing rows. The employee row lock makes
+    # a concurrent clock-in by the same employee wait until this transaction
+    # commits, so only one of them sees no earlier row and counts as present.
+    cur.execute("SELECT id FROM MaxeloClientTable WHERE id = %s FOR UPDATE", (employee_id,))
+    cur.execute("""
+        INSERT INTO daily_attendance_summary (day, role, present, late, open_sessions, closed_sessions)
+        SELECT day, LOWER(e.role),
+               is_first::int,
+               (is_first AND %(clock_in)s::timestamptz::time > %(start_time)s::time)::int,
+               1, 0
+        FROM MaxeloClientTable e,
+             LATERAL (SELECT %(clock_in)s::timestamptz::date AS day) d,
+             LATERAL (
+                 SELECT NOT EXISTS (
+                     SELECT 1 FROM AttendanceRegister
+                     WHERE employee_id = %(employee_id)s
+                       AND clockIn >= d.day AND clockIn < d.day + 1
+                 ) AS is_first
+             ) f
+        WHERE e.id = %(employee_id)s
+    """ + UPSERT_DELTAS, {
+        "employee_id": employee_id,
+        "clock_in": clock_in,
+        "start_time": WORK_START_TIME,
+    })
+
+
+# Set-based record_clock_in for a batch of (employee_id, clock_in) pairs,
+# with the same must-run-before-the-INSERT rule. Batches can be backfills
+# (kiosks), so a clock-in may come before the day's existing first one:
+# lateness is re-decided from the earlier of the two.
+def record_clock_ins(cur, rows):
+    if not rows:
+        return
+    # Same employee row locks as record_clock_in, taken in id order so two
+    # batches can't deadlock on each other
+    cur.execute("SELECT id FROM MaxeloClientTable WHERE id = ANY(%s) ORDER BY id FOR UPDATE",
+                (sorted({employee_id for employee_id, _ in rows}),))
+    cur.execute("""
+        INSERT INTO daily_attendance_summary (day, role, present, late, open_sessions, closed_sessions)
+        SELECT b.day, LOWER(e.role),
+               COUNT(*) FILTER (WHERE f.first_in IS NULL),
+               COUNT(*) FILTER (WHERE LEAST(f.first_in, b.first_in)::time > %(start_time)s::time)
+                 - COUNT(*) FILTER (WHERE f.first_in::time > %(start_time)s::time),
+               SUM(b.sessions), 0
+        FROM (
+            SELECT employee_id, clock_in::date AS day, MIN(clock_in) AS first_in, COUNT(*) AS sessions
+            FROM unnest(%(employee_ids)s::bigint[], %(clock_ins)s::timestamptz[]) AS v(employee_id, clock_in)
+            GROUP BY employee_id, clock_in::date
+        ) b
+        JOIN MaxeloClientTable e ON e.id = b.employee_id,
+        LATERAL (
+            SELECT MIN(clockIn) AS first_in FROM AttendanceRegister
+            WHERE employee_id = b.employee_id
+              AND clockIn >= b.day AND clockIn < b.day + 1
+        ) f
+        GROUP BY b.day, LOWER(e.role)
+    """ + UPSERT_DELTAS, {
+        "employee_ids": [employee_id for employee_id, _ in rows],
+        "clock_ins": [clock_in for _, clock_in in rows],
+        "start_time": WORK_START_TIME,
+    })
+
+
+def record_clock_out(cur, employee_id, clock_in):
+    # clock_in is the closed session's start; the session counts on that day
+    cur.execute("""
+        INSERT INTO daily_attendance_summary (day, role, present, late, open_sessions, closed_sessions)
+        SELECT DATE(%s::timestamptz), LOWER(e.role), 0, 0, -1, 1
+        FROM MaxeloClientTable e
+        WHERE e.id = %s
+    """ + UPSERT_DELTAS, (clock_in, employee_id))
+
+
+# Set-based record_clock_out for many closed sessions: [(employee_id, clock_in)]
+def record_clock_outs(cur, rows):
+    if not rows:
+        return
+    cur.execute("""
+        INSERT INTO daily_attendance_summary (day, role, present, late, open_sessions, closed_sessions)
+        SELECT v.clock_in::date, LOWER(e.role), 0, 0, -COUNT(*), COUNT(*)
+        FROM unnest(%(employee_ids)s::bigint[], %(clock_ins)s::timestamptz[]) AS v(employee_id, clock_in)
+        JOIN MaxeloClientTable e ON e.id = v.employee_id
+        GROUP BY v.clock_in::date, LOWER(e.role)
+    """ + UPSERT_DELTAS, {
+        "employee_ids": [employee_id for employee_id, _ in rows],
+        "clock_ins": [clock_in for _, clock_in in rows],
+    })
+
+
+def adjust_headcount(cur, role, delta):
+    cur.execute("""
+        INSERT INTO role_headcount (role, headcount) VALUES (LOWER(%s), %s)
+        ON CONFLICT (role) DO UPDATE SET headcount = role_headcount.headcount + EXCLUDED.headcount
+    """, (role, delta))
+
+
+def record_role_change(cur, employee_id, new_role):
+    # Must run before the UPDATE. Moves headcount and the employee's past
+    # daily contributions to the new role, matching what a rebuild produces.
+    cur.execute("SELECT LOWER(role) FROM MaxeloClientTable WHERE id = %s", (employee_id,))
+    row = cur.fetchone()
+    if not row or row[0] == new_role.lower():
+        return
+
+    adjust_headcount(cur, row[0], -1)
+    adjust_headcount(cur, new_role, 1)
+
+    params = {"employee_id": employee_id, "start_time": WORK_START_TIME, "new_role": new_role}
+    per_employee = PER_EMPLOYEE_DAYS.format(where="AND a.employee_id = %(employee_id)s")
+    cur.execute("""
+        INSERT INTO daily_attendance_summary (day, role, present, late, open_sessions, closed_sessions)
+        SELECT p.day, r.role, sign * 1, sign * p.is_late::int,
+               sign * p.open_sessions, sign * p.closed_sessions
+        FROM (""" + per_employee + """) p,
+             LATERAL (VALUES (p.role, -1), (LOWER(%(new_role)s), 1)) AS r(role, sign)
+    """ + UPSERT_DELTAS, params)
+
+
+def record_employee_deleted(cur, employee_id):
+    # Must run before the DELETE: subtracts the employee's per-day contribution
+    # (their attendance rows disappear with ON DELETE CASCADE) and headcount.
+    cur.execute("""
+        UPDATE daily_attendance_summary s SET
+            present = s.present - 1,
+            late = s.late - p.is_late::int,
+            open_sessions = s.open_sessions - p.open_sessions,
+            closed_sessions = s.closed_sessions - p.closed_sessions
+        FROM (""" + PER_EMPLOYEE_DAYS.format(where="AND a.employee_id = %(employee_id)s") + """) p
+        WHERE s.day = p.day AND s.role = p.role
+    """, {"employee_id": employee_id, "start_time": WORK_START_TIME})
+
+    cur.execute("""
+        UPDATE role_headcount h SET headcount = h.headcount - 1
+        FROM MaxeloClientTable e
+        WHERE e.id = %s AND h.role = LOWER(e.role)
+    """, (employee_id,))
+
+
+# --- Reads ---
+def dashboard_counts(cur, day, roles=("employee", "intern", "admin")):
+    cur.execute("""
+        SELECT
+            (SELECT COALESCE(SUM(headcount), 0) FROM role_headcount WHERE role = ANY(%(roles)s)),
+            COALESCE(SUM(present), 0), COALESCE(SUM(late), 0),
+            COALESCE(SUM(open_sessions), 0), COALESCE(SUM(closed_sessions), 0)
+        FROM daily_attendance_summary
+        WHERE day = %(day)s AND role = ANY(%(roles)s)
+    """, {"day": day, "roles": list(roles)})
+    employees, present, late, open_sessions, closed_sessions = cur.fetchone()
+    return {
+        "employees": employees,
+        "present": present,
+        "late": late,
+        "open": open_sessions,
+        "closed": closed_sessions,
+    }
+
+
+# --- Rebuild from the raw tables ---
+# Maintenance only (commands, migrations, benches), never on a clock event.
+# Rebuilds take a transaction-level advisory lock so two never interleave,
+# and upsert so a clock-in committed between the DELETE and the INSERT
+# doesn't fail the rebuild on the primary key.
+REBUILD_LOCK_ID = 7_200_2024
+
+
+# start/end are inclusive dates; None means unbounded on that side.
+def rebuild_summary(cur, start=None, end=None):
+    cur.execute("SELECT pg_advisory_xact_lock(%s)", (REBUILD_LOCK_ID,))
+    summary_clauses, raw_clauses = ["TRUE"], [""]
+    params = {"start_time": WORK_START_TIME}
+    if start is not None:
+        summary_clauses.append("day >= %(start)s")
+        raw_clauses.append("a.clockIn >= %(start_at)s")
+        params["start"] = start
+        params["start_at"] = business_time.start_of_day(start)
+    if end is not None:
+        summary_clauses.append("day <= %(end)s")
+        raw_clauses.append("a.clockIn < %(end_at)s")
+        params["end"] = end
+        params["end_at"] = business_time.day_bounds(end)[1]
+
+    where_summary = " AND ".join(summary_clauses)
+    where_raw = " AND ".join(raw_clauses)
+
+    cur.execute(f"DELETE FROM daily_attendance_summary WHERE {where_summary}", params)
+    cur.execute("""
+        INSERT INTO daily_attendance_summary (day, role, present, late, open_sessions, closed_sessions)
+        SELECT day, role, COUNT(*), COUNT(*) FILTER (WHERE is_late),
+               SUM(open_sessions), SUM(closed_sessions)
+        FROM (""" + PER_EMPLOYEE_DAYS.format(where=where_raw) + """) p
+        GROUP BY day, role
+        ON CONFLICT (day, role) DO UPDATE SET
+            present = EXCLUDED.present,
+            late = EXCLUDED.late,
+            open_sessions = EXCLUDED.open_sessions,
+            closed_sessions = EXCLUDED.closed_sessions
+    """, params)
+    rebuilt = cur.rowcount
+
+    rebuild_headcount(cur)
+    return rebuilt
+
+
+def rebuild_headcount(cur):
+    cur.execute("SELECT pg_advisory_xact_lock(%s)", (REBUILD_LOCK_ID,))
+    cur.execute("DELETE FROM role_headcount")
+    cur.execute("""
+        INSERT INTO role_headcount (role, headcount)
+        SELECT LOWER(role), COUNT(*) FROM MaxeloClientTable GROUP BY LOWER(role)
+        ON CONFLICT (role) DO UPDATE SET headcount = EXCLUDED.headcount
+    """)
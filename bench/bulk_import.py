@@ -0,0 +1,108 @@
+"""Rows per second: CSV bulk import versus the one-form-per-employee path.
+
+Runs against the database in DATABASE_URL (use a scratch database). Both
+paths insert N synthetic employees, which are deleted again afterwards.
+
+    python bench/bulk_import.py --rows 200 --output bulk_import.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+from attendance_summary import rebuild_headcount  # noqa: E402
+from employee_import import IMPORT_COLUMNS, import_employees  # noqa: E402
+
+PREFIX = "bench-import"
+
+
+def make_rows(n, tag):
+    for i in range(n):
+        yield {
+            "names": f"Bench{i}",
+            "surname": tag,
+            "phoneNumber": f"{tag[:2]}{i:010d}",
+            "email": f"{PREFIX}-{tag}-{i}@example.com",
+            "password": "secret1",
+            "role": "intern",
+            "position": "Intern",
+        }
+
+
+def single_insert_path(conn, rows):
+    # Mirrors add_employee: email check, phone check, INSERT, commit per person
+    cur = conn.cursor()
+    for row in rows:
+        cur.execute("SELECT id FROM MaxeloClientTable WHERE email = %s", (row["email"],))
+        cur.fetchone()
+        cur.execute("SELECT id FROM MaxeloClientTable WHERE phoneNumber = %s", (row["phoneNumber"],))
+        cur.fetchone()
+        cur.execute(
+            """
+            INSERT INTO MaxeloClientTable
+            (names, surname, phoneNumber, email, password, role, position)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            tuple(row[c] for c in IMPORT_COLUMNS),
+        )
+        conn.commit()
+    cur.close()
+
+
+def bulk_path(conn, rows):
+    lines = [",".join(IMPORT_COLUMNS)]
+    lines += [",".join(row[c] for c in IMPORT_COLUMNS) for row in rows]
+    imported, errors = import_employees(conn, "\n".join(lines))
+    if errors:
+        raise RuntimeError(f"unexpected import errors: {errors[:3]}")
+
+
+def cleanup(conn):
+    cur = conn.cursor()
+    cur.execute("DELETE FROM MaxeloClientTable WHERE email LIKE %s", (f"{PREFIX}-%",))
+    rebuild_headcount(cur)
+    conn.commit()
+    cur.close()
+
+
+def timed(fn, conn, rows):
+    started = time.perf_counter()
+    fn(conn, rows)
+    elapsed = time.perf_counter() - started
+    return {"rows": len(rows), "seconds": elapsed, "rows_per_second": len(rows) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    try:
+        cleanup(conn)
+        single = timed(single_insert_path, conn, list(make_rows(args.rows, "s1")))
+        bulk = timed(bulk_path, conn, list(make_rows(args.rows, "b1")))
+    finally:
+        cleanup(conn)
+        conn.close()
+
+    result = {
+        "benchmark": "bulk_import",
+        "single_insert": single,
+        "bulk_import": bulk,
+        "speedup": bulk["rows_per_second"] / single["rows_per_second"],
+    }
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Commits per second: batched (write-behind) clock-ins versus one commit each.
+
+Simulates a shift-start rush: --concurrency threads each clock in a distinct
+seeded employee (bench/seed.py) on a fixed day far in the future. The
+direct path mirrors /clock_in (pooled connection, rollup upsert, INSERT,
+commit per request); the batched path submits to clock_writer's flusher.
+The rows and that day's summary are removed afterwards.
+
+    python bench/clock_in_batching.py --events 2000 --concurrency 64 --output batching.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import attendance_summary  # noqa: E402
+import clock_writer  # noqa: E402
+import db  # noqa: E402
+from seed import EMAIL_DOMAIN  # noqa: E402
+
+BENCH_DAY = date(2099, 1, 5)
+NOTES = "(bench) clock-in batching"
+
+
+def employee_ids(conn, n):
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM MaxeloClientTable WHERE email LIKE %s ORDER BY id LIMIT %s",
+                (f"%@{EMAIL_DOMAIN}", n))
+    ids = [row[0] for row in cur.fetchall()]
+    cur.close()
+    if len(ids) < n:
+        raise SystemExit(f"need {n} seeded employees, found {len(ids)}; run bench/seed.py first")
+    return ids
+
+
+def cleanup(conn):
+    cur = conn.cursor()
+    cur.execute("DELETE FROM AttendanceRegister WHERE clockIn >= %s AND clockIn < %s AND notes = %s",
+                (BENCH_DAY, BENCH_DAY + timedelta(days=1), NOTES))
+    attendance_summary.rebuild_summary(cur, BENCH_DAY, BENCH_DAY)
+    conn.commit()
+    cur.close()
+
+
+def direct_clock_in(employee_id, clock_in):
+    pool = db.get_pool()
+    conn = pool.getconn()
+    try:
+        cur = conn.cursor()
+        attendance_summary.record_clock_in(cur, employee_id, clock_in)
+        cur.execute("INSERT INTO AttendanceRegister (employee_id, clockIn, notes) VALUES (%s, %s, %s)",
+                    (employee_id, clock_in, NOTES))
+        conn.commit()
+        cur.close()
+    finally:
+        pool.putconn(conn)
+
+
+def run(name, submit, count_commits, ids, events, concurrency):
+    clock_ins = [(ids[i % len(ids)], f"{BENCH_DAY} 07:{(i // len(ids)) % 60:02d}") for i in range(events)]
+    latencies = []
+
+    def one(args):
+        started = time.perf_counter()
+        submit(*args)
+        latencies.append(time.perf_counter() - started)
+
+    commits_before = count_commits()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, clock_ins))
+    elapsed = time.perf_counter() - started
+    commit_count = count_commits() - commits_before
+
+    latencies.sort()
+    return {
+        "path": name,
+        "events": events,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(events / elapsed, 1),
+        "commits": commit_count,
+        "commits_per_second": round(commit_count / elapsed, 1),
+        "events_per_commit": round(events / max(commit_count, 1), 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=clock_writer.CLOCK_IN_BATCH_SIZE)
+    parser.add_argument("--window-ms", type=float, default=clock_writer.CLOCK_IN_BATCH_WINDOW_MS)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    # The direct path is bounded by the pool, as it is in a worker
+    os.environ.setdefault("DB_POOL_MAX", str(min(args.concurrency, 20)))
+
+    stats_conn = db.connect()
+    ids = employee_ids(stats_conn, min(args.events, args.concurrency * 4))
+    batcher = clock_writer.ClockInBatcher(batch_size=args.batch_size, window_ms=args.window_ms)
+
+    results = []
+    try:
+        cleanup(stats_conn)
+        # One commit per request on the direct path
+        results.append(run("direct", direct_clock_in, lambda: db.get_pool().checkouts,
+                           ids, args.events, args.concurrency))
+        cleanup(stats_conn)
+        results.append(run("batched", lambda e, t: batcher.submit(e, t, NOTES),
+                           lambda: batcher.batches,
+                           ids, args.events, args.concurrency))
+    finally:
+        cleanup(stats_conn)
+        stats_conn.close()
+
+    result = {
+        "concurrency": args.concurrency,
+        "pool_max": int(os.environ["DB_POOL_MAX"]),
+        "batch_size": args.batch_size,
+        "window_ms": args.window_ms,
+        "batches": batcher.batches,
+        "results": results,
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Clock-in rush load test: throughput, latency percentiles, queries/request.
+
+Drives the Flask app in-process (default) or a running server (--url)
+with a shift-start mix. Users come from bench/seed.py, so seed first:
+
+    python bench/seed.py --employees 500 --months 24
+    python bench/load.py --users 200 --concurrency 8 --output load.json
+
+Scenarios run in order: login storm, clock_in burst, employee dashboard,
+clock_out burst, admin dashboard, register. Each reports requests/s,
+p50/p95/p99 latency and queries per request (from the Server-Timing
+header). JSON output includes the git commit so runs can be compared.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from seed import EMAIL_DOMAIN, PASSWORD, bench_email  # noqa: E402
+
+QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+# --- Clients ---
+class InProcessClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None):
+        response = self.client.open(path, method=method, data=data)
+        return response.status_code, response.headers.get("Server-Timing", "")
+
+
+class HttpClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), NoRedirect())
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(req) as response:
+                response.read()
+                return response.status, response.headers.get("Server-Timing", "")
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get("Server-Timing", "")
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+# --- Measurement ---
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_scenario(name, calls, concurrency):
+    # calls: list of (client, method, path, data)
+    def one(call):
+        client, method, path, data = call
+        started = time.perf_counter()
+        status, timing = client.request(method, path, data)
+        elapsed = time.perf_counter() - started
+        match = QUERIES_RE.search(timing)
+        return elapsed, status, int(match.group(1)) if match else None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, calls))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(s[0] * 1000 for s in samples)
+    queries = [s[2] for s in samples if s[2] is not None]
+    result = {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s[1] >= 400),
+        "seconds": wall,
+        "requests_per_second": len(samples) / wall if wall else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "queries_per_request": sum(queries) / len(queries) if queries else None,
+    }
+    print(f"{name:<22} {result['requests']:>6} req  {result['requests_per_second'] or 0:>8.1f} req/s  "
+          f"p50 {result['p50_ms']:.1f}  p95 {result['p95_ms']:.1f}  p99 {result['p99_ms']:.1f} ms  "
+          f"q/req {result['queries_per_request'] if queries else '-'}  errors {result['errors']}")
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--admin-requests", type=int, default=50)
+    parser.add_argument("--url", help="base URL of a running server (default: in-process)")
+    parser.add_argument("--admin-email", default="admin@maxelo.com")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.url:
+        def make_client():
+            return HttpClient(args.url)
+    else:
+        from app import create_app
+        app = create_app()
+
+        def make_client():
+            return InProcessClient(app)
+
+    users = [make_client() for _ in range(args.users)]
+    admin = make_client()
+    emails = [bench_email(i) for i in range(args.users)]
+
+    scenarios = {}
+    scenarios["login_storm"] = run_scenario("login storm", [
+        (c, "POST", "/login", {"email": email, "password": PASSWORD, "user_type": "employee"})
+        for c, email in zip(users, emails)
+    ], args.concurrency)
+    scenarios["clock_in"] = run_scenario("clock_in burst", [
+        (c, "POST", "/clock_in", {"attendanceType": "Office", "notes": "load test"}) for c in users
+    ], args.concurrency)
+    scenarios["employee_dashboard"] = run_scenario("employee dashboard", [
+        (c, "GET", "/dashboard/employee", None) for c in users for _ in range(2)
+    ], args.concurrency)
+    scenarios["clock_out"] = run_scenario("clock_out burst", [
+        (c, "POST", "/clock_out", None) for c in users
+    ], args.concurrency)
+
+    admin.request("POST", "/login", {"email": args.admin_email, "password": args.admin_password,
+                                     "user_type": "admin"})
+    scenarios["admin_dashboard"] = run_scenario("admin dashboard", [
+        (admin, "GET", "/dashboard/admin", None) for _ in range(args.admin_requests)
+    ], args.concurrency)
+    scenarios["register"] = run_scenario("register", [
+        (admin, "GET", "/register", None) for _ in range(args.admin_requests)
+    ], args.concurrency)
+
+    result = {
+        "benchmark": "clock_in_rush",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "target": args.url or "in-process",
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "user_domain": EMAIL_DOMAIN,
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(result, indent=2) + "\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Wall time of the payroll attendance report over a date range.
+
+Runs against the database in DATABASE_URL. Seed it first with bench/seed.py
+so there are enough employees and sessions to make the numbers meaningful.
+
+    python bench/payroll_report.py --start 2026-07-01 --end 2026-09-30 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+import reports  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat, required=True)
+    parser.add_argument("--role", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    cur = conn.cursor()
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        rows = reports.payroll_report(cur, args.start, args.end, role=args.role)
+        timings.append(time.perf_counter() - started)
+    conn.close()
+
+    result = {
+        "start": args.start.isoformat(),
+        "end": args.end.isoformat(),
+        "role": args.role,
+        "employees": len(rows),
+        "days_present": sum(r["days_present"] for r in rows),
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Hot repository statements: PREPAREd and executed by name versus sent inline.
+
+Runs each read statement --iterations times on one connection, once with
+the inline SQL (parsed and planned every time) and once through EXECUTE,
+against seeded employees (bench/seed.py). Reads only; nothing is written.
+
+    python bench/prepared_statements.py --iterations 2000 --output prepared.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import business_time  # noqa: E402
+import db  # noqa: E402
+import repository  # noqa: E402
+from seed import EMAIL_DOMAIN, PASSWORD  # noqa: E402
+
+
+def workload(cur, n):
+    cur.execute("SELECT id, email FROM MaxeloClientTable WHERE email LIKE %s ORDER BY id LIMIT %s",
+                (f"%@{EMAIL_DOMAIN}", n))
+    employees = cur.fetchall()
+    if not employees:
+        raise SystemExit("no seeded employees; run bench/seed.py first")
+    month_start, month_end = business_time.month_bounds(business_time.today())
+    return {
+        "employee_authenticate": lambda i: (employees[i % len(employees)][1], PASSWORD),
+        "employee_by_id": lambda i: (employees[i % len(employees)][0],),
+        "attendance_latest_open_session": lambda i: (employees[i % len(employees)][0],),
+        "attendance_month_timesheet": lambda i: (employees[i % len(employees)][0], month_start, month_end),
+    }
+
+
+def run(cur, statement, params, iterations, prepared):
+    repository.DB_PREPARED_STATEMENTS = prepared
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        repository.execute(cur, statement, params(i)).fetchall()
+        latencies.append(time.perf_counter() - started)
+    cur.connection.rollback()
+    latencies.sort()
+    return {
+        "mean_us": round(sum(latencies) / len(latencies) * 1e6, 1),
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+        "p99_us": round(latencies[int(len(latencies) * 0.99) - 1] * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    cur = conn.cursor()
+    statements = {s.name: s for s in (repository.AUTHENTICATE, repository.EMPLOYEE_BY_ID,
+                                      repository.LATEST_OPEN_SESSION, repository.MONTH_TIMESHEET)}
+    results = []
+    try:
+        for name, params in workload(cur, args.employees).items():
+            statement = statements[name]
+            # Warm up caches so both runs see the same buffer state
+            run(cur, statement, params, min(args.iterations, 100), False)
+            inline = run(cur, statement, params, args.iterations, False)
+            prepared = run(cur, statement, params, args.iterations, True)
+            results.append({
+                "statement": name,
+                "inline": inline,
+                "prepared": prepared,
+                "speedup": round(inline["mean_us"] / prepared["mean_us"], 2),
+            })
+    finally:
+        cur.close()
+        conn.close()
+
+    result = {"iterations": args.iterations, "results": results}
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
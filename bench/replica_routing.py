@@ -0,0 +1,126 @@
+"""Check read-replica routing against a primary and a streaming replica.
+
+Logs in as a seeded employee (bench/seed.py) through the Flask test client
+and reads the Server-Timing header to see which server answered each
+request. Checks that read-only routes use the replica, that a user's own
+clock-in pins their reads to the primary for READ_YOUR_WRITES_SECONDS, and
+that pausing WAL replay past REPLICA_MAX_LAG falls back to the primary.
+The clock-in it makes is removed afterwards.
+
+Two local instances, the second a streaming replica of the first:
+
+    pg_basebackup -h localhost -p 5432 -U postgres -D /tmp/replica -R -X stream
+    pg_ctl -D /tmp/replica -o "-p 5433" -l /tmp/replica.log start
+    DATABASE_READ_URL=postgresql://postgres@localhost:5433/maxelo_attendance_db \\
+        python bench/replica_routing.py --output replica.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("REPLICA_MAX_LAG", "2")
+os.environ.setdefault("REPLICA_LAG_CHECK_INTERVAL", "0")
+os.environ.setdefault("READ_YOUR_WRITES_SECONDS", "3")
+
+import attendance_summary  # noqa: E402
+import business_time  # noqa: E402
+import db  # noqa: E402
+from app import app  # noqa: E402
+from seed import EMAIL_DOMAIN, PASSWORD  # noqa: E402
+
+NOTES = "bench replica routing"
+
+
+def served_by(response):
+    timing = response.headers.get("Server-Timing", "")
+    return "replica" if ", replica" in timing else "primary"
+
+
+def cleanup(conn):
+    cur = conn.cursor()
+    cur.execute("DELETE FROM AttendanceRegister WHERE notes LIKE %s", (f"%{NOTES}",))
+    today = business_time.today()
+    attendance_summary.rebuild_summary(cur, today, today)
+    conn.commit()
+    cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--email", default=f"bench0@{EMAIL_DOMAIN}")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    if db.get_read_database_url() is None:
+        raise SystemExit("set DATABASE_READ_URL to the replica first")
+
+    client = app.test_client()
+    login = client.post("/login", data={"email": args.email, "password": PASSWORD, "user_type": "employee"})
+    if login.status_code != 302 or "/dashboard/employee" not in login.location:
+        raise SystemExit(f"could not log in as {args.email}; run bench/seed.py first")
+
+    primary = db.connect()
+    replica = db.connect(db.get_read_database_url())
+    replica.autocommit = True
+    checks = {}
+    try:
+        checks["register_on_replica"] = served_by(client.get("/register"))
+        checks["search_on_replica"] = served_by(client.get("/api/employees/search?q=bench"))
+
+        client.post("/clock_in", data={"attendanceType": "Office", "notes": NOTES})
+        response = client.get("/dashboard/employee")
+        checks["dashboard_after_clock_in"] = served_by(response)
+        checks["dashboard_shows_clock_in"] = NOTES in response.get_data(as_text=True)
+
+        time.sleep(db.READ_YOUR_WRITES_SECONDS + 0.5)
+        checks["register_after_window"] = served_by(client.get("/register"))
+
+        # Hold the replica back and write on the primary until it is past the threshold
+        replica.cursor().execute("SELECT pg_wal_replay_pause()")
+        try:
+            cur = primary.cursor()
+            cur.execute("UPDATE MaxeloClientTable SET position = position WHERE id = "
+                        "(SELECT min(id) FROM MaxeloClientTable)")
+            primary.commit()
+            cur.close()
+            time.sleep(db.REPLICA_MAX_LAG + 1)
+            checks["register_while_lagging"] = served_by(client.get("/register"))
+        finally:
+            replica.cursor().execute("SELECT pg_wal_replay_resume()")
+        time.sleep(1)
+        checks["register_after_catch_up"] = served_by(client.get("/register"))
+    finally:
+        cleanup(primary)
+        primary.close()
+        replica.close()
+
+    expected = {
+        "register_on_replica": "replica",
+        "search_on_replica": "replica",
+        "dashboard_after_clock_in": "primary",
+        "dashboard_shows_clock_in": True,
+        "register_after_window": "replica",
+        "register_while_lagging": "primary",
+        "register_after_catch_up": "replica",
+    }
+    result = {
+        "max_lag": db.REPLICA_MAX_LAG,
+        "read_your_writes_seconds": db.READ_YOUR_WRITES_SECONDS,
+        "checks": checks,
+        "failed": [name for name, value in expected.items() if checks.get(name) != value],
+        "replica": db.replica_stats(),
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if result["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
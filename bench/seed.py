@@ -0,0 +1,132 @@
+"""Seed N synthetic employees and M months of attendance history.
+
+Rows are streamed into PostgreSQL with COPY in fixed-size chunks, so the
+generator scales to millions of AttendanceRegister rows with flat memory.
+Seeded employees use emails bench<i>@load.test and password "bench".
+Runs against DATABASE_URL; use a scratch database.
+
+    python bench/seed.py --employees 500 --months 24
+    python bench/seed.py --reset            # remove seeded data only
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import business_time  # noqa: E402
+import db  # noqa: E402
+from attendance_summary import rebuild_summary  # noqa: E402
+
+EMAIL_DOMAIN = "load.test"
+PASSWORD = "bench"
+CHUNK_ROWS = 100_000
+ROLES = ["employee"] * 8 + ["intern"] * 2
+
+
+def bench_email(i):
+    return f"bench{i}@{EMAIL_DOMAIN}"
+
+
+def reset(conn):
+    cur = conn.cursor()
+    cur.execute("DELETE FROM MaxeloClientTable WHERE email LIKE %s", (f"%@{EMAIL_DOMAIN}",))
+    deleted = cur.rowcount
+    rebuild_summary(cur)
+    conn.commit()
+    cur.close()
+    return deleted
+
+
+def copy_rows(cur, table, columns, rows):
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join("\\N" if v is None else str(v) for v in row))
+        buffer.write("\n")
+        count += 1
+        if count % CHUNK_ROWS == 0:
+            buffer.seek(0)
+            cur.copy_from(buffer, table, columns=columns)
+            buffer = io.StringIO()
+    buffer.seek(0)
+    cur.copy_from(buffer, table, columns=columns)
+    return count
+
+
+def employee_rows(n):
+    for i in range(n):
+        yield ("Bench", f"User{i}", f"09{i:08d}", PASSWORD, bench_email(i), ROLES[i % len(ROLES)], "Load Test")
+
+
+def attendance_rows(employee_ids, months, rng, presence=0.9):
+    # Weekdays only, history ends yesterday so today is free for clock-ins
+    end = business_time.today()
+    start = end - timedelta(days=30 * months)
+    day = start
+    while day < end:
+        if day.weekday() < 5:
+            for employee_id in employee_ids:
+                if rng.random() > presence:
+                    continue
+                clock_in = datetime.combine(day, datetime.min.time()) + timedelta(
+                    minutes=rng.randint(7 * 60 + 15, 9 * 60 + 30))
+                clock_out = clock_in + timedelta(minutes=rng.randint(7 * 60, 9 * 60 + 30))
+                kind = "Office" if rng.random() < 0.7 else "Remote"
+                yield (employee_id, clock_in, clock_out, f"({kind})")
+        day += timedelta(days=1)
+
+
+def seed(conn, employees, months, seed_value):
+    rng = random.Random(seed_value)
+    cur = conn.cursor()
+
+    started = time.perf_counter()
+    copy_rows(cur, "maxeloclienttable",
+              ("names", "surname", "phonenumber", "password", "email", "role", "position"),
+              employee_rows(employees))
+    cur.execute("SELECT id FROM MaxeloClientTable WHERE email LIKE %s ORDER BY id", (f"%@{EMAIL_DOMAIN}",))
+    employee_ids = [row[0] for row in cur.fetchall()]
+
+    attendance = copy_rows(cur, "attendanceregister", ("employee_id", "clockin", "clockout", "notes"),
+                           attendance_rows(employee_ids, months, rng))
+    conn.commit()
+    loaded = time.perf_counter() - started
+
+    rebuild_summary(cur)
+    conn.commit()
+    cur.execute("ANALYZE MaxeloClientTable")
+    cur.execute("ANALYZE AttendanceRegister")
+    conn.commit()
+    cur.close()
+    return len(employee_ids), attendance, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=2023)
+    parser.add_argument("--reset", action="store_true", help="only remove previously seeded data")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    try:
+        deleted = reset(conn)
+        if deleted:
+            print(f"Removed {deleted} previously seeded employee(s)")
+        if args.reset:
+            return
+        employees, attendance, seconds = seed(conn, args.employees, args.months, args.seed)
+    finally:
+        conn.close()
+    print(f"Seeded {employees} employees and {attendance} attendance rows "
+          f"in {seconds:.1f}s ({attendance / max(seconds, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Import-to-first-request latency of a fresh worker process.
+
+Each run starts a new interpreter (like a gunicorn worker boot), imports
+app, builds the app and serves GET / through the test client. Prints a
+JSON summary; pass --output to also write it to a file.
+
+    python bench/startup.py --runs 20 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, time
+t0 = time.perf_counter()
+import app as module
+t1 = time.perf_counter()
+client = module.app.test_client()
+response = client.get("/")
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_request": t2 - t1,
+                  "total": t2 - t0, "status": response.status_code}))
+"""
+
+
+def run_once():
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(samples, key):
+    values = sorted(s[key] * 1000 for s in samples)
+    return {
+        "min_ms": values[0],
+        "median_ms": statistics.median(values),
+        "max_ms": values[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    result = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "import": summarize(samples, "import"),
+        "first_request": summarize(samples, "first_request"),
+        "total": summarize(samples, "total"),
+        "statuses": sorted({s["status"] for s in samples}),
+    }
+
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Concurrent clock-ins under each gunicorn worker model.
+
+Starts gunicorn with the checked-in gunicorn.conf.py once per worker model
+(sync; gthread sized by the config, with direct and with batched clock-in
+writes; gevent when installed), logs in seeded
+users (bench/seed.py) over HTTP and fires a clock-in burst at each
+concurrency level. Reports requests/s and latency percentiles per model and
+level. The clock-ins it makes are removed afterwards.
+
+A database on the same machine answers in microseconds, which hides what
+the worker model is for. --db-latency-ms routes the servers' connections
+through a local proxy that delays every packet each way by half that
+round trip, like a hosted database a few milliseconds away.
+
+    python bench/worker_models.py --workers 2 --users 200 --concurrency 1,8,32,64 \\
+        --db-latency-ms 5 --output workers.json
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from psycopg2.extensions import make_dsn, parse_dsn
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import attendance_summary  # noqa: E402
+import business_time  # noqa: E402
+import db  # noqa: E402
+from load import HttpClient, git_commit, run_scenario  # noqa: E402
+from seed import PASSWORD, bench_email  # noqa: E402
+
+NOTES = "bench worker models"
+
+
+# --- Latency proxy ---
+# Packets are queued with a due time and written in order once due, so the
+# delay is per packet and pipelining is kept, as on a real network link.
+async def relay(reader, writer, delay):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    async def deliver():
+        while True:
+            due, data = await queue.get()
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    delivering = asyncio.ensure_future(deliver())
+    while True:
+        try:
+            data = await reader.read(65536)
+        except ConnectionError:
+            data = b""
+        queue.put_nowait((loop.time() + delay, data))
+        if not data:
+            break
+    await delivering
+
+
+class LatencyProxy:
+    def __init__(self, dsn, round_trip_ms):
+        self.params = parse_dsn(dsn)
+        self.delay = round_trip_ms / 2000
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        ready = threading.Event()
+        threading.Thread(target=self._run, args=(ready,), daemon=True).start()
+        ready.wait()
+
+    def _upstream(self):
+        host, port = self.params.get("host") or "localhost", int(self.params.get("port") or 5432)
+        if host.startswith("/"):
+            return asyncio.open_unix_connection(os.path.join(host, f".s.PGSQL.{port}"))
+        return asyncio.open_connection(host, port)
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await self._upstream()
+        await asyncio.gather(relay(client_reader, server_writer, self.delay),
+                             relay(server_reader, client_writer, self.delay))
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        ready.set()
+        self.loop.run_forever()
+
+    def dsn(self):
+        return make_dsn(**dict(self.params, host="127.0.0.1", port=str(self.port)))
+
+
+def worker_models():
+    # (label, worker class, extra environment)
+    models = [
+        ("sync", "sync", {}),
+        ("gthread", "gthread", {}),
+        # Concurrent direct clock-ins queue on the day's rollup row lock;
+        # batching takes that lock once per batch
+        ("gthread+batched", "gthread", {"CLOCK_IN_WRITE_MODE": "batched"}),
+    ]
+    if importlib.util.find_spec("gevent") is not None:
+        models.append(("gevent", "gevent", {}))
+    return models
+
+
+def start_server(worker_class, port, workers, dsn, extra_env):
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=worker_class, WEB_CONCURRENCY=str(workers),
+               GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_ACCESS_LOG="", DATABASE_URL=dsn, **extra_env)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"gunicorn ({worker_class}) exited:\n{server.stderr.read()}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1).read()
+            return server
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit(f"gunicorn ({worker_class}) did not start within 30s")
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def cleanup():
+    conn = db.connect()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM AttendanceRegister WHERE notes LIKE %s", (f"%{NOTES}",))
+    today = business_time.today()
+    attendance_summary.rebuild_summary(cur, today, today)
+    conn.commit()
+    cur.close()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", default="1,8,32,64",
+                        help="Comma-separated numbers of simultaneous clients")
+    parser.add_argument("--db-latency-ms", type=float, default=0,
+                        help="Round trip added to every database packet exchange")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.concurrency.split(",")]
+    dsn = db.get_database_url()
+    if args.db_latency_ms:
+        dsn = LatencyProxy(dsn, args.db_latency_ms).dsn()
+
+    results = []
+    try:
+        for label, worker_class, extra_env in worker_models():
+            server = start_server(worker_class, args.port, args.workers, dsn, extra_env)
+            try:
+                url = f"http://127.0.0.1:{args.port}"
+                users = [HttpClient(url) for _ in range(args.users)]
+                run_scenario(f"{label} login", [
+                    (c, "POST", "/login", {"email": bench_email(i), "password": PASSWORD, "user_type": "employee"})
+                    for i, c in enumerate(users)
+                ], max(levels))
+                for level in levels:
+                    scenario = run_scenario(f"{label} x{level}", [
+                        (c, "POST", "/clock_in", {"attendanceType": "Office", "notes": NOTES}) for c in users
+                    ], level)
+                    results.append({"model": label, "worker_class": worker_class, "concurrency": level, **scenario})
+            finally:
+                stop_server(server)
+    finally:
+        cleanup()
+
+    result = {
+        "benchmark": "worker_models",
+        "commit": git_commit(),
+        "workers": args.workers,
+        "users": args.users,
+        "db_latency_ms": args.db_latency_ms,
+        "db_pool_max": int(os.getenv("DB_POOL_MAX", "10")),
+        "results": results,
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+from datetime import datetime, time, timedelta
+
+import pytz
+
+# The one place the business timezone is configured. Attendance is stored
+# as timestamptz; "today", a day and a month are always taken in this zone.
+# Every database connection runs with the same TimeZone (db.connect), so
+# DATE(clockIn), clockIn::time and to_char() in SQL agree with the bounds
+# computed here whatever zone the app or database server is in.
+BUSINESS_TIMEZONE_NAME = os.getenv("BUSINESS_TIMEZONE", "Africa/Johannesburg")
+BUSINESS_TIMEZONE = pytz.timezone(BUSINESS_TIMEZONE_NAME)
+
+
+def now():
+    return datetime.now(BUSINESS_TIMEZONE)
+
+
+def today():
+    return now().date()
+
+
+def localtime(value):
+    # Aware values are converted; naive ones are taken as already business local
+    if value.tzinfo is None:
+        return BUSINESS_TIMEZONE.localize(value)
+    return value.astimezone(BUSINESS_TIMEZONE)
+
+
+def local_date(value):
+    return localtime(value).date()
+
+
+# --- Range bounds ---
+# Half-open [start, end) instants, so the same bounds work for partition
+# ranges, index scans and DST days that are not 24 hours long.
+def start_of_day(day):
+    return BUSINESS_TIMEZONE.localize(datetime.combine(day, time.min))
+
+
+def day_bounds(day):
+    return start_of_day(day), start_of_day(day + timedelta(days=1))
+
+
+def days_bounds(start, end):
+    # start and end are inclusive dates
+    return start_of_day(start), start_of_day(end + timedelta(days=1))
+
+
+def month_bounds(day):
+    first = day.replace(day=1)
+    following = (first + timedelta(days=32)).replace(day=1)
+    return start_of_day(first), start_of_day(following)
+
+
+# --- Templates ---
+def format_local(value, fmt="%Y-%m-%d %H:%M"):
+    return localtime(value).strftime(fmt) if value else ""
+
+
+def init_app(app):
+    app.add_template_filter(format_local, "local_time")
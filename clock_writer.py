@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+
+from psycopg2.extras import execute_values
+
+import attendance_summary
+import db
+import presence
+
+# direct: every /clock_in is its own INSERT and commit (default)
+# batched: clock-ins are queued and written by a background flusher, many per commit
+CLOCK_IN_WRITE_MODE = os.getenv("CLOCK_IN_WRITE_MODE", "direct").lower()
+CLOCK_IN_BATCH_SIZE = int(os.getenv("CLOCK_IN_BATCH_SIZE", "100"))
+CLOCK_IN_BATCH_WINDOW_MS = float(os.getenv("CLOCK_IN_BATCH_WINDOW_MS", "5"))
+CLOCK_IN_BATCH_TIMEOUT = float(os.getenv("CLOCK_IN_BATCH_TIMEOUT", "10"))
+
+
+class ClockInTimeout(Exception):
+    pass
+
+
+def write_clock_ins(cur, rows):
+    # rows: [(employee_id, clock_in, notes)]; caller commits
+    attendance_summary.record_clock_ins(cur, [(employee_id, clock_in) for employee_id, clock_in, _ in rows])
+    execute_values(cur, """
+        INSERT INTO AttendanceRegister (employee_id, clockIn, notes)
+        VALUES %s
+    """, rows, page_size=1000)
+    presence.notify_events(cur, [("in", employee_id, clock_in) for employee_id, clock_in, _ in rows])
+
+
+class PendingClockIn:
+    __slots__ = ("row", "done", "error")
+
+    def __init__(self, row):
+        self.row = row
+        self.done = threading.Event()
+        self.error = None
+
+
+# --- Write-behind batcher ---
+# Requests queue their clock-in and block until the flusher has committed the
+# batch it was in, so a success response always means the row is durable.
+# The flusher waits CLOCK_IN_BATCH_WINDOW_MS after the first queued event (or
+# until CLOCK_IN_BATCH_SIZE are queued) and writes them in one transaction on
+# its own connection, outside the request pool. Like the pool, it belongs to
+# the process that started it; a forked worker starts its own.
+class ClockInBatcher:
+    def __init__(self, dsn=None, batch_size=CLOCK_IN_BATCH_SIZE, window_ms=CLOCK_IN_BATCH_WINDOW_MS,
+                 timeout=CLOCK_IN_BATCH_TIMEOUT):
+        self.dsn = dsn
+        self.batch_size = batch_size
+        self.window = window_ms / 1000
+        self.timeout = timeout
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        self._pending = []
+        self._thread = None
+        self._conn = None
+        self.batches = 0
+        self.events = 0
+        self.failures = 0
+
+    def submit(self, employee_id, clock_in, notes):
+        if self.pid != os.getpid():
+            self._reset()
+
+        item = PendingClockIn((employee_id, clock_in, notes))
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="clock-in-flusher", daemon=True)
+                self._thread.start()
+            self._pending.append(item)
+            self._cond.notify()
+
+        if not item.done.wait(self.timeout):
+            with self._cond:
+                if item in self._pending:
+                    # Never picked up, so it can't be written later
+                    self._pending.remove(item)
+                    raise ClockInTimeout(f"clock-in not written within {self.timeout}s")
+            # Already in a batch that is being written: its outcome decides
+            item.done.wait()
+        if item.error is not None:
+            raise item.error
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            return batch
+
+    def _write(self, rows):
+        try:
+            if self._conn is None or self._conn.closed:
+                self._conn = db.connect(self.dsn)
+            cur = self._conn.cursor()
+            write_clock_ins(cur, rows)
+            self._conn.commit()
+            cur.close()
+        except Exception:
+            if self._conn is not None:
+                db.ConnectionPool._close_quietly(self._conn)
+                self._conn = None
+            raise
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            try:
+                self._write([item.row for item in batch])
+                self.batches += 1
+                self.events += len(batch)
+            except Exception as e:
+                print(f"❌ Clock-in batch of {len(batch)} failed:", e)
+                self.failures += 1
+                if len(batch) == 1:
+                    batch[0].error = e
+                else:
+                    # One bad row (e.g. an employee deleted meanwhile) must not fail the others
+                    for item in batch:
+                        try:
+                            self._write([item.row])
+                            self.events += 1
+                        except Exception as row_error:
+                            item.error = row_error
+            for item in batch:
+                item.done.set()
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._pending)
+        return {"pending": pending, "batches": self.batches, "events": self.events, "failures": self.failures}
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = ClockInBatcher()
+    return _batcher
+
+
+def batcher_stats():
+    if _batcher is None or _batcher.pid != os.getpid():
+        return None
+    return _batcher.stats()
+
+
+def batched():
+    return CLOCK_IN_WRITE_MODE == "batched"
@@ -0,0 +1,248 @@
+import json
+
+import click
+import psycopg2
+from flask import current_app
+
+import db
+import fragments
+import jobs
+import partitions
+from attendance_summary import adjust_headcount, rebuild_summary
+from migrations import apply_migrations, migration_status
+from migrations.explain import check_index_usage
+
+
+# --- Database bootstrap ---
+# Run explicitly (flask init-db) instead of at import time, so a gunicorn
+# worker can start serving without touching the database.
+def create_database():
+    # Connect to the default PostgreSQL database to create our database
+    default_conn = psycopg2.connect(
+        host="localhost",
+        database="postgres",
+        user="postgres",
+        password="Maxelo@2023"
+    )
+    default_conn.autocommit = True
+    default_cur = default_conn.cursor()
+
+    # Check if database exists, create if it doesn't
+    default_cur.execute("SELECT 1 FROM pg_database WHERE datname = 'maxelo_attendance_db'")
+    exists = default_cur.fetchone()
+    if not exists:
+        default_cur.execute("CREATE DATABASE maxelo_attendance_db")
+        print("Database created successfully")
+
+    default_cur.close()
+    default_conn.close()
+
+
+def insert_admin(cur):
+    # Check if admin user exists, create if not. The headcount is counted in
+    # the same transaction, like any other new employee.
+    cur.execute("SELECT 1 FROM MaxeloClientTable WHERE email = 'admin@maxelo.com'")
+    if cur.fetchone() is not None:
+        return False
+    cur.execute("""
+        INSERT INTO MaxeloClientTable (names, surname, phoneNumber, password, email, role, position)
+        VALUES ('System', 'Admin', '0820000000', 'admin123', 'admin@maxelo.com', 'Admin', 'Manager')
+    """)
+    adjust_headcount(cur, 'Admin', 1)
+    fragments.bump(cur, fragments.DIRECTORY)
+    return True
+
+
+def seed_admin(conn):
+    cur = conn.cursor()
+    created = insert_admin(cur)
+    conn.commit()
+    cur.close()
+    return created
+
+
+@click.command("init-db")
+@click.option("--create-database", "create_db", is_flag=True,
+              help="Create maxelo_attendance_db on a local server first.")
+def init_db_command(create_db):
+    if create_db:
+        create_database()
+
+    conn = db.connect()
+    try:
+        applied = apply_migrations(conn)
+        seeded = seed_admin(conn)
+    finally:
+        conn.close()
+    print(f"{len(applied)} migration(s) applied")
+    if seeded:
+        print("Admin user created")
+    print("Database tables initialized successfully")
+
+
+@click.command("migrate")
+@click.option("--target", type=int, default=None, help="Stop after this version.")
+def migrate_command(target):
+    conn = db.connect()
+    try:
+        applied = apply_migrations(conn, target=target)
+    finally:
+        conn.close()
+    print(f"{len(applied)} migration(s) applied")
+
+
+@click.command("seed-admin")
+def seed_admin_command():
+    conn = db.connect()
+    try:
+        seeded = seed_admin(conn)
+    finally:
+        conn.close()
+    print("Admin user created" if seeded else "Admin user already exists")
+
+
+@click.command("migration-status")
+def migration_status_command():
+    conn = db.connect()
+    try:
+        for version, description, done in migration_status(conn):
+            print(f"{version:04d} [{'x' if done else ' '}] {description}")
+    finally:
+        conn.close()
+
+
+@click.command("check-indexes")
+def check_indexes_command():
+    conn = db.connect()
+    try:
+        results = check_index_usage(conn)
+    finally:
+        conn.close()
+
+    failed = False
+    for name, (uses_index, scans) in results.items():
+        print(f"{'OK  ' if uses_index else 'FAIL'} {name}: {', '.join(scans)}")
+        failed = failed or not uses_index
+    if failed:
+        raise SystemExit(1)
+
+
+@click.command("rebuild-summary")
+@click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="First day to rebuild (default: beginning of history).")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Last day to rebuild, inclusive (default: end of history).")
+def rebuild_summary_command(start, end):
+    conn = db.connect()
+    cur = conn.cursor()
+    try:
+        rows = rebuild_summary(cur, start.date() if start else None, end.date() if end else None)
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+    print(f"Rebuilt {rows} daily summary row(s)")
+
+
+@click.command("ensure-partitions")
+@click.option("--months-ahead", type=int, default=partitions.PARTITIONS_AHEAD,
+              help="Create monthly partitions this many months past the current one.")
+def ensure_partitions_command(months_ahead):
+    conn = db.connect()
+    cur = conn.cursor()
+    try:
+        created = partitions.ensure_partitions(cur, months_ahead=months_ahead)
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+    for month in created:
+        print(f"Created {partitions.partition_name(month)}")
+    print(f"{len(created)} partition(s) created")
+
+
+@click.command("archive-attendance")
+@click.option("--older-than-months", type=int, default=partitions.RETENTION_MONTHS,
+              help="Archive months that ended more than this many months ago.")
+@click.option("--directory", default=partitions.ARCHIVE_DIR, help="Where to write .csv.gz archives.")
+def archive_attendance_command(older_than_months, directory):
+    conn = db.connect()
+    try:
+        archived = partitions.archive_partitions(conn, older_than_months, directory)
+    finally:
+        conn.close()
+    for month, path in archived:
+        print(f"Archived {month:%Y-%m} to {path}")
+    print(f"{len(archived)} partition(s) archived")
+
+
+@click.command("restore-attendance")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+def restore_attendance_command(paths):
+    conn = db.connect()
+    try:
+        for path in paths:
+            month, rows = partitions.restore_partition(conn, path)
+            print(f"Restored {rows} row(s) for {month:%Y-%m} from {path}")
+    finally:
+        conn.close()
+
+
+@click.command("purge-sessions")
+def purge_sessions_command():
+    store = getattr(current_app.session_interface, "store", None)
+    if store is None:
+        print("Sessions are kept in signed cookies; nothing to purge")
+        return
+    print(f"✅ Purged {store.purge()} expired session(s)")
+
+
+# For writes made outside the app (psql, bench/seed.py)
+@click.command("invalidate-cache")
+@click.argument("name", default=fragments.DIRECTORY)
+def invalidate_cache_command(name):
+    conn = db.connect()
+    try:
+        cur = conn.cursor()
+        fragments.bump(cur, name)
+        conn.commit()
+    finally:
+        conn.close()
+    print(f"✅ {name} cache invalidated")
+
+
+@click.command("run-worker")
+@click.option("--processes", type=int, default=jobs.JOB_PROCESSES, help="Jobs to run in parallel.")
+def run_worker_command(processes):
+    jobs.run_worker(jobs.output_dir(current_app), processes=processes)
+
+
+@click.command("enqueue-job")
+@click.argument("kind", type=click.Choice(sorted(jobs.JOB_HANDLERS)))
+@click.option("--params", default="{}", help="Job parameters as a JSON object.")
+def enqueue_job_command(kind, params):
+    conn = db.connect()
+    cur = conn.cursor()
+    try:
+        job_id = jobs.enqueue(cur, kind, json.loads(params))
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+    print(f"✅ Queued job {job_id} ({kind})")
+
+
+def init_app(app):
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(migrate_command)
+    app.cli.add_command(seed_admin_command)
+    app.cli.add_command(migration_status_command)
+    app.cli.add_command(check_indexes_command)
+    app.cli.add_command(rebuild_summary_command)
+    app.cli.add_command(ensure_partitions_command)
+    app.cli.add_command(archive_attendance_command)
+    app.cli.add_command(restore_attendance_command)
+    app.cli.add_command(purge_sessions_command)
+    app.cli.add_command(invalidate_cache_command)
+    app.cli.add_command(run_worker_command)
+    app.cli.add_command(enqueue_job_command)
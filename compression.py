@@ -0,0 +1,101 @@
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1") != "0"
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+COMPRESSIBLE_MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/javascript",
+    "application/javascript", "application/json",
+}
+
+# Static files are immutable per fingerprint, so their compressed bodies are kept
+_static_bodies = {}
+
+
+def compressible(response):
+    return response.mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def choose_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def compress(data, encoding, level=COMPRESS_LEVEL):
+    if encoding == "br":
+        # Quality 11 is too slow per request; 5 is close to gzip speed
+        return brotli.compress(data, quality=11 if level >= 9 else 5)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+# --- Conditional GET ---
+# Rendered pages get a weak ETag over the uncompressed body (weak, so the
+# same tag is valid for every Content-Encoding). A revalidation that matches
+# answers 304 with no body. "private, no-cache" makes browsers ask every time
+# and keeps per-user pages out of shared caches.
+def add_etag(response):
+    if request.method not in ("GET", "HEAD") or response.status_code != 200:
+        return response
+    if request.endpoint == "static" or response.is_streamed or not compressible(response):
+        return response
+
+    if not response.cache_control:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    response.add_etag(weak=True)
+    return response.make_conditional(request)
+
+
+# --- Response compression ---
+def compress_response(response):
+    if not COMPRESSION_ENABLED or not compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return response
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if request.endpoint == "static":
+        # send_file streams from disk; these files are small enough to read
+        key = (request.view_args["filename"], request.args.get("v"), response.headers.get("ETag"), encoding)
+        body = _static_bodies.get(key)
+        response.direct_passthrough = False
+        if body is None:
+            data = response.get_data()
+            if len(data) < COMPRESS_MIN_SIZE:
+                return response
+            body = compress(data, encoding, level=9)
+            if key[1]:
+                _static_bodies[key] = body
+        elif hasattr(response.response, "close"):
+            response.response.close()
+    elif response.is_streamed:
+        # Exports stream batch by batch; buffering them here would defeat that
+        return response
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        body = compress(data, encoding)
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app):
+    # after_request hooks run in reverse order: the ETag is taken on the
+    # uncompressed body, then the body is compressed
+    app.after_request(compress_response)
+    app.after_request(add_etag)
@@ -0,0 +1,115 @@
+import csv
+import io
+
+from psycopg2.extras import execute_values
+
+import attendance_summary
+import fragments
+import presence
+
+IMPORT_COLUMNS = ["names", "surname", "phoneNumber", "email", "password", "role", "position"]
+REQUIRED_COLUMNS = ["names", "surname", "phoneNumber", "email", "password", "role"]
+VALID_ROLES = {"employee", "admin", "intern"}
+
+
+def header_key(name):
+    return "".join(ch for ch in (name or "").lower() if ch.isalnum())
+
+
+HEADER_ALIASES = {header_key(c): c for c in IMPORT_COLUMNS}
+
+
+# --- Parse and validate in memory ---
+# Returns (valid_rows, errors). Row numbers in errors are CSV line numbers
+# (the header is line 1) so admins can find them in their spreadsheet.
+def parse_employee_csv(text):
+    # Spreadsheets add a BOM and vary header case and spacing
+    # ("Phone Number"), so headers are matched on letters and digits only
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    if reader.fieldnames:
+        reader.fieldnames = [HEADER_ALIASES.get(header_key(f), f) for f in reader.fieldnames]
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        return [], [(1, f"Missing column(s): {', '.join(missing)}")]
+
+    valid, errors = [], []
+    seen_emails, seen_phones = {}, {}
+    for line_no, raw in enumerate(reader, start=2):
+        row = {c: (raw.get(c) or "").strip() for c in IMPORT_COLUMNS}
+        row["role"] = row["role"].lower()
+
+        problems = [f"{c} is required" for c in REQUIRED_COLUMNS if not row[c]]
+        if row["role"] and row["role"] not in VALID_ROLES:
+            problems.append(f"unknown role '{row['role']}'")
+        if row["email"] and "@" not in row["email"]:
+            problems.append("invalid email")
+        if row["email"] in seen_emails:
+            problems.append(f"duplicate email (also on line {seen_emails[row['email']]})")
+        if row["phoneNumber"] in seen_phones:
+            problems.append(f"duplicate phone number (also on line {seen_phones[row['phoneNumber']]})")
+
+        if row["email"]:
+            seen_emails.setdefault(row["email"], line_no)
+        if row["phoneNumber"]:
+            seen_phones.setdefault(row["phoneNumber"], line_no)
+
+        if problems:
+            errors.append((line_no, "; ".join(problems)))
+        else:
+            valid.append((line_no, row))
+    return valid, errors
+
+
+def find_existing(cur, rows):
+    # One set-based lookup for every email and phone number in the file
+    emails = [row["email"] for _, row in rows]
+    phones = [row["phoneNumber"] for _, row in rows]
+    cur.execute("""
+        SELECT email, phoneNumber FROM MaxeloClientTable
+        WHERE email = ANY(%s) OR phoneNumber = ANY(%s)
+    """, (emails, phones))
+    existing = cur.fetchall()
+    return {e for e, _ in existing}, {p for _, p in existing}
+
+
+# --- Load ---
+def import_employees(conn, text):
+    valid, errors = parse_employee_csv(text)
+    if not valid:
+        return 0, sorted(errors)
+
+    cur = conn.cursor()
+    try:
+        existing_emails, existing_phones = find_existing(cur, valid)
+        to_insert = []
+        for line_no, row in valid:
+            problems = []
+            if row["email"] in existing_emails:
+                problems.append("email is already registered")
+            if row["phoneNumber"] in existing_phones:
+                problems.append("phone number is already registered")
+            if problems:
+                errors.append((line_no, "; ".join(problems)))
+            else:
+                to_insert.append(row)
+
+        if to_insert:
+            execute_values(cur, """
+                INSERT INTO MaxeloClientTable
+                (names, surname, phoneNumber, email, password, role, position)
+                VALUES %s
+            """, [tuple(row[c] for c in IMPORT_COLUMNS) for row in to_insert], page_size=500)
+
+            for role in VALID_ROLES:
+                added = sum(1 for row in to_insert if row["role"] == role)
+                if added:
+                    attendance_summary.adjust_headcount(cur, role, added)
+            fragments.bump(cur, fragments.DIRECTORY)
+            presence.notify_directory(cur)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return len(to_insert), sorted(errors)
@@ -0,0 +1,49 @@
+import os
+import re
+
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+
+SEARCH_COLUMNS = ["id", "names", "surname", "email", "phoneNumber", "role", "position"]
+
+# Characters that can appear inside a search term; everything else separates terms
+TERM_PATTERN = re.compile(r"[\w@.+-]+")
+# Must match the characters v007 translates to spaces in the indexed email
+PIECE_SEPARATORS = re.compile(r"[@._+-]+")
+
+
+# --- Query building ---
+# Every word the user typed must match the start of some indexed word, which
+# is what a typeahead needs ("jo do" finds Jo Doe). A word with punctuation
+# ("jo@x", "x.com") becomes a phrase over the pieces the index split it into.
+# Pieces are quoted, so no input can inject tsquery operators.
+def build_tsquery(text):
+    terms = []
+    for word in TERM_PATTERN.findall((text or "").lower()):
+        pieces = [p for p in PIECE_SEPARATORS.split(word) if p]
+        if not pieces:
+            continue
+        quoted = ["'" + p.replace("'", "''") + "'" for p in pieces]
+        quoted[-1] += ":*"
+        terms.append(" <-> ".join(quoted))
+    return " & ".join(terms)
+
+
+# Ranked by the weighted match (names first), ties alphabetically. Served
+# from the GIN index on search_vector, so cost follows the number of
+# matches rather than the headcount.
+SEARCH_QUERY = """
+    SELECT id, names, surname, email, phoneNumber, role, position
+    FROM MaxeloClientTable, to_tsquery('simple', %(query)s) AS q
+    WHERE search_vector @@ q
+    ORDER BY ts_rank(search_vector, q) DESC, surname, names, id
+    LIMIT %(limit)s
+"""
+
+
+def search_employees(cur, text, limit=SEARCH_DEFAULT_LIMIT):
+    query = build_tsquery(text)
+    if not query:
+        return []
+    cur.execute(SEARCH_QUERY, {"query": query, "limit": max(1, min(limit, SEARCH_MAX_LIMIT))})
+    return [dict(zip(SEARCH_COLUMNS, row)) for row in cur.fetchall()]
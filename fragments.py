@@ -0,0 +1,101 @@
+import json
+import os
+import uuid
+
+from flask import current_app
+
+from cache import TTLCache
+
+# Cached data sets; each has its own version
+DIRECTORY = "directory"
+
+# 1 = also keep entries as files in FRAGMENT_CACHE_DIR, shared by every worker on the host
+FRAGMENT_FILE_TIER = os.getenv("FRAGMENT_FILE_TIER", "0") == "1"
+
+_cache = TTLCache(
+    maxsize=int(os.getenv("FRAGMENT_CACHE_SIZE", "64")),
+    ttl=float(os.getenv("FRAGMENT_CACHE_TTL", "3600")),
+)
+
+
+def cache_dir():
+    return current_app.config["FRAGMENT_CACHE_DIR"]
+
+
+# --- Versions ---
+# A version is a counter in the cache_versions table, bumped by the writer
+# inside its own transaction, so the new version becomes visible on every
+# worker and host at the moment the rows do, and never if the write rolls
+# back. Readers read the version before the data on the same connection, so
+# whatever they build is at least as new as the version it is cached under.
+def current_version(cur, name):
+    cur.execute("SELECT version FROM cache_versions WHERE name = %s", (name,))
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def bump(cur, name):
+    cur.execute("""
+        INSERT INTO cache_versions (name, version) VALUES (%s, 1)
+        ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1
+        RETURNING version
+    """, (name,))
+    return cur.fetchone()[0]
+
+
+def write_atomic(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# --- Lookup ---
+# In-process LRU first, then (optionally) the file tier, then build().
+# Values must be JSON-serialisable for the file tier.
+def get_or_build(name, part, version, build):
+    key = (name, part, version)
+    value = _cache.get(key)
+    if value is not None:
+        return value
+
+    if FRAGMENT_FILE_TIER:
+        path = os.path.join(cache_dir(), f"{name}.{part}.{version}.json")
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (FileNotFoundError, ValueError):
+            value = None
+
+    if value is None:
+        value = build()
+        if FRAGMENT_FILE_TIER:
+            write_atomic(path, json.dumps(value))
+            remove_stale_files(name, version)
+
+    _cache.set(key, value)
+    return value
+
+
+def remove_stale_files(name, version):
+    # Only older versions: a reader on a lagging replica may still be
+    # building under an old version, never a newer one
+    for filename in os.listdir(cache_dir()):
+        parts = filename.split(".")
+        if len(parts) == 4 and parts[0] == name and parts[3] == "json" \
+                and (not parts[2].isdigit() or int(parts[2]) < version):
+            try:
+                os.remove(os.path.join(cache_dir(), filename))
+            except FileNotFoundError:
+                pass
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def init_app(app):
+    app.config.setdefault(
+        "FRAGMENT_CACHE_DIR", os.getenv("FRAGMENT_CACHE_DIR") or os.path.join(app.instance_path, "cache")
+    )
@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+
+from presence import PRESENCE_MAX_CLIENTS
+
+# gunicorn reads this file from the working directory (Procfile: web).
+# Every setting can be overridden from the environment without editing it.
+
+# --- Workers ---
+# gthread: each worker process serves requests on a pool of threads, so a
+# thread waiting on PostgreSQL doesn't hold up the rest of the worker.
+# psycopg2 blocks in C and isn't patched by gevent/eventlet, so a green
+# worker class would serialise every query in a worker; threads don't.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 4)))
+
+# One request thread per pooled connection: a burst beyond that waits in
+# gunicorn's accept queue (cheap) instead of in the pool, where it would
+# time out after DB_POOL_TIMEOUT.
+#
+# Each live presence stream (SSE) pins a thread for as long as its page is
+# open, but never a connection. PRESENCE_MAX_CLIENTS (presence.py) is the one
+# setting for both sides: the hub accepts that many streams per worker and
+# gunicorn adds that many threads on top of DB_POOL_MAX. An explicit
+# GUNICORN_THREADS must stay above the cap, or open streams alone could take
+# every thread and the worker would stop answering anything else.
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+threads = int(os.getenv("GUNICORN_THREADS", DB_POOL_MAX + PRESENCE_MAX_CLIENTS))
+if worker_class != "gthread":
+    # gunicorn would otherwise quietly switch a threaded "sync" to gthread
+    threads = 1
+elif threads <= PRESENCE_MAX_CLIENTS:
+    raise RuntimeError(
+        f"GUNICORN_THREADS={threads} leaves no thread for requests once "
+        f"PRESENCE_MAX_CLIENTS={PRESENCE_MAX_CLIENTS} presence streams are open"
+    )
+
+# PostgreSQL connections per worker: DB_POOL_MAX (+ DB_READ_POOL_MAX with a
+# replica) + 1 presence listener + 1 clock-in flusher when batching is on.
+# Keep workers x that under the server's max_connections.
+
+# --- Preload ---
+# The app is imported once in the master and forked. Building it does no
+# database I/O, and the pools, clock-in batcher and presence hub all belong
+# to the pid that created them, so a worker opens its own connections and
+# threads on first use and never touches a socket from the master.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1").lower() not in ("0", "false", "off")
+
+
+def when_ready(server):
+    import db
+
+    if db.pool_stats() is not None or db.read_pool_stats() is not None:
+        print("⚠️ Database pool opened in the gunicorn master; workers will open their own")
+
+
+# --- Connections and timeouts ---
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+# Idle keep-alive connections from the load balancer or browser are held
+# this many seconds, so a user's next request skips the TCP handshake
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Worker silent this long is killed and replaced. gthread heartbeats from
+# its main loop, so long exports and SSE streams don't count against it.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+# On deploy/restart, in-flight requests get this long to finish; open
+# presence streams are then closed and EventSource reconnects by itself
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "20"))
+# Heartbeat files in memory, not on a container's overlay filesystem
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None  # "" turns it off
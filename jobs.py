@@ -0,0 +1,355 @@
+import csv
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+
+import attendance_summary
+import business_time
+import db
+import partitions
+import reports
+import textpdf
+
+JOB_PROCESSES = int(os.getenv("JOB_PROCESSES", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+# A running job whose worker hasn't reported for this long is requeued
+JOB_STALE_AFTER = int(os.getenv("JOB_STALE_AFTER", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Business-local time at which the nightly maintenance jobs are queued
+JOB_NIGHTLY_AT = os.getenv("JOB_NIGHTLY_AT", "02:00")
+
+# Open sessions from before today are closed at this time on their own day
+AUTO_CLOSE_TIME = os.getenv("AUTO_CLOSE_TIME", "17:00")
+AUTO_CLOSE_NOTE = "[auto-closed: no clock-out]"
+AUTO_CLOSE_BATCH = 1000
+
+ANALYZE_TABLES = ["AttendanceRegister", "daily_attendance_summary", "role_headcount", "MaxeloClientTable"]
+NIGHTLY_JOBS = ["auto_close_sessions", "ensure_partitions", "analyze"]
+REPORT_FORMATS = ("csv", "pdf")
+
+JOB_COLUMNS = [
+    "id", "kind", "params", "status", "progress", "message", "result",
+    "created_at", "started_at", "finished_at", "attempts",
+]
+
+
+# --- Queue ---
+# Plain rows in the jobs table; callers commit. unique_key makes enqueueing
+# idempotent (the nightly jobs use one key per day), so any number of
+# workers can try to schedule the same job.
+def enqueue(cur, kind, params=None, created_by=None, unique_key=None, run_after=None):
+    cur.execute("""
+        INSERT INTO jobs (kind, params, created_by, unique_key, run_after)
+        VALUES (%s, %s, %s, %s, COALESCE(%s, NOW()))
+        ON CONFLICT (unique_key) DO NOTHING
+        RETURNING id
+    """, (kind, json.dumps(params or {}), created_by, unique_key, run_after))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def get_job(cur, job_id):
+    cur.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = %s", (job_id,))
+    row = cur.fetchone()
+    return dict(zip(JOB_COLUMNS, row)) if row else None
+
+
+def recent_jobs(cur, limit=50):
+    cur.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs ORDER BY created_at DESC, id DESC LIMIT %s", (limit,))
+    return [dict(zip(JOB_COLUMNS, row)) for row in cur.fetchall()]
+
+
+# SKIP LOCKED lets several workers poll the same table without handing out
+# a job twice or waiting on each other
+def claim_job(conn, worker):
+    cur = conn.cursor()
+    cur.execute("""
+        UPDATE jobs SET status = 'running', worker = %s, attempts = attempts + 1,
+                        started_at = NOW(), heartbeat_at = NOW(), progress = 0, message = NULL
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE status = 'queued' AND run_after <= NOW()
+            ORDER BY run_after, id
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id, kind, params
+    """, (worker,))
+    row = cur.fetchone()
+    conn.commit()
+    cur.close()
+    if row is None:
+        return None
+    params = row[2] if isinstance(row[2], dict) else json.loads(row[2])
+    return {"id": row[0], "kind": row[1], "params": params}
+
+
+def finish_job(conn, job_id, status, message=None, result=None):
+    cur = conn.cursor()
+    cur.execute("""
+        UPDATE jobs SET status = %s, message = %s, result = %s, finished_at = NOW(),
+                        progress = CASE WHEN %s = 'succeeded' THEN 100 ELSE progress END
+        WHERE id = %s
+    """, (status, message, json.dumps(result) if result is not None else None, status, job_id))
+    conn.commit()
+    cur.close()
+
+
+def heartbeat(conn, job_ids):
+    if not job_ids:
+        return
+    cur = conn.cursor()
+    cur.execute("UPDATE jobs SET heartbeat_at = NOW() WHERE id = ANY(%s)", (list(job_ids),))
+    conn.commit()
+    cur.close()
+
+
+def requeue_stale(conn):
+    # A worker that died mid-job stops heartbeating; retry it, up to a limit
+    cur = conn.cursor()
+    cur.execute("""
+        UPDATE jobs SET
+            status = CASE WHEN attempts < %(max_attempts)s THEN 'queued' ELSE 'failed' END,
+            message = 'worker stopped responding',
+            finished_at = CASE WHEN attempts < %(max_attempts)s THEN NULL ELSE NOW() END
+        WHERE status = 'running' AND heartbeat_at < NOW() - make_interval(secs => %(stale)s)
+    """, {"max_attempts": JOB_MAX_ATTEMPTS, "stale": JOB_STALE_AFTER})
+    requeued = cur.rowcount
+    conn.commit()
+    cur.close()
+    return requeued
+
+
+def schedule_nightly(conn, now=None):
+    # None before JOB_NIGHTLY_AT; afterwards the kinds this call queued
+    now = now or business_time.now()
+    if now.strftime("%H:%M") < JOB_NIGHTLY_AT:
+        return None
+    cur = conn.cursor()
+    queued = [
+        kind for kind in NIGHTLY_JOBS
+        if enqueue(cur, kind, unique_key=f"nightly:{kind}:{now.date()}") is not None
+    ]
+    conn.commit()
+    cur.close()
+    return queued
+
+
+# --- Job bodies (run in the worker's process pool) ---
+class Progress:
+    def __init__(self, conn, job_id):
+        self.conn = conn
+        self.job_id = job_id
+
+    def __call__(self, percent, message=None):
+        cur = self.conn.cursor()
+        cur.execute("UPDATE jobs SET progress = %s, message = %s, heartbeat_at = NOW() WHERE id = %s",
+                    (int(percent), message, self.job_id))
+        self.conn.commit()
+        cur.close()
+
+
+def payroll_report_job(conn, progress, params):
+    start = date.fromisoformat(params["start"])
+    end = date.fromisoformat(params["end"])
+    fmt = params.get("format", "csv")
+    progress(5, "Running query")
+
+    cur = conn.cursor()
+    rows = reports.payroll_report(cur, start, end, start_time=params.get("start_time"), role=params.get("role"))
+    conn.rollback()
+    cur.close()
+    progress(60, f"Writing {len(rows)} employees")
+
+    headers, table = reports.payroll_table(rows)
+    filename = f"payroll_{start}_{end}.{fmt}"
+    stored = f"job-{params['job_id']}-{filename}"
+    path = os.path.join(params["output_dir"], stored)
+    os.makedirs(params["output_dir"], exist_ok=True)
+    tmp = path + ".tmp"
+    if fmt == "pdf":
+        with open(tmp, "wb") as f:
+            f.write(textpdf.text_pdf(payroll_lines(params, headers, table)))
+    else:
+        with open(tmp, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(table)
+    os.replace(tmp, path)
+    return {"file": stored, "filename": filename, "rows": len(rows)}
+
+
+def payroll_lines(params, headers, table):
+    # Fixed-width columns; attendance type columns are dropped if they don't fit
+    widths = [6, 14, 16, 10, 12, 6, 9, 7, 6, 9] + [10] * (len(headers) - 10)
+    limit = textpdf.line_capacity()
+    keep = 0
+    while keep < len(widths) and sum(widths[:keep + 1]) + keep <= limit:
+        keep += 1
+
+    def fmt_row(values):
+        return " ".join(str("" if v is None else v)[:w].ljust(w) for v, w in zip(values[:keep], widths))
+
+    role = params.get("role") or "all roles"
+    lines = [f"Payroll attendance report {params['start']} to {params['end']} ({role})", "", fmt_row(headers)]
+    lines.append("-" * len(lines[-1]))
+    lines.extend(fmt_row(row) for row in table)
+    return lines
+
+
+def auto_close_sessions_job(conn, progress, params):
+    # Sessions that started before today and were never closed
+    before = date.fromisoformat(params["before"]) if params.get("before") else business_time.today()
+    cutoff = business_time.start_of_day(before)
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM AttendanceRegister WHERE clockOut IS NULL AND clockIn < %s", (cutoff,))
+    total = cur.fetchone()[0]
+    conn.rollback()
+
+    closed = 0
+    while True:
+        cur.execute("""
+            UPDATE AttendanceRegister a SET
+                clockOut = GREATEST(
+                    a.clockIn,
+                    ((a.clockIn AT TIME ZONE %(tz)s)::date + %(close_at)s::time) AT TIME ZONE %(tz)s
+                ),
+                notes = COALESCE(a.notes || ' ', '') || %(note)s
+            FROM (
+                SELECT id, clockIn FROM AttendanceRegister
+                WHERE clockOut IS NULL AND clockIn < %(cutoff)s
+                LIMIT %(batch)s
+                FOR UPDATE SKIP LOCKED
+            ) stale
+            WHERE a.id = stale.id AND a.clockIn = stale.clockIn
+            RETURNING a.employee_id, a.clockIn
+        """, {"close_at": AUTO_CLOSE_TIME, "note": AUTO_CLOSE_NOTE, "cutoff": cutoff, "batch": AUTO_CLOSE_BATCH,
+              "tz": business_time.BUSINESS_TIMEZONE_NAME})
+        batch = cur.fetchall()
+        if not batch:
+            break
+        attendance_summary.record_clock_outs(cur, batch)
+        conn.commit()
+        closed += len(batch)
+        progress(100 * closed / max(total, closed), f"Closed {closed} of {total} sessions")
+    cur.close()
+    return {"closed": closed, "before": str(before)}
+
+
+def ensure_partitions_job(conn, progress, params):
+    # Next months' partitions exist well before their first clock-in, so
+    # rows never pile up in the DEFAULT partition
+    cur = conn.cursor()
+    created = partitions.ensure_partitions(cur)
+    conn.commit()
+    cur.close()
+    return {"created": [partitions.partition_name(month) for month in created]}
+
+
+def analyze_job(conn, progress, params):
+    conn.autocommit = True
+    cur = conn.cursor()
+    for i, table in enumerate(ANALYZE_TABLES):
+        progress(100 * i / len(ANALYZE_TABLES), f"ANALYZE {table}")
+        cur.execute(f"ANALYZE {table}")
+    cur.close()
+    return {"tables": ANALYZE_TABLES}
+
+
+JOB_HANDLERS = {
+    "payroll_report": payroll_report_job,
+    "auto_close_sessions": auto_close_sessions_job,
+    "ensure_partitions": ensure_partitions_job,
+    "analyze": analyze_job,
+}
+
+
+def execute(kind, job_id, params):
+    conn = db.connect(params.get("dsn"))
+    try:
+        handler = JOB_HANDLERS[kind]
+        return handler(conn, Progress(conn, job_id), dict(params, job_id=job_id))
+    finally:
+        conn.close()
+
+
+# --- Worker ---
+# The parent process polls the queue, hands jobs to a process pool (heavy
+# reports don't stall the polling or each other), records the outcome and
+# keeps a heartbeat on everything it is running. SIGTERM stops claiming new
+# jobs and waits for the running ones.
+def output_dir(app):
+    return app.config.get("JOB_OUTPUT_DIR") or os.getenv("JOB_OUTPUT_DIR") or os.path.join(app.instance_path, "reports")
+
+
+def run_worker(output_dir, processes=JOB_PROCESSES, poll_interval=JOB_POLL_INTERVAL, dsn=None):
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    conn = db.connect(dsn)
+    print(f"🛠️ Job worker {worker} started with {processes} process(es)")
+    try:
+        while not stop.is_set():
+            # Spawned children start clean: no inherited sockets or locks
+            pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            try:
+                work_loop(conn, pool, worker, output_dir, processes, poll_interval, stop, dsn)
+            except BrokenProcessPool:
+                print("❌ Job process pool died; restarting it")
+            finally:
+                pool.shutdown(wait=True)
+    finally:
+        conn.close()
+    print(f"Job worker {worker} stopped")
+
+
+def work_loop(conn, pool, worker, output_dir, processes, poll_interval, stop, dsn):
+    running = {}
+    # Day the nightly jobs were last queued for, so the worker tries once a
+    # day instead of on every poll
+    nightly_day = None
+    try:
+        while not stop.is_set() or running:
+            if not stop.is_set():
+                now = business_time.now()
+                if nightly_day != now.date() and schedule_nightly(conn, now) is not None:
+                    nightly_day = now.date()
+                requeue_stale(conn)
+                while len(running) < processes:
+                    job = claim_job(conn, worker)
+                    if job is None:
+                        break
+                    params = dict(job["params"], output_dir=output_dir, dsn=dsn)
+                    running[pool.submit(execute, job["kind"], job["id"], params)] = job
+                    print(f"▶️ Job {job['id']} ({job['kind']}) started")
+            heartbeat(conn, [job["id"] for job in running.values()])
+
+            if not running:
+                stop.wait(poll_interval)
+                continue
+            done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    finish_job(conn, job["id"], "failed", "worker process crashed")
+                    raise
+                except Exception as e:
+                    print(f"❌ Job {job['id']} ({job['kind']}) failed:", e)
+                    finish_job(conn, job["id"], "failed", str(e)[:1000])
+                else:
+                    finish_job(conn, job["id"], "succeeded", result=result)
+                    print(f"✅ Job {job['id']} ({job['kind']}) finished")
+    except BrokenProcessPool:
+        for job in running.values():
+            finish_job(conn, job["id"], "failed", "worker process crashed")
+        raise
@@ -0,0 +1,172 @@
+from datetime import datetime
+
+from psycopg2.extras import execute_values
+
+import attendance_summary
+import business_time
+import presence
+
+EVENTS = ("clock_in", "clock_out")
+
+
+# --- Validation ---
+def parse_timestamp(value):
+    # Kiosks send ISO 8601; naive values are taken as business local time
+    return business_time.localtime(datetime.fromisoformat(value))
+
+
+def validate_events(records):
+    events, rejected = [], []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            rejected.append({"index": index, "status": "rejected", "reason": "record must be an object"})
+            continue
+
+        key = record.get("idempotency_key")
+        try:
+            if not key or not isinstance(key, str) or len(key) > 100:
+                raise ValueError("idempotency_key must be a string of at most 100 characters")
+            if record.get("event") not in EVENTS:
+                raise ValueError("event must be clock_in or clock_out")
+            event = {
+                "index": index,
+                "key": key,
+                "employee_id": int(record["employee_id"]),
+                "event": record["event"],
+                "time": parse_timestamp(record["timestamp"]),
+                "notes": f"({record.get('attendance_type') or 'office'}) {record.get('notes') or 'kiosk'}".strip(),
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            rejected.append({"index": index, "idempotency_key": key, "status": "rejected", "reason": str(e)})
+            continue
+        events.append(event)
+    return events, rejected
+
+
+# --- Pairing ---
+# Replays the batch against the employees' currently open sessions and
+# returns the rows to insert, the existing rows to close, the clock_outs
+# that had nothing to close, and (employee_id, clock_in) of the closed
+# existing rows.
+# A clock_out never closes a session that started after it.
+def apply_in_order(cur, events):
+    open_sessions = {}
+    employee_ids = sorted({e["employee_id"] for e in events})
+    if employee_ids:
+        cur.execute("""
+            SELECT employee_id, id, clockIn FROM AttendanceRegister
+            WHERE employee_id = ANY(%s) AND clockOut IS NULL AND clockIn IS NOT NULL
+            ORDER BY employee_id, clockIn, id
+        """, (employee_ids,))
+        for employee_id, row_id, clock_in in cur.fetchall():
+            open_sessions.setdefault(employee_id, []).append({"id": row_id, "clock_in": clock_in})
+
+    inserts, closes, no_session, closed = [], [], [], []
+    for e in sorted(events, key=lambda e: (e["employee_id"], e["time"])):
+        stack = open_sessions.setdefault(e["employee_id"], [])
+        if e["event"] == "clock_in":
+            new_session = {"employee_id": e["employee_id"], "clock_in": e["time"],
+                           "clock_out": None, "notes": e["notes"]}
+            inserts.append(new_session)
+            stack.append(new_session)
+        elif stack and stack[-1]["clock_in"] <= e["time"]:
+            latest = stack.pop()
+            if "id" in latest:
+                closes.append((latest["id"], latest["clock_in"], e["time"]))
+                closed.append((e["employee_id"], latest["clock_in"]))
+            else:
+                latest["clock_out"] = e["time"]
+        else:
+            no_session.append(e)
+    return inserts, closes, no_session, closed
+
+
+# --- Ingestion ---
+# One transaction per batch. Replayed idempotency keys are dropped by the
+# ON CONFLICT insert into kiosk_events; the rest are applied in timestamp
+# order per employee, pairing each clock_out with the latest open session
+# (same rule as the /clock_out form).
+def ingest_events(conn, records):
+    events, results = validate_events(records)
+    cur = conn.cursor()
+    try:
+        # Known employees only, so one bad id doesn't fail the whole batch.
+        # Row locks serialize concurrent batches for the same employee.
+        ids = sorted({e["employee_id"] for e in events})
+        cur.execute("SELECT id FROM MaxeloClientTable WHERE id = ANY(%s) ORDER BY id FOR UPDATE", (ids,))
+        known = {row[0] for row in cur.fetchall()}
+        for e in [e for e in events if e["employee_id"] not in known]:
+            results.append({"index": e["index"], "idempotency_key": e["key"],
+                            "status": "rejected", "reason": "unknown employee"})
+        events = [e for e in events if e["employee_id"] in known]
+
+        # Claim keys; anything already present is a replay
+        claimed = set()
+        if events:
+            rows = execute_values(cur, """
+                INSERT INTO kiosk_events (idempotency_key, employee_id, event, event_time, status)
+                VALUES %s
+                ON CONFLICT (idempotency_key) DO NOTHING
+                RETURNING idempotency_key
+            """, [(e["key"], e["employee_id"], e["event"], e["time"], "applied") for e in events],
+                page_size=1000, fetch=True)
+            claimed = {row[0] for row in rows}
+
+        fresh, seen = [], set()
+        for e in events:
+            if e["key"] in claimed and e["key"] not in seen:
+                seen.add(e["key"])
+                fresh.append(e)
+            else:
+                results.append({"index": e["index"], "idempotency_key": e["key"], "status": "duplicate"})
+
+        inserts, closes, no_session, closed = apply_in_order(cur, fresh)
+
+        # Daily rollup deltas, as the /clock_in and /clock_out forms apply
+        # them: clock-ins before the INSERT (first-of-day is decided from the
+        # existing rows), then every session the batch closed. The employee
+        # row locks above keep concurrent batches for one employee in order.
+        attendance_summary.record_clock_ins(cur, [(s["employee_id"], s["clock_in"]) for s in inserts])
+        if inserts:
+            execute_values(cur, """
+                INSERT INTO AttendanceRegister (employee_id, clockIn, clockOut, notes)
+                VALUES %s
+            """, [(s["employee_id"], s["clock_in"], s["clock_out"], s["notes"]) for s in inserts],
+                page_size=1000)
+        if closes:
+            execute_values(cur, """
+                UPDATE AttendanceRegister a SET clockOut = v.clock_out
+                FROM (VALUES %s) AS v(id, clock_in, clock_out)
+                WHERE a.id = v.id AND a.clockIn = v.clock_in
+            """, closes, template="(%s, %s::timestamptz, %s::timestamptz)", page_size=1000)
+        rejected_keys = {e["key"] for e in no_session}
+        if rejected_keys:
+            cur.execute("""
+                UPDATE kiosk_events SET status = 'rejected'
+                WHERE idempotency_key = ANY(%s)
+            """, (list(rejected_keys),))
+
+        for e in fresh:
+            if e["key"] in rejected_keys:
+                results.append({"index": e["index"], "idempotency_key": e["key"],
+                                "status": "rejected", "reason": "no open session before this clock_out"})
+            else:
+                results.append({"index": e["index"], "idempotency_key": e["key"],
+                                "employee_id": e["employee_id"], "status": "applied"})
+
+        attendance_summary.record_clock_outs(
+            cur, closed + [(s["employee_id"], s["clock_in"]) for s in inserts if s["clock_out"] is not None])
+
+        applied = sorted((e for e in fresh if e["key"] not in rejected_keys), key=lambda e: e["time"])
+        presence.notify_events(cur, [("in" if e["event"] == "clock_in" else "out", e["employee_id"], e["time"])
+                                     for e in applied])
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+    results.sort(key=lambda r: r["index"])
+    return results
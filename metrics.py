@@ -0,0 +1,212 @@
+import hmac
+import os
+import threading
+import time
+
+from flask import Response, g, request
+
+import clock_writer
+import db
+import presence
+import repository
+
+# Seconds; roughly log-spaced around typical page and query times
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# --- Per-process registry ---
+# Each gunicorn worker keeps its own numbers; Prometheus should scrape every
+# worker (or sum them) the same way it does for any multi-process server.
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.total += 1
+        self.sum += value
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}    # (method, route) -> Histogram
+        self.db_latency = {}  # (method, route) -> Histogram
+        self.requests = {}   # (method, route, status) -> count
+        self.queries = {}    # (method, route) -> count
+
+    def observe(self, method, route, status, duration, db_time, queries):
+        key = (method, route)
+        with self.lock:
+            self.latency.setdefault(key, Histogram()).observe(duration)
+            self.db_latency.setdefault(key, Histogram()).observe(db_time)
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            self.queries[key] = self.queries.get(key, 0) + queries
+
+
+registry = Registry()
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def labels(**values):
+    return "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in values.items()) + "}"
+
+
+def render_histogram(lines, name, help_text, series):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), hist in sorted(series.items()):
+        for upper, count in zip(hist.buckets, hist.counts):
+            lines.append(f"{name}_bucket{labels(method=method, route=route, le=upper)} {count}")
+        lines.append(f"{name}_bucket{labels(method=method, route=route, le='+Inf')} {hist.total}")
+        lines.append(f"{name}_sum{labels(method=method, route=route)} {hist.sum}")
+        lines.append(f"{name}_count{labels(method=method, route=route)} {hist.total}")
+
+
+def render_metrics():
+    lines = []
+    with registry.lock:
+        render_histogram(lines, "maxelo_http_request_duration_seconds",
+                         "Request latency by route.", registry.latency)
+        render_histogram(lines, "maxelo_http_request_db_seconds",
+                         "Time spent in database statements per request.", registry.db_latency)
+
+        lines.append("# HELP maxelo_http_requests_total Requests by route and status.")
+        lines.append("# TYPE maxelo_http_requests_total counter")
+        for (method, route, status), count in sorted(registry.requests.items()):
+            lines.append(f"maxelo_http_requests_total{labels(method=method, route=route, status=status)} {count}")
+
+        lines.append("# HELP maxelo_db_queries_total Database statements executed, by route.")
+        lines.append("# TYPE maxelo_db_queries_total counter")
+        for (method, route), count in sorted(registry.queries.items()):
+            lines.append(f"maxelo_db_queries_total{labels(method=method, route=route)} {count}")
+
+    stats = db.pool_stats()
+    if stats:
+        pool_series = {
+            "maxelo_db_pool_in_use": ("Connections checked out.", "gauge", stats["in_use"]),
+            "maxelo_db_pool_idle": ("Idle pooled connections.", "gauge", stats["idle"]),
+            "maxelo_db_pool_max_size": ("Configured pool maximum.", "gauge", stats["max_size"]),
+            "maxelo_db_pool_checkouts_total": ("Connections handed out.", "counter", stats["checkouts"]),
+            "maxelo_db_pool_wait_seconds_total": ("Time spent waiting for a connection.", "counter",
+                                                  stats["wait_time_total"]),
+            "maxelo_db_pool_exhaustion_total": ("Checkouts that had to wait for a free connection.", "counter",
+                                                stats["exhaustion_events"]),
+            "maxelo_db_pool_timeouts_total": ("Checkouts that gave up waiting.", "counter", stats["timeouts"]),
+        }
+        for name, (help_text, kind, value) in pool_series.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+
+    statements = repository.statement_stats()
+    if statements:
+        statement_series = [
+            ("maxelo_db_statement_calls_total", "Executions of each repository statement.", "counter", "calls"),
+            ("maxelo_db_statement_seconds_total", "Time spent executing each repository statement.", "counter",
+             "seconds"),
+            ("maxelo_db_statement_max_seconds", "Slowest execution of each repository statement.", "gauge",
+             "max_seconds"),
+            ("maxelo_db_statement_prepares_total", "Server-side PREPAREs of each repository statement.", "counter",
+             "prepares"),
+        ]
+        for name, help_text, kind, key in statement_series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for statement, stats in sorted(statements.items()):
+                lines.append(f"{name}{labels(statement=statement)} {stats[key]}")
+
+    stats = db.replica_stats()
+    if stats:
+        replica_series = {
+            "maxelo_db_replica_lag_seconds": ("Replica lag at the last check.", "gauge", stats["lag"] or 0),
+            "maxelo_db_replica_reads_total": ("Read-only requests served by the replica.", "counter",
+                                              stats["reads"]),
+        }
+        for name, (help_text, kind, value) in replica_series.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        lines.append("# HELP maxelo_db_replica_fallbacks_total Read-only requests sent to the primary, by reason.")
+        lines.append("# TYPE maxelo_db_replica_fallbacks_total counter")
+        for reason in ("lag", "error", "sticky"):
+            lines.append(f"maxelo_db_replica_fallbacks_total{labels(reason=reason)} {stats['fallback_' + reason]}")
+
+    stats = presence.hub_stats()
+    if stats:
+        presence_series = {
+            "maxelo_presence_streams": ("Open live presence streams.", "gauge", stats["subscribers"]),
+            "maxelo_presence_events_total": ("Clock notifications received by the listener.", "counter",
+                                             stats["events"]),
+            "maxelo_presence_resyncs_total": ("Full presence board reloads.", "counter", stats["resyncs"]),
+        }
+        for name, (help_text, kind, value) in presence_series.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+
+    stats = clock_writer.batcher_stats()
+    if stats:
+        batcher_series = {
+            "maxelo_clock_in_pending": ("Clock-ins queued for the next batch.", "gauge", stats["pending"]),
+            "maxelo_clock_in_batches_total": ("Clock-in batches committed.", "counter", stats["batches"]),
+            "maxelo_clock_in_events_total": ("Clock-ins written by the batcher.", "counter", stats["events"]),
+            "maxelo_clock_in_batch_failures_total": ("Batches that failed and were retried row by row.",
+                                                     "counter", stats["failures"]),
+        }
+        for name, (help_text, kind, value) in batcher_series.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+# --- Request hooks ---
+def start_timer():
+    g.request_started = time.perf_counter()
+    g.db_queries = 0
+    g.db_time = 0.0
+
+
+def record_request(response):
+    started = g.get("request_started")
+    if started is None:
+        return response
+
+    duration = time.perf_counter() - started
+    db_time = g.get("db_time", 0.0)
+    queries = g.get("db_queries", 0)
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+
+    registry.observe(request.method, route, response.status_code, duration, db_time, queries)
+    served_by = ", replica" if "read_db" in g else ""
+    response.headers.add(
+        "Server-Timing",
+        f'app;dur={duration * 1000:.1f}, db;dur={db_time * 1000:.1f};desc="{queries} queries{served_by}"',
+    )
+    return response
+
+
+def metrics_view():
+    # Optional bearer token so /metrics isn't public on Render
+    token = os.getenv("METRICS_TOKEN")
+    if token:
+        supplied = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(supplied, f"Bearer {token}"):
+            return Response("unauthorized\n", status=401, mimetype="text/plain")
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    app.before_request(start_timer)
+    app.after_request(record_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
@@ -0,0 +1,84 @@
+import importlib
+import pkgutil
+
+# Arbitrary constant used with pg_advisory_lock so two workers or two
+# `flask migrate` runs never apply the same migration concurrently.
+MIGRATION_LOCK_ID = 7_200_2023
+
+
+# --- Discover migrations ---
+# Each module in this package is named vNNN_description.py and defines
+# VERSION, DESCRIPTION and upgrade(cur).
+def load_migrations():
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        if not info.name.startswith("v"):
+            continue
+        module = importlib.import_module(f"{__name__}.{info.name}")
+        migrations.append(module)
+    migrations.sort(key=lambda m: m.VERSION)
+
+    versions = [m.VERSION for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return migrations
+
+
+def ensure_version_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def applied_versions(cur):
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+# --- Apply pending migrations ---
+# Every migration runs in its own transaction together with its
+# schema_migrations row, so a failure leaves the database at the last
+# fully applied version.
+def apply_migrations(conn, target=None):
+    applied = []
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        ensure_version_table(cur)
+        conn.commit()
+
+        done = applied_versions(cur)
+        for migration in load_migrations():
+            if migration.VERSION in done:
+                continue
+            if target is not None and migration.VERSION > target:
+                break
+            migration.upgrade(cur)
+            cur.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (migration.VERSION, migration.DESCRIPTION),
+            )
+            conn.commit()
+            applied.append(migration.VERSION)
+            print(f"Applied migration {migration.VERSION}: {migration.DESCRIPTION}")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+        conn.commit()
+        cur.close()
+    return applied
+
+
+def migration_status(conn):
+    cur = conn.cursor()
+    ensure_version_table(cur)
+    conn.commit()
+    done = applied_versions(cur)
+    cur.close()
+    return [(m.VERSION, m.DESCRIPTION, m.VERSION in done) for m in load_migrations()]
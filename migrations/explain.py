@@ -0,0 +1,62 @@
+import json
+
+import business_time
+from repository import LATEST_OPEN_SESSION, MONTH_TIMESHEET, REGISTER_PAGE
+
+# --- Index usage check for the hot attendance queries ---
+# The statements are the ones the app runs (repository.py), with
+# representative parameters: timestamptz bounds of the current business
+# day/month, as the app passes them. Sequential scans are disabled for the
+# check so the planner reveals whether an index is usable at all, even on
+# a near-empty dev database.
+def plain(statement, *params):
+    return statement.plain_sql, {f"p{i + 1}": value for i, value in enumerate(params)}
+
+
+def register_page(clauses, params, order="DESC", page_size=50):
+    sql = REGISTER_PAGE.format(where=" AND ".join(["a.clockIn IS NOT NULL"] + clauses), order=order)
+    return sql, params + [page_size + 1]
+
+
+def hot_queries(employee_id=1, today=None):
+    today = today or business_time.today()
+    day_start, day_end = business_time.day_bounds(today)
+    month_start, month_end = business_time.month_bounds(today)
+    return {
+        "employee_dashboard timesheet": plain(MONTH_TIMESHEET, employee_id, month_start, month_end),
+        "clock_out open session": plain(LATEST_OPEN_SESSION, employee_id),
+        "register first page": register_page([], []),
+        "register next page": register_page(["(a.clockIn, a.id) < (%s, %s)"], [day_end, 0]),
+        "register day": register_page(["a.clockIn >= %s", "a.clockIn < %s"], [day_start, day_end]),
+        "register employee month": register_page(
+            ["a.clockIn >= %s", "a.clockIn < %s", "a.employee_id = %s"], [month_start, month_end, employee_id]),
+    }
+
+
+def attendance_scan_types(plan):
+    scans = []
+    # Matches the parent table and its monthly partitions
+    if plan.get("Relation Name", "").lower().startswith("attendanceregister"):
+        scans.append(plan["Node Type"])
+    for child in plan.get("Plans", []):
+        scans.extend(attendance_scan_types(child))
+    return scans
+
+
+def check_index_usage(conn, today=None):
+    results = {}
+    cur = conn.cursor()
+    try:
+        cur.execute("SET LOCAL enable_seqscan = off")
+        for name, (sql, params) in hot_queries(today=today).items():
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cur.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans = attendance_scan_types(plan[0]["Plan"])
+            uses_index = bool(scans) and all("Index" in scan or scan == "Bitmap Heap Scan" for scan in scans)
+            results[name] = (uses_index, scans)
+    finally:
+        conn.rollback()
+        cur.close()
+    return results
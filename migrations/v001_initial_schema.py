@@ -0,0 +1,32 @@
+VERSION = 1
+DESCRIPTION = "Employee and attendance tables"
+
+
+def upgrade(cur):
+    # IF NOT EXISTS so databases created before migrations were introduced
+    # are adopted as version 1 unchanged.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS MaxeloClientTable (
+            id BIGSERIAL PRIMARY KEY,
+            names VARCHAR(100) NOT NULL,
+            surname VARCHAR(100) NOT NULL,
+            phoneNumber VARCHAR(20) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            role VARCHAR(50) NOT NULL,
+            position VARCHAR(50)
+        )
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS AttendanceRegister (
+            id BIGSERIAL PRIMARY KEY,
+            employee_id BIGINT NOT NULL,
+            clockIn TIMESTAMP,
+            clockOut TIMESTAMP,
+            notes TEXT,
+            CONSTRAINT fk_employee
+                FOREIGN KEY (employee_id) REFERENCES MaxeloClientTable(id)
+                ON DELETE CASCADE
+        )
+    """)
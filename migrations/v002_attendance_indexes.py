@@ -0,0 +1,29 @@
+VERSION = 2
+DESCRIPTION = "Indexes for the attendance and dashboard queries"
+
+
+def upgrade(cur):
+    # Per-employee lookups: today's row, this month's rows, FK cascade on delete
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_attendance_employee_clockin
+        ON AttendanceRegister (employee_id, clockIn)
+    """)
+
+    # Open sessions looked up by clock_out; stays small however long history grows
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_attendance_open_sessions
+        ON AttendanceRegister (employee_id, clockIn)
+        WHERE clockOut IS NULL
+    """)
+
+    # Register paging on (clockIn, id) and the admin dashboard's day range
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_attendance_clockin_id
+        ON AttendanceRegister (clockIn, id)
+    """)
+
+    # Roles are stored in mixed case ('Admin' for the seeded user)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_employee_role
+        ON MaxeloClientTable (LOWER(role))
+    """)
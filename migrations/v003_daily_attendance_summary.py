@@ -0,0 +1,28 @@
+from attendance_summary import rebuild_summary
+
+VERSION = 3
+DESCRIPTION = "Daily attendance rollup and role headcount"
+
+
+def upgrade(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS daily_attendance_summary (
+            day DATE NOT NULL,
+            role VARCHAR(50) NOT NULL,
+            present INTEGER NOT NULL DEFAULT 0,
+            late INTEGER NOT NULL DEFAULT 0,
+            open_sessions INTEGER NOT NULL DEFAULT 0,
+            closed_sessions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, role)
+        )
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS role_headcount (
+            role VARCHAR(50) PRIMARY KEY,
+            headcount INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    # Backfill from existing history
+    rebuild_summary(cur)
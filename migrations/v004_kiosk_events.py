@@ -0,0 +1,15 @@
+VERSION = 4
+DESCRIPTION = "Idempotency log for kiosk clock events"
+
+
+def upgrade(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS kiosk_events (
+            idempotency_key VARCHAR(100) PRIMARY KEY,
+            employee_id BIGINT NOT NULL,
+            event VARCHAR(10) NOT NULL,
+            event_time TIMESTAMP NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            received_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
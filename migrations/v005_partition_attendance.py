@@ -0,0 +1,58 @@
+
+from partitions import ensure_partitions, month_start
+
+VERSION = 5
+DESCRIPTION = "Partition AttendanceRegister by month on clockIn"
+
+
+def upgrade(cur):
+    # The partition key must be part of the primary key, so clockIn becomes
+    # NOT NULL. The app never writes a row without one; refuse to guess if
+    # older data has some.
+    cur.execute("SELECT COUNT(*) FROM AttendanceRegister WHERE clockIn IS NULL")
+    missing = cur.fetchone()[0]
+    if missing:
+        raise RuntimeError(
+            f"{missing} AttendanceRegister row(s) have no clockIn; "
+            "set or delete them before partitioning"
+        )
+
+    cur.execute("ALTER TABLE AttendanceRegister RENAME TO attendanceregister_legacy")
+    cur.execute("ALTER INDEX attendanceregister_pkey RENAME TO attendanceregister_legacy_pkey")
+
+    # Same columns and id sequence as before
+    cur.execute("""
+        CREATE TABLE AttendanceRegister (
+            id BIGINT NOT NULL DEFAULT nextval('attendanceregister_id_seq'),
+            employee_id BIGINT NOT NULL,
+            clockIn TIMESTAMP NOT NULL,
+            clockOut TIMESTAMP,
+            notes TEXT,
+            PRIMARY KEY (id, clockIn),
+            CONSTRAINT fk_employee
+                FOREIGN KEY (employee_id) REFERENCES MaxeloClientTable(id)
+                ON DELETE CASCADE
+        ) PARTITION BY RANGE (clockIn)
+    """)
+    cur.execute("CREATE TABLE attendanceregister_default PARTITION OF AttendanceRegister DEFAULT")
+
+    cur.execute("SELECT MIN(clockIn) FROM attendanceregister_legacy")
+    oldest = cur.fetchone()[0]
+    ensure_partitions(cur, start=month_start(oldest.date()) if oldest else None)
+
+    cur.execute("""
+        INSERT INTO AttendanceRegister (id, employee_id, clockIn, clockOut, notes)
+        SELECT id, employee_id, clockIn, clockOut, notes FROM attendanceregister_legacy
+    """)
+    cur.execute("ALTER SEQUENCE attendanceregister_id_seq OWNED BY AttendanceRegister.id")
+    cur.execute("DROP TABLE attendanceregister_legacy")
+
+    # Recreate the indexes from migration 2 on the partitioned parent; each
+    # partition gets its own copy, present and future.
+    cur.execute("CREATE INDEX idx_attendance_employee_clockin ON AttendanceRegister (employee_id, clockIn)")
+    cur.execute("""
+        CREATE INDEX idx_attendance_open_sessions
+        ON AttendanceRegister (employee_id, clockIn)
+        WHERE clockOut IS NULL
+    """)
+    cur.execute("CREATE INDEX idx_attendance_clockin_id ON AttendanceRegister (clockIn, id)")
@@ -0,0 +1,13 @@
+VERSION = 6
+DESCRIPTION = "Server-side session store"
+
+
+def upgrade(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS app_sessions (
+            sid VARCHAR(64) PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_app_sessions_expires ON app_sessions (expires_at)")
@@ -0,0 +1,19 @@
+VERSION = 7
+DESCRIPTION = "Full-text search column and GIN index on the employee directory"
+
+
+def upgrade(cur):
+    # Names rank above email, email above phone/role/position. The email is
+    # indexed whole and split on punctuation so "jo@x" and "x.com" both match.
+    cur.execute("""
+        ALTER TABLE MaxeloClientTable ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', names || ' ' || surname), 'A') ||
+            setweight(to_tsvector('simple', email || ' ' || translate(email, '@._-+', '     ')), 'B') ||
+            setweight(to_tsvector('simple', phoneNumber || ' ' || role || ' ' || COALESCE(position, '')), 'C')
+        ) STORED
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_employee_search
+        ON MaxeloClientTable USING GIN (search_vector)
+    """)
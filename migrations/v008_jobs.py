@@ -0,0 +1,31 @@
+VERSION = 8
+DESCRIPTION = "Background job queue"
+
+
+def upgrade(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id BIGSERIAL PRIMARY KEY,
+            kind VARCHAR(50) NOT NULL,
+            params JSONB NOT NULL DEFAULT '{}',
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            progress INTEGER NOT NULL DEFAULT 0,
+            message TEXT,
+            result JSONB,
+            unique_key VARCHAR(100) UNIQUE,
+            created_by BIGINT REFERENCES MaxeloClientTable(id) ON DELETE SET NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker VARCHAR(100),
+            run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            started_at TIMESTAMPTZ,
+            heartbeat_at TIMESTAMPTZ,
+            finished_at TIMESTAMPTZ
+        )
+    """)
+    # Workers only ever look for due queued jobs
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_queued
+        ON jobs (run_after, id) WHERE status = 'queued'
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at DESC)")
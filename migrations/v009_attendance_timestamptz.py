@@ -0,0 +1,68 @@
+from business_time import BUSINESS_TIMEZONE_NAME
+from partitions import ensure_partitions, month_start
+
+VERSION = 9
+DESCRIPTION = "Store attendance and kiosk times as timestamptz"
+
+
+def upgrade(cur):
+    # Existing TIMESTAMP values are business-local wall times (the app wrote
+    # Africa/Johannesburg strings); read them as such. The type of a partition
+    # key can't be altered in place, so the rows are copied out, the table is
+    # rebuilt as in migration 5 with TIMESTAMPTZ columns and business-midnight
+    # partition bounds, and the rows copied back.
+    params = {"tz": BUSINESS_TIMEZONE_NAME}
+    cur.execute("""
+        CREATE TEMP TABLE attendance_backfill ON COMMIT DROP AS
+        SELECT id, employee_id,
+               clockIn AT TIME ZONE %(tz)s AS clockIn,
+               clockOut AT TIME ZONE %(tz)s AS clockOut,
+               notes
+        FROM AttendanceRegister
+    """, params)
+
+    # Keep the id sequence (and so every id) across the rebuild
+    cur.execute("ALTER SEQUENCE attendanceregister_id_seq OWNED BY NONE")
+    cur.execute("DROP TABLE AttendanceRegister")
+    cur.execute("""
+        CREATE TABLE AttendanceRegister (
+            id BIGINT NOT NULL DEFAULT nextval('attendanceregister_id_seq'),
+            employee_id BIGINT NOT NULL,
+            clockIn TIMESTAMPTZ NOT NULL,
+            clockOut TIMESTAMPTZ,
+            notes TEXT,
+            PRIMARY KEY (id, clockIn),
+            CONSTRAINT fk_employee
+                FOREIGN KEY (employee_id) REFERENCES MaxeloClientTable(id)
+                ON DELETE CASCADE
+        ) PARTITION BY RANGE (clockIn)
+    """)
+    cur.execute("CREATE TABLE attendanceregister_default PARTITION OF AttendanceRegister DEFAULT")
+
+    cur.execute("SELECT MIN(clockIn AT TIME ZONE %(tz)s) FROM attendance_backfill", params)
+    oldest = cur.fetchone()[0]
+    ensure_partitions(cur, start=month_start(oldest.date()) if oldest else None)
+
+    cur.execute("""
+        INSERT INTO AttendanceRegister (id, employee_id, clockIn, clockOut, notes)
+        SELECT id, employee_id, clockIn, clockOut, notes FROM attendance_backfill
+    """)
+    cur.execute("ALTER SEQUENCE attendanceregister_id_seq OWNED BY AttendanceRegister.id")
+
+    cur.execute("CREATE INDEX idx_attendance_employee_clockin ON AttendanceRegister (employee_id, clockIn)")
+    cur.execute("""
+        CREATE INDEX idx_attendance_open_sessions
+        ON AttendanceRegister (employee_id, clockIn)
+        WHERE clockOut IS NULL
+    """)
+    cur.execute("CREATE INDEX idx_attendance_clockin_id ON AttendanceRegister (clockIn, id)")
+
+    # Kiosk times were business-local too; received_at came from NOW() in
+    # the server's own zone, which is the TimeZone setting's reset value
+    cur.execute("SELECT reset_val FROM pg_settings WHERE name = 'TimeZone'")
+    server_tz = cur.fetchone()[0]
+    cur.execute("""
+        ALTER TABLE kiosk_events
+            ALTER COLUMN event_time TYPE TIMESTAMPTZ USING event_time AT TIME ZONE %s,
+            ALTER COLUMN received_at TYPE TIMESTAMPTZ USING received_at AT TIME ZONE %s
+    """, (BUSINESS_TIMEZONE_NAME, server_tz))
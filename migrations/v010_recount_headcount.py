@@ -0,0 +1,8 @@
+from attendance_summary import rebuild_headcount
+
+VERSION = 10
+DESCRIPTION = "Recount role headcount (the seeded admin was never counted)"
+
+
+def upgrade(cur):
+    rebuild_headcount(cur)
@@ -0,0 +1,11 @@
+VERSION = 11
+DESCRIPTION = "Shared cache version counters"
+
+
+def upgrade(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        )
+    """)
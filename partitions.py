@@ -0,0 +1,143 @@
+import gzip
+import os
+import re
+from datetime import date
+
+from psycopg2 import sql
+
+import business_time
+
+PARENT = "attendanceregister"
+DEFAULT_PARTITION = "attendanceregister_default"
+PARTITION_RE = re.compile(r"^attendanceregister_y(\d{4})m(\d{2})$")
+
+PARTITIONS_AHEAD = int(os.getenv("ATTENDANCE_PARTITIONS_AHEAD", "3"))
+RETENTION_MONTHS = int(os.getenv("ATTENDANCE_RETENTION_MONTHS", "24"))
+ARCHIVE_DIR = os.getenv("ATTENDANCE_ARCHIVE_DIR", "archive")
+
+
+# --- Month helpers ---
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name):
+    match = PARTITION_RE.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def list_partitions(cur):
+    cur.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+    """, (PARENT,))
+    months = [partition_month(row[0]) for row in cur.fetchall()]
+    return sorted(m for m in months if m is not None)
+
+
+# --- Create ---
+# Rows for a month that has no partition yet land in the DEFAULT partition.
+# Creating the month's partition moves them out first, so ATTACH never
+# fails on rows already sitting in DEFAULT. Bounds are business-local
+# midnights, so a month's partition holds exactly that month's clock-ins.
+def create_partition(cur, month):
+    name = sql.Identifier(partition_name(month))
+    lower, upper = business_time.start_of_day(month), business_time.start_of_day(add_months(month, 1))
+
+    cur.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)").format(
+        name, sql.Identifier(PARENT)))
+    cur.execute(sql.SQL("""
+        WITH moved AS (
+            DELETE FROM {default} WHERE clockIn >= %s AND clockIn < %s RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """).format(default=sql.Identifier(DEFAULT_PARTITION), name=name), (lower, upper))
+    cur.execute(sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)").format(
+        sql.Identifier(PARENT), name), (lower, upper))
+
+
+def ensure_partitions(cur, start=None, months_ahead=PARTITIONS_AHEAD, today=None):
+    # Every month from start (default: current month) through months_ahead
+    current = month_start(today or business_time.today())
+    month = month_start(start) if start else current
+    existing = set(list_partitions(cur))
+    created = []
+    while month <= add_months(current, months_ahead):
+        if month not in existing:
+            create_partition(cur, month)
+            created.append(month)
+        month = add_months(month, 1)
+    return created
+
+
+# --- Archive / restore ---
+def archive_path(directory, month):
+    return os.path.join(directory, f"{partition_name(month)}.csv.gz")
+
+
+def archive_partitions(conn, older_than_months=RETENTION_MONTHS, directory=ARCHIVE_DIR, today=None):
+    # Write months that ended before the cutoff to gzip CSV, then detach and
+    # drop them. One transaction per month. The export runs against the
+    # partition alone, under a SHARE lock that only holds back writes to that
+    # (old) month; the ACCESS EXCLUSIVE lock DETACH takes on AttendanceRegister,
+    # which blocks every clock-in, is held just for DETACH + DROP. The file is
+    # fully written and flushed before the DROP is committed.
+    cutoff = add_months(month_start(today or business_time.today()), -older_than_months)
+    os.makedirs(directory, exist_ok=True)
+    archived = []
+
+    cur = conn.cursor()
+    try:
+        for month in list_partitions(cur):
+            if month >= cutoff:
+                continue
+            name = sql.Identifier(partition_name(month))
+            path = archive_path(directory, month)
+
+            cur.execute(sql.SQL("LOCK TABLE {} IN SHARE MODE").format(name))
+            with gzip.open(path + ".tmp", "wt", encoding="utf-8", newline="") as f:
+                cur.copy_expert(sql.SQL("COPY {} TO STDOUT WITH (FORMAT csv, HEADER true)").format(name), f)
+            os.replace(path + ".tmp", path)
+            cur.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(sql.Identifier(PARENT), name))
+            cur.execute(sql.SQL("DROP TABLE {}").format(name))
+            conn.commit()
+            archived.append((month, path))
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return archived
+
+
+def restore_partition(conn, path):
+    month = partition_month(os.path.basename(path).split(".")[0])
+    if month is None:
+        raise ValueError(f"Not an attendance archive file name: {path}")
+
+    cur = conn.cursor()
+    try:
+        if month not in list_partitions(cur):
+            create_partition(cur, month)
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            cur.copy_expert(sql.SQL("COPY {} FROM STDIN WITH (FORMAT csv, HEADER true)").format(
+                sql.Identifier(partition_name(month))), f)
+        restored = cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return month, restored
@@ -0,0 +1,290 @@
+import json
+import os
+import queue
+import select
+import threading
+import time
+
+import psycopg2
+
+import attendance_summary
+import business_time
+import db
+
+CHANNEL = "attendance_events"
+PRESENCE_HEARTBEAT = float(os.getenv("PRESENCE_HEARTBEAT", "15"))  # seconds between keep-alives
+PRESENCE_RESYNC = float(os.getenv("PRESENCE_RESYNC", "300"))  # full reload, catches anything missed
+# Streams per worker. Each one holds a server thread while open, so
+# gunicorn.conf.py sizes its thread pool from this as well
+PRESENCE_MAX_CLIENTS = int(os.getenv("PRESENCE_MAX_CLIENTS", "5"))
+PRESENCE_QUEUE_SIZE = 100
+
+
+class PresenceFull(Exception):
+    pass
+
+
+# --- Notifications ---
+# Sent inside the writer's transaction: PostgreSQL delivers them on commit
+# and drops them on rollback, so the board never shows a clock-in that
+# didn't happen. events: [(kind, employee_id, datetime)]; the payload carries
+# business-local "YYYY-MM-DD HH:MM".
+def notify_events(cur, events):
+    payloads = [
+        json.dumps({"kind": kind, "employee_id": employee_id,
+                    "at": business_time.localtime(at).strftime("%Y-%m-%d %H:%M")})
+        for kind, employee_id, at in events
+    ]
+    if payloads:
+        cur.execute("SELECT pg_notify(%s, p) FROM unnest(%s::text[]) AS p", (CHANNEL, payloads))
+
+
+def notify(cur, kind, employee_id, at):
+    notify_events(cur, [(kind, employee_id, at)])
+
+
+def notify_directory(cur):
+    # Employees added or removed: listeners reload headcount and names
+    cur.execute("SELECT pg_notify(%s, %s)", (CHANNEL, json.dumps({"kind": "directory"})))
+
+
+# --- Board state ---
+SNAPSHOT_QUERY = """
+    SELECT e.id, e.names || ' ' || e.surname,
+           max(a.clockIn) FILTER (WHERE a.clockOut IS NULL)
+    FROM AttendanceRegister a
+    JOIN MaxeloClientTable e ON e.id = a.employee_id
+    WHERE a.clockIn >= %(start)s AND a.clockIn < %(end)s
+    GROUP BY e.id, e.names, e.surname
+"""
+
+
+class PresenceBoard:
+    def __init__(self):
+        self.day = None
+        self.employees = 0
+        self.present = set()
+        self.in_office = {}  # employee_id -> {"id", "name", "since"}
+        self.names = {}
+
+    def load(self, cur, day):
+        start, end = business_time.day_bounds(day)
+        cur.execute(SNAPSHOT_QUERY, {"start": start, "end": end})
+        rows = cur.fetchall()
+        self.day = day
+        self.employees = attendance_summary.dashboard_counts(cur, day)["employees"]
+        self.present = {employee_id for employee_id, _, _ in rows}
+        self.names = {employee_id: name for employee_id, name, _ in rows}
+        self.in_office = {
+            employee_id: {"id": employee_id, "name": name, "since": business_time.localtime(since).strftime("%H:%M")}
+            for employee_id, name, since in rows if since is not None
+        }
+
+    def counts(self):
+        return {
+            "employees": self.employees,
+            "present": len(self.present),
+            "absent": max(self.employees - len(self.present), 0),
+        }
+
+    def snapshot(self):
+        return {
+            "day": str(self.day),
+            "counts": self.counts(),
+            "in_office": sorted(self.in_office.values(), key=lambda e: (e["since"], e["name"])),
+        }
+
+    def applies(self, event):
+        # Kiosk backfills and other days don't touch today's board
+        return event.get("kind") in ("in", "out") and (event.get("at") or "")[:10] == str(self.day)
+
+    def apply(self, event):
+        """Apply one clock event; returns the update to broadcast, or None."""
+        if not self.applies(event):
+            return None
+
+        employee_id, at = event["employee_id"], event["at"]
+        if event["kind"] == "in":
+            self.present.add(employee_id)
+            entry = {"id": employee_id, "name": self.names[employee_id], "since": at[11:16]}
+            self.in_office[employee_id] = entry
+        elif event["kind"] == "out":
+            entry = self.in_office.pop(employee_id, None)
+            if entry is None:
+                return None
+        return {"kind": event["kind"], "employee": entry, "counts": self.counts()}
+
+
+# --- Listener ---
+# One per process: a daemon thread holds a dedicated autocommit connection
+# (outside the request pool) with LISTEN on CHANNEL, keeps the board in
+# memory and pushes each change to every subscribed SSE stream. Streams
+# never query; a new one starts from the in-memory snapshot. Like the clock-in
+# batcher, a forked worker starts its own.
+class PresenceHub:
+    def __init__(self, dsn=None):
+        self.dsn = dsn
+        self.pid = os.getpid()
+        self.board = PresenceBoard()
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._thread = None
+        self.events = 0
+        self.resyncs = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="presence-listener", daemon=True)
+                self._thread.start()
+
+    def subscribe(self):
+        self.start()
+        with self._lock:
+            if len(self._subscribers) >= PRESENCE_MAX_CLIENTS:
+                raise PresenceFull(f"{PRESENCE_MAX_CLIENTS} live streams already open")
+            q = queue.Queue(maxsize=PRESENCE_QUEUE_SIZE)
+            if self.ready.is_set():
+                q.put(("snapshot", self.board.snapshot()))
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def snapshot(self):
+        with self._lock:
+            return self.board.snapshot() if self.ready.is_set() else None
+
+    def _broadcast(self, event, data):
+        # Caller holds the lock. A client too slow to keep up gets its backlog
+        # replaced by a fresh snapshot rather than holding up everyone else.
+        for q in self._subscribers:
+            try:
+                q.put_nowait((event, data))
+            except queue.Full:
+                while not q.empty():
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        break
+                q.put_nowait(("snapshot", self.board.snapshot()))
+
+    def _resync(self, conn):
+        cur = conn.cursor()
+        day = business_time.today()
+        board = PresenceBoard()
+        board.load(cur, day)
+        cur.close()
+        with self._lock:
+            self.board = board
+            self.resyncs += 1
+            self.ready.set()
+            self._broadcast("snapshot", board.snapshot())
+
+    def _lookup_name(self, conn, employee_id):
+        cur = conn.cursor()
+        cur.execute("SELECT names || ' ' || surname FROM MaxeloClientTable WHERE id = %s", (employee_id,))
+        row = cur.fetchone()
+        cur.close()
+        return row[0] if row else f"Employee {employee_id}"
+
+    def _handle(self, conn, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        if event.get("kind") == "directory":
+            self._resync(conn)
+            return
+        board = self.board
+        if board.applies(event) and event["employee_id"] not in board.names:
+            # Only the listener thread writes the board, so the name can be
+            # fetched before taking the lock
+            board.names[event["employee_id"]] = self._lookup_name(conn, event["employee_id"])
+        with self._lock:
+            self.events += 1
+            update = board.apply(event)
+            if update is not None:
+                self._broadcast("update", update)
+
+    def _listen(self):
+        conn = db.connect(self.dsn)
+        conn.autocommit = True
+        try:
+            cur = conn.cursor()
+            cur.execute(f"LISTEN {CHANNEL}")
+            cur.close()
+            # Anything committed before LISTEN is picked up by the reload
+            self._resync(conn)
+            synced_at = time.monotonic()
+            while True:
+                if select.select([conn], [], [], 1.0) != ([], [], []):
+                    conn.poll()
+                    while conn.notifies:
+                        self._handle(conn, conn.notifies.pop(0).payload)
+                if business_time.today() != self.board.day or time.monotonic() - synced_at >= PRESENCE_RESYNC:
+                    self._resync(conn)
+                    synced_at = time.monotonic()
+        finally:
+            conn.close()
+
+    def _run(self):
+        while True:
+            try:
+                self._listen()
+            except (psycopg2.Error, OSError) as e:
+                print("⚠️ Presence listener lost its connection, retrying:", e)
+                time.sleep(2)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "events": self.events,
+                "resyncs": self.resyncs,
+            }
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    global _hub
+    if _hub is None or _hub.pid != os.getpid():
+        with _hub_lock:
+            if _hub is None or _hub.pid != os.getpid():
+                _hub = PresenceHub()
+    return _hub
+
+
+def hub_stats():
+    if _hub is None or _hub.pid != os.getpid():
+        return None
+    return _hub.stats()
+
+
+# --- SSE stream ---
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream(q):
+    hub = get_hub()
+    try:
+        # Tell EventSource how long to wait before reconnecting after a drop
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event, data = q.get(timeout=PRESENCE_HEARTBEAT)
+            except queue.Empty:
+                # Comment line: keeps proxies from timing out the idle stream and
+                # surfaces a closed client as a failed write
+                yield ": keep-alive\n\n"
+                continue
+            yield sse(event, data)
+    finally:
+        hub.unsubscribe(q)
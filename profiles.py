@@ -0,0 +1,34 @@
+import os
+
+from cache import TTLCache
+from repository import EmployeeRepository
+
+# --- Profile cache ---
+# Per worker, keyed by the directory version (fragments.DIRECTORY). Every
+# employee add/edit/delete/import bumps it in the writing transaction, so a
+# change made on any worker or host makes every cached copy miss, and a form
+# filled from the cache never shows old values. The TTL only bounds how long
+# profiles nobody asks for stay in memory; invalidate() frees this worker's
+# copies straight after an edit or delete.
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "600"))
+
+_cache = TTLCache(maxsize=int(os.getenv("PROFILE_CACHE_SIZE", "4096")), ttl=PROFILE_CACHE_TTL)
+
+
+# version must be read before the profile, on the same connection
+def get_profile(cur, employee_id, version):
+    key = (employee_id, version)
+    profile = _cache.get(key)
+    if profile is None:
+        profile = EmployeeRepository(cur).get(employee_id)
+        if profile is not None:
+            _cache.set(key, profile)
+    return profile
+
+
+def invalidate(employee_id):
+    _cache.delete_where(lambda key: key[0] == employee_id)
+
+
+def cache_stats():
+    return _cache.stats()
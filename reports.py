@@ -0,0 +1,201 @@
+import base64
+import os
+from datetime import timedelta
+
+import business_time
+from attendance_summary import WORK_START_TIME
+
+# Attendance type is the "(type)" prefix that clock_in writes into notes
+ATTENDANCE_TYPE_PATTERN = r"^\(([^)]*)\)"
+
+# --- Payroll attendance report ---
+# One set-based pass over the period's AttendanceRegister rows: sessions are
+# rolled up to employee-days, then to employees, and joined back onto the
+# directory so people with no attendance still appear with zeros.
+PAYROLL_QUERY = """
+    WITH sessions AS (
+        SELECT a.employee_id, DATE(a.clockIn) AS day, a.clockIn, a.clockOut,
+               EXTRACT(EPOCH FROM (a.clockOut - a.clockIn)) / 3600 AS hours,
+               COALESCE(NULLIF(LOWER(TRIM(SUBSTRING(a.notes FROM %(type_pattern)s))), ''), 'unspecified')
+                   AS attendance_type
+        FROM AttendanceRegister a
+        WHERE a.clockIn >= %(start_at)s AND a.clockIn < %(end_at)s
+    ),
+    employee_days AS (
+        SELECT employee_id, day, MIN(clockIn) AS first_in
+        FROM sessions
+        GROUP BY employee_id, day
+    ),
+    day_totals AS (
+        SELECT employee_id,
+               COUNT(*) AS days_present,
+               COUNT(*) FILTER (WHERE first_in::time > %(start_time)s::time) AS late_arrivals
+        FROM employee_days
+        GROUP BY employee_id
+    ),
+    session_totals AS (
+        SELECT employee_id,
+               COALESCE(SUM(hours), 0) AS total_hours,
+               COUNT(*) FILTER (WHERE clockOut IS NULL) AS unclosed_sessions
+        FROM sessions
+        GROUP BY employee_id
+    ),
+    type_totals AS (
+        SELECT employee_id, jsonb_object_agg(attendance_type, sessions) AS attendance_types
+        FROM (
+            SELECT employee_id, attendance_type, COUNT(*) AS sessions
+            FROM sessions
+            GROUP BY employee_id, attendance_type
+        ) t
+        GROUP BY employee_id
+    )
+    SELECT e.id, e.names, e.surname, e.role, e.position,
+           COALESCE(d.days_present, 0),
+           ROUND(COALESCE(s.total_hours, 0)::numeric, 2),
+           ROUND((COALESCE(s.total_hours, 0) / NULLIF(d.days_present, 0))::numeric, 2),
+           COALESCE(d.late_arrivals, 0),
+           COALESCE(s.unclosed_sessions, 0),
+           COALESCE(t.attendance_types, '{}'::jsonb)
+    FROM MaxeloClientTable e
+    LEFT JOIN day_totals d ON d.employee_id = e.id
+    LEFT JOIN session_totals s ON s.employee_id = e.id
+    LEFT JOIN type_totals t ON t.employee_id = e.id
+    WHERE (%(role)s IS NULL OR LOWER(e.role) = %(role)s)
+    ORDER BY e.surname, e.names, e.id
+"""
+
+PAYROLL_COLUMNS = [
+    "employee_id", "names", "surname", "role", "position", "days_present",
+    "total_hours", "average_hours", "late_arrivals", "unclosed_sessions", "attendance_types",
+]
+
+
+# start/end are inclusive dates
+def payroll_report(cur, start, end, start_time=None, role=None):
+    start_at, end_at = business_time.days_bounds(start, end)
+    cur.execute(PAYROLL_QUERY, {
+        "start_at": start_at,
+        "end_at": end_at,
+        "start_time": start_time or WORK_START_TIME,
+        "role": role.lower() if role else None,
+        "type_pattern": ATTENDANCE_TYPE_PATTERN,
+    })
+    return [dict(zip(PAYROLL_COLUMNS, row)) for row in cur.fetchall()]
+
+
+def attendance_type_names(rows):
+    return sorted({name for row in rows for name in row["attendance_types"]})
+
+
+# Flat headers + rows for CSV/PDF: one column per attendance type
+def payroll_table(rows):
+    type_names = attendance_type_names(rows)
+    columns = [c for c in PAYROLL_COLUMNS if c != "attendance_types"]
+    table = [
+        [row[c] for c in columns] + [row["attendance_types"].get(name, 0) for name in type_names]
+        for row in rows
+    ]
+    return columns + type_names, table
+
+
+# --- Presence matrix ---
+# Employees x working days for a date range. The calendar comes from
+# generate_series, the days someone clocked in are joined onto it, and the
+# unmatched cells are the absences. Each employee's row is aggregated into a
+# bit string in the same query, so the result is one row per employee.
+
+# ISO weekdays counted as working days (1 = Monday)
+WORKING_DAYS = [int(d) for d in os.getenv("WORKING_DAYS", "1,2,3,4,5").split(",")]
+PRESENCE_MAX_DAYS = int(os.getenv("PRESENCE_MAX_DAYS", "366"))
+
+PRESENCE_QUERY = """
+    WITH calendar AS (
+        SELECT d::date AS day
+        FROM generate_series(%(start)s::date, %(end)s::date, interval '1 day') AS d
+        WHERE EXTRACT(ISODOW FROM d)::int = ANY(%(working_days)s)
+    ),
+    present AS (
+        SELECT DISTINCT employee_id, DATE(clockIn) AS day
+        FROM AttendanceRegister
+        WHERE clockIn >= %(start_at)s AND clockIn < %(end_at)s
+    )
+    SELECT e.id, e.names, e.surname, e.role,
+           string_agg(CASE WHEN p.employee_id IS NULL THEN '0' ELSE '1' END, '' ORDER BY c.day),
+           COUNT(*) FILTER (WHERE p.employee_id IS NULL)
+    FROM MaxeloClientTable e
+    CROSS JOIN calendar c
+    LEFT JOIN present p ON p.employee_id = e.id AND p.day = c.day
+    WHERE (%(role)s IS NULL OR LOWER(e.role) = %(role)s)
+    GROUP BY e.id
+    ORDER BY e.surname, e.names, e.id
+"""
+
+PRESENCE_ENCODINGS = ("bits", "rle")
+PRESENCE_COLUMNS = ["id", "name", "role", "absent", "presence"]
+
+
+def working_days(start, end):
+    days = []
+    day = start
+    while day <= end:
+        if day.isoweekday() in WORKING_DAYS:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+# "bits": base64 of the row packed MSB-first, one bit per working day, zero padded
+def pack_bits(bits):
+    if not bits:
+        return ""
+    padded = bits + "0" * (-len(bits) % 8)
+    return base64.b64encode(int(padded, 2).to_bytes(len(padded) // 8, "big")).decode("ascii")
+
+
+def unpack_bits(encoded, length):
+    raw = base64.b64decode(encoded)
+    return bin(int.from_bytes(raw, "big"))[2:].zfill(len(raw) * 8)[:length] if raw else ""
+
+
+# "rle": alternating run lengths, starting with a (possibly empty) present run
+def run_lengths(bits):
+    runs = []
+    current, count = "1", 0
+    for bit in bits:
+        if bit == current:
+            count += 1
+        else:
+            runs.append(count)
+            current, count = bit, 1
+    runs.append(count)
+    return runs
+
+
+# start/end are inclusive dates
+def presence_matrix(cur, start, end, role=None, encoding="bits"):
+    days = working_days(start, end)
+    start_at, end_at = business_time.days_bounds(start, end)
+    cur.execute(PRESENCE_QUERY, {
+        "start": start,
+        "end": end,
+        "start_at": start_at,
+        "end_at": end_at,
+        "working_days": WORKING_DAYS,
+        "role": role.lower() if role else None,
+    })
+
+    # Positional rows keep the payload to roughly the matrix plus the names
+    encode = pack_bits if encoding == "bits" else run_lengths
+    employees = [
+        [employee_id, f"{names} {surname}", role_name, absent, encode(bits or "")]
+        for employee_id, names, surname, role_name, bits, absent in cur.fetchall()
+    ]
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "encoding": encoding,
+        "days": [d.isoformat() for d in days],
+        "columns": PRESENCE_COLUMNS,
+        "employees": employees,
+    }
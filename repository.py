@@ -0,0 +1,204 @@
+import os
+import re
+import threading
+import time
+
+import psycopg2
+import psycopg2.errors
+
+# Off for a pooler in transaction mode (pgbouncer), where a PREPAREd
+# statement doesn't follow the client from one transaction to the next
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "1").lower() not in ("0", "false", "off")
+
+
+# --- Rows ---
+# Lightweight, attribute-access rows; templates read them the same way they
+# read dicts (employee.names), without a dict per row.
+class Row:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def _asdict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._asdict() == other._asdict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class EmployeeRow(Row):
+    __slots__ = ("id", "names", "surname", "email", "phoneNumber", "role", "position")
+
+
+class OpenSessionRow(Row):
+    __slots__ = ("id", "clock_in")
+
+
+class TimesheetEntry(Row):
+    __slots__ = ("date", "clock_in", "clock_out", "notes", "hours", "day_hours", "month_to_date_hours")
+
+
+# --- Prepared statements ---
+# Each statement is PREPAREd the first time it runs on a pooled connection
+# (the connection remembers which, see db.AppConnection) and EXECUTEd by name
+# from then on, so PostgreSQL parses it once per connection and can reuse the
+# plan. A PREPARE survives a rollback, so the bookkeeping stays in step.
+class Statement:
+    def __init__(self, name, sql):
+        self.name = name
+        self.sql = " ".join(sql.split())
+        self.arity = max((int(n) for n in re.findall(r"\$(\d+)", self.sql)), default=0)
+        placeholders = ", ".join(["%s"] * self.arity)
+        self.execute_sql = f"EXECUTE {name} ({placeholders})" if self.arity else f"EXECUTE {name}"
+        # Same statement for the unprepared path: $n -> %(pn)s
+        self.plain_sql = re.sub(r"\$(\d+)", r"%(p\1)s", self.sql.replace("%", "%%"))
+
+
+_stats_lock = threading.Lock()
+_stats = {}  # statement name -> {"calls", "prepares", "seconds", "max_seconds"}
+
+
+def _record(name, elapsed, prepared):
+    with _stats_lock:
+        stats = _stats.setdefault(name, {"calls": 0, "prepares": 0, "seconds": 0.0, "max_seconds": 0.0})
+        stats["calls"] += 1
+        stats["prepares"] += prepared
+        stats["seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+
+def statement_stats():
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def execute(cur, statement, params=()):
+    started = time.perf_counter()
+    prepared = getattr(cur.connection, "prepared_statements", None)
+    did_prepare = False
+    if not DB_PREPARED_STATEMENTS or prepared is None:
+        cur.execute(statement.plain_sql, {f"p{i + 1}": value for i, value in enumerate(params)})
+    else:
+        if statement.name not in prepared:
+            cur.execute(f"PREPARE {statement.name} AS {statement.sql}")
+            prepared.add(statement.name)
+            did_prepare = True
+        try:
+            cur.execute(statement.execute_sql, params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            # The server session lost its statements (DISCARD ALL, a pooler
+            # swapping backends); prepare afresh on the next request
+            prepared.clear()
+            raise
+    _record(statement.name, time.perf_counter() - started, did_prepare)
+    return cur
+
+
+# --- Employees ---
+EMPLOYEE_COLUMNS = "id, names, surname, email, phoneNumber, role, position"
+
+AUTHENTICATE = Statement("employee_authenticate", f"""
+    SELECT {EMPLOYEE_COLUMNS} FROM MaxeloClientTable WHERE email = $1 AND password = $2
+""")
+
+EMPLOYEE_BY_ID = Statement("employee_by_id", f"""
+    SELECT {EMPLOYEE_COLUMNS} FROM MaxeloClientTable WHERE id = $1
+""")
+
+
+class EmployeeRepository:
+    def __init__(self, cur):
+        self.cur = cur
+
+    def authenticate(self, email, password):
+        row = execute(self.cur, AUTHENTICATE, (email, password)).fetchone()
+        return EmployeeRow(*row) if row else None
+
+    def get(self, employee_id):
+        row = execute(self.cur, EMPLOYEE_BY_ID, (employee_id,)).fetchone()
+        return EmployeeRow(*row) if row else None
+
+
+# --- Attendance ---
+CLOCK_IN = Statement("attendance_clock_in", """
+    INSERT INTO AttendanceRegister (employee_id, clockIn, notes) VALUES ($1, $2, $3)
+""")
+
+LATEST_OPEN_SESSION = Statement("attendance_latest_open_session", """
+    SELECT id, clockIn FROM AttendanceRegister
+    WHERE employee_id = $1 AND clockOut IS NULL
+    ORDER BY clockIn DESC LIMIT 1
+""")
+
+# clockIn in the predicate lets PostgreSQL prune to one partition
+CLOSE_SESSION = Statement("attendance_close_session", """
+    UPDATE AttendanceRegister SET clockOut = $3 WHERE id = $1 AND clockIn = $2
+""")
+
+# Profile, today's status and the month's rows in one round trip. Hours are
+# computed per row, per day and as a running month-to-date total in SQL.
+MONTH_TIMESHEET = Statement("attendance_month_timesheet", """
+    SELECT e.id, e.names, e.surname, e.email, e.phoneNumber, e.role, e.position,
+           a.work_date, a.clockIn, a.clockOut, a.notes,
+           a.hours, a.day_hours, a.month_to_date_hours, a.month_hours
+    FROM MaxeloClientTable e
+    LEFT JOIN LATERAL (
+        SELECT r.id, DATE(r.clockIn) AS work_date, r.clockIn, r.clockOut, r.notes,
+               ROUND((EXTRACT(EPOCH FROM (r.clockOut - r.clockIn)) / 3600)::numeric, 2) AS hours,
+               ROUND((SUM(EXTRACT(EPOCH FROM (r.clockOut - r.clockIn)))
+                     OVER (PARTITION BY DATE(r.clockIn)) / 3600)::numeric, 2) AS day_hours,
+               ROUND((SUM(EXTRACT(EPOCH FROM (r.clockOut - r.clockIn)))
+                     OVER (ORDER BY r.clockIn, r.id ROWS UNBOUNDED PRECEDING) / 3600)::numeric, 2)
+                     AS month_to_date_hours,
+               ROUND((SUM(EXTRACT(EPOCH FROM (r.clockOut - r.clockIn))) OVER () / 3600)::numeric, 2)
+                     AS month_hours
+        FROM AttendanceRegister r
+        WHERE r.employee_id = e.id
+          AND r.clockIn >= $2 AND r.clockIn < $3
+    ) a ON TRUE
+    WHERE e.id = $1
+    ORDER BY a.clockIn DESC, a.id DESC
+""")
+
+
+# Register page: the filter and keyset conditions are joined into {where},
+# and the caller asks for one row more than a page to know if there is another
+REGISTER_PAGE = """
+    SELECT a.id, e.names, e.surname, e.role, a.clockIn, a.clockOut, a.notes
+    FROM AttendanceRegister a
+    JOIN MaxeloClientTable e ON a.employee_id = e.id
+    WHERE {where}
+    ORDER BY a.clockIn {order}, a.id {order}
+    LIMIT %s
+"""
+
+
+class AttendanceRepository:
+    def __init__(self, cur):
+        self.cur = cur
+
+    def clock_in(self, employee_id, clock_in, notes):
+        execute(self.cur, CLOCK_IN, (employee_id, clock_in, notes))
+
+    def latest_open_session(self, employee_id):
+        row = execute(self.cur, LATEST_OPEN_SESSION, (employee_id,)).fetchone()
+        return OpenSessionRow(*row) if row else None
+
+    def close_session(self, session_id, clock_in, clock_out):
+        execute(self.cur, CLOSE_SESSION, (session_id, clock_in, clock_out))
+
+    def month_timesheet(self, employee_id, month_start, month_end):
+        """(EmployeeRow, [TimesheetEntry] newest first, month_hours), or None
+        for an unknown employee."""
+        rows = execute(self.cur, MONTH_TIMESHEET, (employee_id, month_start, month_end)).fetchall()
+        if not rows:
+            return None
+        employee = EmployeeRow(*rows[0][:7])
+        entries = [TimesheetEntry(*row[7:14]) for row in rows if row[8] is not None]
+        return employee, entries, rows[0][14] or 0
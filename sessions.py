@@ -0,0 +1,275 @@
+import os
+import secrets
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import psycopg2
+import psycopg2.extensions
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+from db import PoolExhausted, get_db_connection
+
+# cookie (signed cookie), postgres (app_sessions table) or sqlite (one file per host).
+# Signed cookies cost no database work: with the shared secret key below every
+# worker accepts every cookie. The stores are opt-in for sessions that must be
+# revocable on the server; postgres reads the row from the primary on every
+# request with a cookie, so a @read_only view then holds a primary connection
+# next to its replica connection.
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie").lower()
+SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH")
+
+# Requests that never use the session: no store lookup, no connection checkout
+SESSIONLESS_PATHS = ("/metrics",)
+
+
+# --- Secret key ---
+# Every worker must sign with the same key, otherwise a cookie issued by one
+# worker is rejected by the next. SECRET_KEY wins; without it the first worker
+# to start writes a random key into the instance folder and the rest read it.
+def load_secret_key(instance_path):
+    key = os.getenv("SECRET_KEY")
+    if key:
+        return key
+
+    path = os.path.join(instance_path, "secret_key")
+    os.makedirs(instance_path, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another worker may still be writing it
+        for _ in range(50):
+            with open(path) as f:
+                key = f.read().strip()
+            if key:
+                return key
+            time.sleep(0.01)
+        raise RuntimeError(f"{path} is empty; delete it or set SECRET_KEY")
+
+    key = secrets.token_hex(32)
+    with os.fdopen(fd, "w") as f:
+        f.write(key)
+    print(f"⚠️ SECRET_KEY is not set; generated one in {path}")
+    return key
+
+
+# --- Server-side session ---
+# The cookie only carries a signed random id; the data lives in the store.
+# A request that doesn't change the session reads one row and writes nothing,
+# apart from sliding the expiry forward once half the lifetime has passed.
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires=None, persist=True):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires = expires
+        self.modified = False
+        self.replaced_sid = None
+        # False: never written back (sessionless paths, store unreachable)
+        self.persist = persist
+
+
+# Call on login so a session id planted before authentication is never reused.
+# The old id is deleted when the session is saved, not in the middle of the
+# route's transaction.
+def regenerate(session):
+    if not isinstance(session, ServerSideSession) or session.new:
+        return
+    session.replaced_sid = session.sid
+    session.sid = secrets.token_urlsafe(32)
+    session.new = True
+    session.modified = True
+
+
+class ServerSideSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+    salt = "maxelo-session"
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt=self.salt)
+
+    def open_session(self, app, request):
+        if request.path.startswith(app.static_url_path + "/") or request.path in SESSIONLESS_PATHS:
+            return ServerSideSession(new=True, persist=False)
+
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+            if sid:
+                try:
+                    loaded = self.store.load(sid)
+                except (psycopg2.Error, PoolExhausted, sqlite3.Error) as e:
+                    # Serve the request logged out rather than fail it here;
+                    # the stored session is left as it is for when the store is back
+                    print("⚠️ Session store unavailable:", e)
+                    return ServerSideSession(sid=sid, persist=False)
+                if loaded is not None and loaded[1] > datetime.now(timezone.utc):
+                    return ServerSideSession(self.serializer.loads(loaded[0]), sid=sid, expires=loaded[1])
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        if not session.persist:
+            return
+        if session.replaced_sid:
+            self.store.delete(session.replaced_sid)
+            session.replaced_sid = None
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        lifetime = app.permanent_session_lifetime
+        now = datetime.now(timezone.utc)
+        stale = session.expires is None or session.expires - now < lifetime / 2
+        if not (session.modified or stale):
+            return
+
+        self.store.save(session.sid, self.serializer.dumps(dict(session)), now + lifetime)
+        if session.new:
+            response.vary.add("Cookie")
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid.encode()).decode(),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+# --- Stores ---
+# Uses the request's pooled connection, so a session read costs no extra
+# checkout. Always the primary, even inside a @read_only route. Writes run
+# in a transaction of their own after the route: anything it left
+# uncommitted is rolled back first (the pool would discard it on release
+# anyway) so it is never committed along with the session.
+class PostgresSessionStore:
+    def _conn(self):
+        conn = get_db_connection(readonly=False)
+        if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+            conn.rollback()
+        return conn
+
+    def _write_conn(self):
+        conn = get_db_connection(readonly=False)
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+        return conn
+
+    def load(self, sid):
+        conn = self._conn()
+        cur = conn.cursor()
+        cur.execute("SELECT data, expires_at FROM app_sessions WHERE sid = %s", (sid,))
+        row = cur.fetchone()
+        cur.close()
+        return row
+
+    def save(self, sid, data, expires):
+        conn = self._write_conn()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO app_sessions (sid, data, expires_at) VALUES (%s, %s, %s)
+            ON CONFLICT (sid) DO UPDATE SET data = EXCLUDED.data, expires_at = EXCLUDED.expires_at
+        """, (sid, data, expires))
+        conn.commit()
+        cur.close()
+
+    def delete(self, sid):
+        conn = self._write_conn()
+        cur = conn.cursor()
+        cur.execute("DELETE FROM app_sessions WHERE sid = %s", (sid,))
+        conn.commit()
+        cur.close()
+
+    def purge(self):
+        conn = self._conn()
+        cur = conn.cursor()
+        cur.execute("DELETE FROM app_sessions WHERE expires_at < NOW()")
+        deleted = cur.rowcount
+        conn.commit()
+        cur.close()
+        return deleted
+
+
+# For a single host: all workers share the file, nothing to migrate
+class SQLiteSessionStore:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS app_sessions (
+                sid TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def _conn(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def load(self, sid):
+        conn = self._conn()
+        row = conn.execute("SELECT data, expires_at FROM app_sessions WHERE sid = ?", (sid,)).fetchone()
+        conn.close()
+        if row is None:
+            return None
+        return row[0], datetime.fromtimestamp(row[1], timezone.utc)
+
+    def save(self, sid, data, expires):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO app_sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+            (sid, data, expires.timestamp()),
+        )
+        conn.commit()
+        conn.close()
+
+    def delete(self, sid):
+        conn = self._conn()
+        conn.execute("DELETE FROM app_sessions WHERE sid = ?", (sid,))
+        conn.commit()
+        conn.close()
+
+    def purge(self):
+        conn = self._conn()
+        deleted = conn.execute("DELETE FROM app_sessions WHERE expires_at < ?", (time.time(),)).rowcount
+        conn.commit()
+        conn.close()
+        return deleted
+
+
+def init_app(app):
+    if not app.secret_key:
+        app.secret_key = load_secret_key(app.instance_path)
+    backend = app.config.get("SESSION_BACKEND", SESSION_BACKEND)
+    if backend == "postgres":
+        app.session_interface = ServerSideSessionInterface(PostgresSessionStore())
+    elif backend == "sqlite":
+        path = app.config.get("SESSION_SQLITE_PATH") or SESSION_SQLITE_PATH \
+            or os.path.join(app.instance_path, "sessions.sqlite3")
+        app.session_interface = ServerSideSessionInterface(SQLiteSessionStore(path))
+    elif backend != "cookie":
+        raise ValueError(f"unknown SESSION_BACKEND {backend!r} (expected cookie, postgres or sqlite)")
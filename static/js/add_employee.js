@@ -0,0 +1,74 @@
+// Form validation
+function validateForm() {
+    const password = document.getElementById('password').value;
+    const phoneNumber = document.getElementById('phoneNumber').value;
+
+    // Validate password length
+    if (password.length < 6) {
+        alert('Password must be at least 6 characters long');
+        return false;
+    }
+
+    // Validate phone number format
+    const phoneRegex = /^[0-9+\-\s()]{10,}$/;
+    if (!phoneRegex.test(phoneNumber)) {
+        alert('Please enter a valid phone number');
+        return false;
+    }
+
+    return true;
+}
+
+// Password strength checker
+function checkPasswordStrength(password) {
+    const strengthMeter = document.getElementById('password-strength-meter');
+    const feedback = document.getElementById('password-feedback');
+
+    // Reset classes
+    strengthMeter.className = 'password-strength-meter';
+
+    if (password.length === 0) {
+        feedback.textContent = '';
+        return;
+    }
+
+    // Check password strength
+    let strength = 0;
+    let feedbackText = '';
+
+    if (password.length >= 6) strength += 1;
+    if (password.length >= 8) strength += 1;
+    if (/[A-Z]/.test(password)) strength += 1;
+    if (/[0-9]/.test(password)) strength += 1;
+    if (/[^A-Za-z0-9]/.test(password)) strength += 1;
+
+    // Update strength meter and feedback
+    if (strength <= 2) {
+        strengthMeter.classList.add('weak');
+        feedbackText = 'Weak password';
+    } else if (strength <= 4) {
+        strengthMeter.classList.add('medium');
+        feedbackText = 'Medium strength password';
+    } else {
+        strengthMeter.classList.add('strong');
+        feedbackText = 'Strong password';
+    }
+
+    feedback.textContent = feedbackText;
+}
+
+// Simple animation for form elements
+document.addEventListener('DOMContentLoaded', function() {
+    const formGroups = document.querySelectorAll('.form-group');
+
+    formGroups.forEach((group, index) => {
+        group.style.opacity = 0;
+        group.style.transform = 'translateY(20px)';
+        group.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+
+        setTimeout(() => {
+            group.style.opacity = 1;
+            group.style.transform = 'translateY(0)';
+        }, 100 * index);
+    });
+});
@@ -0,0 +1,16 @@
+// Create confetti effect
+document.addEventListener('DOMContentLoaded', function() {
+    const colors = ['#3a7bd5', '#0a2240', '#1a4480', '#28a745'];
+    const container = document.body;
+
+    for (let i = 0; i < 50; i++) {
+        const confetti = document.createElement('div');
+        confetti.className = 'confetti';
+        confetti.style.left = Math.random() * 100 + 'vw';
+        confetti.style.animationDelay = Math.random() * 5 + 's';
+        confetti.style.width = Math.random() * 10 + 5 + 'px';
+        confetti.style.height = confetti.style.width;
+        confetti.style.backgroundColor = colors[Math.floor(Math.random() * colors.length)];
+        container.appendChild(confetti);
+    }
+});
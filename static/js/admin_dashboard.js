@@ -0,0 +1,78 @@
+// Simple animation for stat cards
+document.addEventListener('DOMContentLoaded', function() {
+    const statCards = document.querySelectorAll('.stat-card');
+
+    statCards.forEach((card, index) => {
+        setTimeout(() => {
+            card.style.opacity = 1;
+            card.style.transform = 'translateY(0)';
+        }, 200 * index);
+    });
+});
+
+// Live presence board: the server pushes a snapshot on connect and an
+// update per clock-in/out; tiles and the in-office list change in place.
+document.addEventListener('DOMContentLoaded', function() {
+    const stats = document.getElementById('live-stats');
+    const list = document.getElementById('in-office-list');
+    const empty = document.getElementById('in-office-empty');
+    const status = document.getElementById('live-status');
+    if (!stats || !window.EventSource) return;
+
+    function setCounts(counts) {
+        Object.keys(counts).forEach(key => {
+            const el = stats.querySelector(`[data-count="${key}"]`);
+            if (el) el.textContent = counts[key];
+        });
+    }
+
+    function row(person) {
+        const li = document.createElement('li');
+        li.dataset.id = person.id;
+        const name = document.createElement('span');
+        name.className = 'name';
+        name.textContent = person.name;
+        const since = document.createElement('span');
+        since.className = 'since';
+        since.textContent = `since ${person.since}`;
+        li.append(name, since);
+        return li;
+    }
+
+    function toggleEmpty() {
+        empty.hidden = list.children.length > 0;
+    }
+
+    const source = new EventSource(stats.dataset.streamUrl);
+
+    source.addEventListener('open', () => {
+        status.textContent = 'live';
+        status.classList.add('live');
+    });
+
+    source.addEventListener('error', () => {
+        // EventSource reconnects by itself; the next snapshot catches up
+        status.textContent = 'reconnecting…';
+        status.classList.remove('live');
+    });
+
+    source.addEventListener('snapshot', event => {
+        const board = JSON.parse(event.data);
+        setCounts(board.counts);
+        list.replaceChildren(...board.in_office.map(row));
+        toggleEmpty();
+    });
+
+    source.addEventListener('update', event => {
+        const change = JSON.parse(event.data);
+        setCounts(change.counts);
+        const existing = list.querySelector(`li[data-id="${change.employee.id}"]`);
+        if (existing) existing.remove();
+        if (change.kind === 'in') {
+            const li = row(change.employee);
+            li.classList.add('arrived');
+            list.append(li);
+        }
+        toggleEmpty();
+    });
+});
@@ -0,0 +1,34 @@
+// Toggle register records visibility
+document.getElementById('viewRecordsBtn').addEventListener('click', function () {
+    const recordsSection = document.getElementById('registerRecords');
+    const isVisible = recordsSection.classList.contains('active');
+
+    if (isVisible) {
+        recordsSection.classList.remove('active');
+        this.innerHTML = '<i class="fas fa-eye"></i> View Attendance History';
+    } else {
+        recordsSection.classList.add('active');
+        this.innerHTML = '<i class="fas fa-eye-slash"></i> Hide Attendance History';
+    }
+});
+
+// Prevent zoom on input focus in iOS
+document.addEventListener('DOMContentLoaded', function () {
+    if (navigator.userAgent.match(/iPhone|iPad|iPod/i)) {
+        const inputs = document.querySelectorAll('input, textarea, select');
+        inputs.forEach(input => {
+            input.addEventListener('focus', function () {
+                document.body.style.zoom = '100%';
+            });
+        });
+    }
+
+    // Add today's date highlighting
+    const today = new Date().toISOString().split('T')[0];
+    const dateCells = document.querySelectorAll('.records-table td:first-child');
+    dateCells.forEach(cell => {
+        if (cell.textContent === today) {
+            cell.closest('tr').classList.add('today-highlight');
+        }
+    });
+});
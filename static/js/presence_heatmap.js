@@ -0,0 +1,72 @@
+// Rows are [id, name, role, absent, presence] with presence bit-packed: base64, one bit per working day, most significant bit first
+function unpack(encoded, length) {
+    const raw = atob(encoded);
+    const bits = [];
+    for (let i = 0; i < raw.length && bits.length < length; i++) {
+        const byte = raw.charCodeAt(i);
+        for (let b = 7; b >= 0 && bits.length < length; b--) {
+            bits.push((byte >> b) & 1);
+        }
+    }
+    return bits;
+}
+
+function render(matrix) {
+    const heatmap = document.getElementById("heatmap");
+    const summary = document.getElementById("summary");
+    const days = matrix.days;
+
+    if (!matrix.employees.length || !days.length) {
+        summary.textContent = "";
+        heatmap.innerHTML = '<p class="no-results">No working days or employees in this range.</p>';
+        return;
+    }
+
+    const absences = matrix.employees.reduce((total, e) => total + e[3], 0);
+    summary.textContent = `${matrix.employees.length} employees × ${days.length} working days, ` +
+        `${absences} absences (${matrix.start} to ${matrix.end})`;
+
+    const fragment = document.createDocumentFragment();
+    for (const [id, employeeName, role, absentDays, presence] of matrix.employees) {
+        const row = document.createElement("div");
+        row.className = "heatmap-row";
+
+        const name = document.createElement("div");
+        name.className = "heatmap-name";
+        name.textContent = employeeName;
+        name.title = `${employeeName} (${role})`;
+        row.appendChild(name);
+
+        const absent = document.createElement("div");
+        absent.className = "heatmap-absent";
+        absent.textContent = absentDays;
+        row.appendChild(absent);
+
+        unpack(presence, days.length).forEach((bit, i) => {
+            const cell = document.createElement("div");
+            cell.className = bit ? "cell present" : "cell";
+            cell.title = `${days[i]}: ${bit ? "present" : "absent"}`;
+            row.appendChild(cell);
+        });
+        fragment.appendChild(row);
+    }
+    heatmap.replaceChildren(fragment);
+}
+
+// Range and API endpoint come from the data attributes on #heatmap
+const config = document.getElementById("heatmap").dataset;
+const params = new URLSearchParams({
+    start_date: config.startDate,
+    end_date: config.endDate,
+    role: config.role,
+    encoding: "bits",
+});
+fetch(config.url + "?" + params)
+    .then(response => response.json().then(body => {
+        if (!response.ok) throw new Error(body.error || response.statusText);
+        return body;
+    }))
+    .then(render)
+    .catch(error => {
+        document.getElementById("summary").textContent = "Could not load presence: " + error.message;
+    });
@@ -0,0 +1,75 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const passwordInput = document.getElementById('new_password');
+    const togglePassword = document.getElementById('togglePassword');
+    const strengthMeter = document.getElementById('strengthMeter');
+    const submitButton = document.getElementById('submitButton');
+
+    // Criteria elements
+    const lengthCriteria = document.getElementById('lengthCriteria');
+    const uppercaseCriteria = document.getElementById('uppercaseCriteria');
+    const numberCriteria = document.getElementById('numberCriteria');
+    const specialCriteria = document.getElementById('specialCriteria');
+
+    // Toggle password visibility
+    togglePassword.addEventListener('click', function() {
+        if (passwordInput.type === 'password') {
+            passwordInput.type = 'text';
+            togglePassword.classList.remove('fa-eye');
+            togglePassword.classList.add('fa-eye-slash');
+        } else {
+            passwordInput.type = 'password';
+            togglePassword.classList.remove('fa-eye-slash');
+            togglePassword.classList.add('fa-eye');
+        }
+    });
+
+    // Check password strength
+    passwordInput.addEventListener('input', function() {
+        const password = passwordInput.value;
+        let strength = 0;
+
+        // Check criteria
+        const hasLength = password.length >= 8;
+        const hasUppercase = /[A-Z]/.test(password);
+        const hasNumber = /[0-9]/.test(password);
+        const hasSpecial = /[!@#$%^&*()_+\-=\[\]{};':"\\|,.<>\/?]/.test(password);
+
+        // Update criteria indicators
+        updateCriteria(lengthCriteria, hasLength);
+        updateCriteria(uppercaseCriteria, hasUppercase);
+        updateCriteria(numberCriteria, hasNumber);
+        updateCriteria(specialCriteria, hasSpecial);
+
+        // Calculate strength
+        if (hasLength) strength += 25;
+        if (hasUppercase) strength += 25;
+        if (hasNumber) strength += 25;
+        if (hasSpecial) strength += 25;
+
+        // Update strength meter
+        strengthMeter.style.width = strength + '%';
+
+        if (strength < 50) {
+            strengthMeter.style.backgroundColor = '#e74c3c';
+        } else if (strength < 100) {
+            strengthMeter.style.backgroundColor = '#f39c12';
+        } else {
+            strengthMeter.style.backgroundColor = '#2ecc71';
+        }
+
+        // Enable/disable submit button based on strength
+        submitButton.disabled = strength < 100;
+        submitButton.style.opacity = strength < 100 ? '0.7' : '1';
+    });
+
+    function updateCriteria(element, met) {
+        const icon = element.querySelector('i');
+        if (met) {
+            icon.classList.remove('fa-circle', 'criteria-not-met');
+            icon.classList.add('fa-check-circle', 'criteria-met');
+        } else {
+            icon.classList.remove('fa-check-circle', 'criteria-met');
+            icon.classList.add('fa-circle', 'criteria-not-met');
+        }
+    }
+});
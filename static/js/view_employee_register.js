@@ -0,0 +1,45 @@
+document.addEventListener('DOMContentLoaded', function () {
+    const { jsPDF } = window.jspdf;
+    const datePicker = document.getElementById('datePicker');
+    const roleFilter = document.getElementById('roleFilter');
+    const downloadBtn = document.getElementById('downloadBtn');
+    const attendanceData = document.getElementById('attendanceData');
+
+    // Filtering and paging happen on the server; just number this page's rows
+    if (attendanceData) {
+        let counter = 1;
+        for (let row of attendanceData.getElementsByTagName('tr')) {
+            row.querySelector('.index-col').textContent = counter++;
+        }
+    }
+
+    // Download PDF
+    downloadBtn.addEventListener('click', function () {
+        const doc = new jsPDF();
+        doc.setFontSize(18);
+        doc.text('Maxelo Employee Attendance Register', 14, 15);
+
+        doc.setFontSize(11);
+        doc.setTextColor(100);
+        doc.text(`Date: ${datePicker.value || 'All'} | Role: ${roleFilter.value || 'All'}`, 14, 22);
+
+        const headers = ['NO', 'First Name', 'Surname', 'Role', 'Clock In', 'Clock Out', 'Attendance Type'];
+        const tableRows = [];
+        const rows = attendanceData ? attendanceData.getElementsByTagName('tr') : [];
+
+        for (let row of rows) {
+            tableRows.push([...row.cells].map(cell => cell.textContent.trim()));
+        }
+
+        doc.autoTable({
+            head: [headers],
+            body: tableRows,
+            startY: 30,
+            theme: 'grid',
+            styles: { fontSize: 9, cellPadding: 2 },
+            headStyles: { fillColor: [44, 62, 80] }
+        });
+
+        doc.save(`attendance_${datePicker.value || 'all'}_${roleFilter.value || 'all'}.pdf`);
+    });
+});
@@ -0,0 +1,168 @@
+// Initialize jsPDF
+const { jsPDF } = window.jspdf;
+
+document.addEventListener('DOMContentLoaded', function () {
+    // Get elements
+    const searchInput = document.getElementById('searchInput');
+    const searchBtn = document.getElementById('searchBtn');
+    const pdfBtn = document.getElementById('pdfBtn');
+    const tableBody = document.getElementById('employeeTableBody');
+
+    // Search runs on the server (/api/employees/search); results replace the
+    // table rows and clearing the box puts the full directory back
+    const originalRows = tableBody ? Array.from(tableBody.children) : [];
+    let searchSequence = 0;
+    let searchTimer = null;
+
+    function employeeUrl(template, id) {
+        return template.replace(/0$/, id);
+    }
+
+    function cell(text) {
+        const td = document.createElement('td');
+        td.textContent = text === null ? '' : text;
+        return td;
+    }
+
+    function resultRow(employee) {
+        const row = document.createElement('tr');
+        ['id', 'names', 'surname', 'email', 'phoneNumber', 'role', 'position'].forEach(function (key) {
+            row.appendChild(cell(employee[key]));
+        });
+
+        const actions = document.createElement('td');
+        actions.className = 'action-cell';
+        actions.innerHTML =
+            '<a class="action-link edit"><i class="fas fa-edit"></i> Edit</a> ' +
+            '<a class="action-link delete"><i class="fas fa-trash"></i> Delete</a>';
+        actions.querySelector('.edit').href = employeeUrl(searchInput.dataset.editUrl, employee.id);
+        const deleteLink = actions.querySelector('.delete');
+        deleteLink.href = employeeUrl(searchInput.dataset.deleteUrl, employee.id);
+        deleteLink.addEventListener('click', function (event) {
+            if (!confirm('Are you sure you want to delete this employee?')) event.preventDefault();
+        });
+        row.appendChild(actions);
+        return row;
+    }
+
+    function runSearch() {
+        if (!tableBody) return;
+        const searchText = searchInput.value.trim();
+        const sequence = ++searchSequence;
+
+        if (searchText === '') {
+            tableBody.replaceChildren(...originalRows);
+            return;
+        }
+
+        const params = new URLSearchParams({ q: searchText, limit: 50 });
+        fetch(searchInput.dataset.searchUrl + '?' + params)
+            .then(response => response.json())
+            .then(function (body) {
+                // A slower response for an older query must not overwrite a newer one
+                if (sequence !== searchSequence) return;
+                const rows = (body.results || []).map(resultRow);
+                if (!rows.length) {
+                    const empty = document.createElement('tr');
+                    const td = cell('No matching employees.');
+                    td.colSpan = 8;
+                    empty.appendChild(td);
+                    rows.push(empty);
+                }
+                tableBody.replaceChildren(...rows);
+            })
+            .catch(function (error) {
+                console.error('Search failed:', error);
+            });
+    }
+
+    searchBtn.addEventListener('click', runSearch);
+
+    searchInput.addEventListener('input', function () {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(runSearch, 150);
+    });
+
+    searchInput.addEventListener('keydown', function (event) {
+        if (event.key === 'Enter') {
+            clearTimeout(searchTimer);
+            runSearch();
+        }
+    });
+
+    // PDF export functionality
+    pdfBtn.addEventListener('click', function () {
+        try {
+            // Create new PDF document
+            const doc = new jsPDF();
+
+            // Add title
+            doc.setFontSize(20);
+            doc.setTextColor(40, 40, 40);
+            doc.text('Maxelo Employee List', 105, 15, { align: 'center' });
+
+            // Add date
+            doc.setFontSize(12);
+            doc.setTextColor(100, 100, 100);
+            doc.text(`Generated on: ${new Date().toLocaleDateString()}`, 105, 22, { align: 'center' });
+
+            // Extract table data from visible rows only
+            const table = document.getElementById('employeeTable');
+            const data = [];
+
+            // Process header row
+            const headerRow = table.rows[0];
+            const headerData = [];
+
+            for (let j = 0; j < headerRow.cells.length - 1; j++) { // Skip actions column
+                headerData.push(headerRow.cells[j].textContent);
+            }
+            data.push(headerData);
+
+            // Process data rows (only visible ones)
+            for (let i = 1; i < table.rows.length; i++) {
+                const row = table.rows[i];
+
+                // Skip hidden rows (from search filtering)
+                if (row.style.display === 'none') continue;
+
+                const rowData = [];
+
+                for (let j = 0; j < row.cells.length - 1; j++) { // Skip actions column
+                    rowData.push(row.cells[j].textContent);
+                }
+
+                data.push(rowData);
+            }
+
+            // Add table
+            doc.autoTable({
+                startY: 30,
+                head: [data[0]], // Header row
+                body: data.slice(1), // Data rows
+                theme: 'grid',
+                headStyles: {
+                    fillColor: [10, 34, 64], // Navy blue
+                    textColor: 255,
+                    fontStyle: 'bold'
+                },
+                alternateRowStyles: {
+                    fillColor: [240, 240, 240]
+                },
+                styles: {
+                    fontSize: 9,
+                    cellPadding: 3,
+                    overflow: 'linebreak'
+                },
+                margin: { top: 30 }
+            });
+
+            // Save the PDF
+            doc.save('maxelo-employee-list.pdf');
+
+        } catch (error) {
+            console.error('Error generating PDF:', error);
+            alert('Error generating PDF. Please try again.');
+        }
+    });
+});
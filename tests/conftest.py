@@ -0,0 +1,36 @@
+import os
+import sys
+
+import psycopg2
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+
+
+# A cursor on DATABASE_URL inside a transaction that is always rolled back.
+# Tests that need it are skipped when no database is reachable.
+@pytest.fixture
+def cur():
+    try:
+        conn = db.connect()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"no database: {e}")
+    cursor = conn.cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+        conn.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def employee_id(cur):
+    cur.execute("""
+        INSERT INTO MaxeloClientTable (names, surname, phoneNumber, password, email, role, position)
+        VALUES ('Boundary', 'Test', '0000000000', 'x', 'boundary@tests.invalid', 'employee', 'Test')
+        RETURNING id
+    """)
+    return cur.fetchone()[0]
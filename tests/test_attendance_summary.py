@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+import attendance_summary
+import business_time
+import commands
+from repository import AttendanceRepository
+
+TZ = business_time.BUSINESS_TIMEZONE
+
+
+def local(*args):
+    return TZ.localize(datetime(*args))
+
+
+def snapshot(cur):
+    cur.execute("SELECT * FROM daily_attendance_summary WHERE present <> 0 OR open_sessions <> 0 "
+                "OR closed_sessions <> 0 ORDER BY day, role")
+    summary = cur.fetchall()
+    cur.execute("SELECT role, headcount FROM role_headcount WHERE headcount <> 0 ORDER BY role")
+    return summary, cur.fetchall()
+
+
+def rebuilt(cur):
+    attendance_summary.rebuild_summary(cur)
+    return snapshot(cur)
+
+
+@pytest.fixture
+def consistent(cur):
+    # Start from rollups that match the raw tables, whatever ran before
+    attendance_summary.rebuild_summary(cur)
+    return cur
+
+
+def move_existing_admin(cur):
+    # Frees the seeded admin's unique email and phone for insert_admin
+    cur.execute("""
+        UPDATE MaxeloClientTable SET email = 'seeded-before@tests.invalid', phoneNumber = '0000000001'
+        WHERE email = 'admin@maxelo.com'
+    """)
+
+
+def add_employee(cur, email, phone, role):
+    # As the add-employee form does
+    cur.execute("""
+        INSERT INTO MaxeloClientTable (names, surname, phoneNumber, password, email, role, position)
+        VALUES ('Rollup', 'Test', %s, 'x', %s, %s, 'Test')
+        RETURNING id
+    """, (phone, email, role))
+    employee_id = cur.fetchone()[0]
+    attendance_summary.adjust_headcount(cur, role, 1)
+    return employee_id
+
+
+def clock_in(cur, employee_id, at):
+    attendance_summary.record_clock_in(cur, employee_id, at)
+    AttendanceRepository(cur).clock_in(employee_id, at, "(Office) rollup test")
+
+
+def clock_out(cur, employee_id, at):
+    attendance = AttendanceRepository(cur)
+    session = attendance.latest_open_session(employee_id)
+    attendance.close_session(session.id, session.clock_in, at)
+    attendance_summary.record_clock_out(cur, employee_id, session.clock_in)
+
+
+def test_seed_admin_counts_headcount(consistent):
+    cur = consistent
+    move_existing_admin(cur)
+    assert commands.insert_admin(cur) is True
+    assert commands.insert_admin(cur) is False
+    assert snapshot(cur) == rebuilt(cur)
+
+
+def test_incremental_rollups_match_rebuild(consistent):
+    cur = consistent
+    move_existing_admin(cur)
+    commands.insert_admin(cur)
+    early = add_employee(cur, "rollup-early@tests.invalid", "0000000002", "employee")
+    late = add_employee(cur, "rollup-late@tests.invalid", "0000000003", "Intern")
+
+    clock_in(cur, early, local(2026, 5, 4, 7, 55))
+    clock_out(cur, early, local(2026, 5, 4, 12, 0))
+    clock_in(cur, early, local(2026, 5, 4, 13, 0))
+    clock_in(cur, late, local(2026, 5, 4, 9, 30))
+    clock_out(cur, late, local(2026, 5, 4, 17, 0))
+    attendance_summary.record_clock_ins(cur, [(late, local(2026, 5, 5, 8, 30)), (early, local(2026, 5, 5, 7, 0))])
+    AttendanceRepository(cur).clock_in(late, local(2026, 5, 5, 8, 30), "(Office) rollup test")
+    AttendanceRepository(cur).clock_in(early, local(2026, 5, 5, 7, 0), "(Office) rollup test")
+    clock_out(cur, early, local(2026, 5, 5, 16, 0))
+
+    assert snapshot(cur) == rebuilt(cur)
@@ -0,0 +1,67 @@
+from datetime import date, datetime, timedelta, timezone
+
+import business_time
+
+TZ = business_time.BUSINESS_TIMEZONE
+
+
+def local(*args):
+    return TZ.localize(datetime(*args))
+
+
+def test_day_bounds_are_business_midnights():
+    start, end = business_time.day_bounds(date(2026, 3, 15))
+    assert start == local(2026, 3, 15)
+    assert end == local(2026, 3, 16)
+    assert start.utcoffset() == TZ.utcoffset(datetime(2026, 3, 15))
+
+
+def test_day_bounds_half_open_at_midnight():
+    start, end = business_time.day_bounds(date(2026, 3, 15))
+    assert start <= local(2026, 3, 15, 0, 0) < end
+    assert start <= local(2026, 3, 15, 23, 59, 59, 999999) < end
+    assert not local(2026, 3, 16, 0, 0) < end
+
+
+def test_day_bounds_same_instant_in_utc():
+    # 23:59 business time may already be the next day in UTC, or still the
+    # previous one; the bounds compare as instants either way
+    start, end = business_time.day_bounds(date(2026, 3, 15))
+    late = local(2026, 3, 15, 23, 59).astimezone(timezone.utc)
+    assert start <= late < end
+    assert business_time.local_date(late) == date(2026, 3, 15)
+
+
+def test_days_bounds_include_end_date():
+    start, end = business_time.days_bounds(date(2026, 1, 30), date(2026, 2, 2))
+    assert start == local(2026, 1, 30)
+    assert end == local(2026, 2, 3)
+
+
+def test_month_bounds_month_end():
+    assert business_time.month_bounds(date(2026, 1, 31)) == (local(2026, 1, 1), local(2026, 2, 1))
+    assert business_time.month_bounds(date(2026, 10, 18)) == (local(2026, 10, 1), local(2026, 11, 1))
+
+
+def test_month_bounds_year_end_and_leap_february():
+    assert business_time.month_bounds(date(2026, 12, 31)) == (local(2026, 12, 1), local(2027, 1, 1))
+    start, end = business_time.month_bounds(date(2028, 2, 29))
+    assert (start, end) == (local(2028, 2, 1), local(2028, 3, 1))
+    assert end - start == timedelta(days=29)
+
+
+def test_localtime_naive_is_business_local():
+    value = business_time.localtime(datetime(2026, 10, 31, 23, 59))
+    assert value == local(2026, 10, 31, 23, 59)
+
+
+def test_localtime_converts_aware():
+    utc = datetime(2026, 10, 31, 22, 30, tzinfo=timezone.utc)
+    converted = business_time.localtime(utc)
+    assert converted == utc
+    assert converted.utcoffset() == TZ.utcoffset(datetime(2026, 10, 31))
+
+
+def test_format_local():
+    assert business_time.format_local(local(2026, 10, 31, 23, 59, 30)) == "2026-10-31 23:59"
+    assert business_time.format_local(None) == ""
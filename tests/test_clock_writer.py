@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+import clock_writer
+
+
+class FakeConnection:
+    closed = False
+
+    def cursor(self):
+        return self
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+# Stands in for write_clock_ins: records each batch written; employee -1
+# fails its whole batch, and clearing release holds the flusher mid-write
+class Database:
+    def __init__(self):
+        self.batches = []
+        self.writing = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def write_clock_ins(self, cur, rows):
+        self.writing.set()
+        self.release.wait()
+        if any(employee_id == -1 for employee_id, _, _ in rows):
+            raise ValueError("employee -1 does not exist")
+        self.batches.append([employee_id for employee_id, _, _ in rows])
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = Database()
+    monkeypatch.setattr(clock_writer.db, "connect", lambda dsn=None: FakeConnection())
+    monkeypatch.setattr(clock_writer, "write_clock_ins", database.write_clock_ins)
+    return database
+
+
+def submit_all(batcher, employee_ids):
+    errors = {}
+
+    def submit(employee_id):
+        try:
+            batcher.submit(employee_id, None, "test")
+        except Exception as e:
+            errors[employee_id] = e
+
+    threads = [threading.Thread(target=submit, args=(employee_id,)) for employee_id in employee_ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def test_concurrent_clock_ins_share_one_commit(database):
+    batcher = clock_writer.ClockInBatcher(window_ms=200)
+    assert submit_all(batcher, range(1, 6)) == {}
+    assert [sorted(batch) for batch in database.batches] == [[1, 2, 3, 4, 5]]
+    assert batcher.stats() == {"pending": 0, "batches": 1, "events": 5, "failures": 0}
+
+
+def test_batch_size_caps_a_commit(database):
+    batcher = clock_writer.ClockInBatcher(batch_size=2, window_ms=200)
+    assert submit_all(batcher, range(1, 6)) == {}
+    assert sorted(len(batch) for batch in database.batches) == [1, 2, 2]
+
+
+def test_bad_row_fails_only_its_own_request(database):
+    batcher = clock_writer.ClockInBatcher(window_ms=200)
+    errors = submit_all(batcher, [1, -1, 2])
+    assert list(errors) == [-1] and isinstance(errors[-1], ValueError)
+    # The batch failed, then every row was retried on its own
+    assert sorted(b[0] for b in database.batches) == [1, 2]
+    assert batcher.stats()["failures"] == 1 and batcher.stats()["events"] == 2
+
+
+def test_unpicked_clock_in_times_out_and_is_dropped(database):
+    batcher = clock_writer.ClockInBatcher(batch_size=1, window_ms=0, timeout=0.2)
+    database.release.clear()
+    first = threading.Thread(target=batcher.submit, args=(1, None, "test"))
+    first.start()
+    assert database.writing.wait(5)
+
+    # The flusher is stuck writing the first one, so this is never picked up
+    with pytest.raises(clock_writer.ClockInTimeout):
+        batcher.submit(2, None, "test")
+    assert batcher.stats()["pending"] == 0
+
+    database.release.set()
+    first.join()
+    assert database.batches == [[1]]
+
+
+def test_forked_process_starts_its_own_flusher(database, monkeypatch):
+    batcher = clock_writer.ClockInBatcher(window_ms=0)
+    batcher.submit(1, None, "test")
+    parent_thread = batcher._thread
+
+    monkeypatch.setattr(clock_writer.os, "getpid", lambda: batcher.pid + 1)
+    batcher.submit(2, None, "test")
+    assert batcher._thread is not parent_thread and batcher.stats()["events"] == 1
@@ -0,0 +1,128 @@
+import gzip
+
+import pytest
+from flask import Flask, Response
+
+import assets
+import compression
+from app import app
+
+PAGE = "<html><body>" + "<p>Register row</p>" * 100 + "</body></html>"
+
+
+@pytest.fixture
+def client():
+    pages = Flask(__name__)
+    compression.init_app(pages)
+
+    @pages.route("/page")
+    def page():
+        return PAGE
+
+    @pages.route("/small")
+    def small():
+        return "<p>ok</p>"
+
+    @pages.route("/export")
+    def export():
+        return Response((PAGE for _ in range(3)), mimetype="text/plain")
+
+    @pages.route("/image")
+    def image():
+        return Response(b"\x89PNG" * 500, mimetype="image/png")
+
+    return pages.test_client()
+
+
+# --- Encoding negotiation ---
+def test_gzip_when_accepted(client):
+    response = client.get("/page", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data).decode() == PAGE
+    assert int(response.headers["Content-Length"]) == len(response.data) < len(PAGE)
+
+
+@pytest.mark.parametrize("accept", [None, "identity", "br;q=0, gzip;q=0"])
+def test_uncompressed_when_nothing_acceptable(client, accept):
+    headers = {"Accept-Encoding": accept} if accept else {}
+    response = client.get("/page", headers=headers)
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data(as_text=True) == PAGE
+    # Caches still have to key on the header
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli is not installed")
+def test_brotli_preferred_when_available(client):
+    response = client.get("/page", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert compression.brotli.decompress(response.data).decode() == PAGE
+
+
+def test_gzip_only_without_brotli(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = client.get("/page", headers={"Accept-Encoding": "br, gzip;q=0.5"})
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+@pytest.mark.parametrize("path", ["/small", "/export", "/image"])
+def test_small_streamed_and_binary_bodies_are_left_alone(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+# --- Conditional GET ---
+def test_matching_etag_answers_304(client):
+    first = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] in ("private, no-cache", "no-cache, private")
+
+    revalidated = client.get("/page", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+    assert "Content-Encoding" not in revalidated.headers
+
+
+def test_etag_is_the_same_for_every_encoding(client):
+    gzipped = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/page")
+    assert gzipped.headers["ETag"] == plain.headers["ETag"]
+    # A tag from the gzip response revalidates the plain one too
+    assert client.get("/page", headers={"If-None-Match": gzipped.headers["ETag"]}).status_code == 304
+
+
+def test_stale_etag_gets_the_full_body(client):
+    response = client.get("/page", headers={"If-None-Match": 'W/"outdated"'})
+    assert response.status_code == 200 and response.get_data(as_text=True) == PAGE
+
+
+def test_post_gets_no_etag(client):
+    assert "ETag" not in client.post("/page").headers
+
+
+# --- Static files ---
+@pytest.fixture
+def app_client():
+    return app.test_client()
+
+
+def test_fingerprinted_static_is_compressed_and_immutable(app_client):
+    with app.test_request_context():
+        url = assets.static_url("css/admin_dashboard.css")
+
+    response = app_client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in response.headers["Cache-Control"]
+    with open(app.static_folder + "/css/admin_dashboard.css", "rb") as f:
+        assert gzip.decompress(response.data) == f.read()
+    # The compressed body is kept, keyed by the fingerprint
+    again = app_client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert again.data == response.data
+
+
+def test_unversioned_static_is_revalidated(app_client):
+    response = app_client.get("/static/css/admin_dashboard.css")
+    assert "no-cache" in response.headers["Cache-Control"]
+    assert "ETag" in response.headers
@@ -0,0 +1,79 @@
+from datetime import date, datetime, timezone
+
+import attendance_summary
+import business_time
+import partitions
+import timesheet
+from repository import AttendanceRepository
+
+TZ = business_time.BUSINESS_TIMEZONE
+
+
+def local(*args):
+    return TZ.localize(datetime(*args))
+
+
+def clock_in(cur, employee_id, at):
+    attendance_summary.record_clock_in(cur, employee_id, at)
+    AttendanceRepository(cur).clock_in(employee_id, at, "(Office) boundary test")
+
+
+def summary(cur, day):
+    cur.execute("""
+        SELECT present, late, open_sessions FROM daily_attendance_summary
+        WHERE day = %s AND role = 'employee'
+    """, (day,))
+    return cur.fetchone() or (0, 0, 0)
+
+
+def test_summary_days_at_midnight(cur, employee_id):
+    before = {day: summary(cur, day) for day in (date(2026, 3, 10), date(2026, 3, 11))}
+    clock_in(cur, employee_id, local(2026, 3, 10, 23, 59))
+    clock_in(cur, employee_id, local(2026, 3, 11, 0, 0))
+
+    late_day = summary(cur, date(2026, 3, 10))
+    next_day = summary(cur, date(2026, 3, 11))
+    assert [a - b for a, b in zip(late_day, before[date(2026, 3, 10)])] == [1, 1, 1]
+    # 00:00 is the first clock-in of the new day, and before the start time
+    assert [a - b for a, b in zip(next_day, before[date(2026, 3, 11)])] == [1, 0, 1]
+
+
+def test_same_instant_in_utc_is_the_same_day(cur, employee_id):
+    at = local(2026, 3, 11, 0, 30)
+    clock_in(cur, employee_id, at.astimezone(timezone.utc))
+    cur.execute("SELECT DATE(clockIn) FROM AttendanceRegister WHERE employee_id = %s", (employee_id,))
+    assert cur.fetchone()[0] == date(2026, 3, 11)
+
+
+def test_summary_matches_rebuild(cur, employee_id):
+    for at in (local(2026, 3, 10, 23, 59), local(2026, 3, 11, 0, 0), local(2026, 3, 31, 23, 59),
+               local(2026, 4, 1, 0, 0)):
+        clock_in(cur, employee_id, at)
+    cur.execute("SELECT * FROM daily_attendance_summary ORDER BY day, role")
+    incremental = cur.fetchall()
+    attendance_summary.rebuild_summary(cur)
+    cur.execute("SELECT * FROM daily_attendance_summary ORDER BY day, role")
+    assert cur.fetchall() == incremental
+
+
+def test_timesheet_days_at_month_end(cur, employee_id):
+    clock_in(cur, employee_id, local(2026, 3, 31, 23, 59))
+    clock_in(cur, employee_id, local(2026, 4, 1, 0, 0))
+
+    march = timesheet.fetch_timesheet(cur, employee_id, date(2026, 3, 31))
+    april = timesheet.fetch_timesheet(cur, employee_id, date(2026, 4, 1))
+    assert [r.date for r in march["records"]] == [date(2026, 3, 31)]
+    assert [r.date for r in april["records"]] == [date(2026, 4, 1)]
+    assert march["today"].clock_in == local(2026, 3, 31, 23, 59)
+    assert april["today"].clock_in == local(2026, 4, 1, 0, 0)
+
+
+def test_partition_at_month_end(cur, employee_id):
+    partitions.ensure_partitions(cur, start=date(2026, 3, 1))
+    clock_in(cur, employee_id, local(2026, 3, 31, 23, 59))
+    clock_in(cur, employee_id, local(2026, 4, 1, 0, 0))
+    cur.execute("""
+        SELECT tableoid::regclass::text FROM AttendanceRegister
+        WHERE employee_id = %s ORDER BY clockIn
+    """, (employee_id,))
+    assert [row[0] for row in cur.fetchall()] == ["attendanceregister_y2026m03", "attendanceregister_y2026m04"]
@@ -0,0 +1,43 @@
+import pytest
+
+from employee_import import parse_employee_csv
+
+HEADER = "names,surname,phoneNumber,email,password,role,position"
+ROW = "Jo,Doe,0711111111,jo@x.com,secret,employee,Clerk"
+
+
+@pytest.mark.parametrize("header, row", [
+    (HEADER, ROW),
+    ("\ufeff" + HEADER, ROW),
+    ("Names,Surname,Phone Number,Email,Password,Role,Position", ROW),
+    (" names , SURNAME ,phone_number,e-mail,password,role,position", ROW),
+    # Column order doesn't matter and position is optional
+    ("email,names,surname,role,password,phoneNumber", "jo@x.com,Jo,Doe,employee,secret,0711111111"),
+])
+def test_header_variants(header, row):
+    valid, errors = parse_employee_csv(f"{header}\n{row}\n")
+    assert errors == []
+    assert [(line, r["email"], r["phoneNumber"], r["role"]) for line, r in valid] == \
+        [(2, "jo@x.com", "0711111111", "employee")]
+
+
+@pytest.mark.parametrize("text, errors", [
+    ("", [(1, "Missing column(s): names, surname, phoneNumber, email, password, role")]),
+    ("names,surname,email\nJo,Doe,jo@x.com\n", [(1, "Missing column(s): phoneNumber, password, role")]),
+    (f"{HEADER}\nJo,Doe,0711111111,jo@x.com,secret,manager,Clerk\n", [(2, "unknown role 'manager'")]),
+    (f"{HEADER}\nJo,Doe,0711111111,jo-at-x.com,secret,employee,\n", [(2, "invalid email")]),
+    (f"{HEADER}\n,Doe,0711111111,jo@x.com,,employee,\n", [(2, "names is required; password is required")]),
+    (f"{HEADER}\n{ROW}\nJoe,Dane,0722222222,jo@x.com,pw,intern,\n",
+     [(3, "duplicate email (also on line 2)")]),
+    (f"{HEADER}\n{ROW}\nJoe,Dane,0711111111,joe@x.com,pw,intern,\n",
+     [(3, "duplicate phone number (also on line 2)")]),
+])
+def test_rejected_rows(text, errors):
+    assert parse_employee_csv(text)[1] == errors
+
+
+def test_values_are_trimmed_and_roles_lowercased():
+    valid, errors = parse_employee_csv(f"{HEADER}\n Jo , Doe ,0711111111, jo@x.com ,secret, Intern ,\n")
+    assert errors == []
+    assert valid[0][1] == {"names": "Jo", "surname": "Doe", "phoneNumber": "0711111111", "email": "jo@x.com",
+                           "password": "secret", "role": "intern", "position": ""}
@@ -0,0 +1,44 @@
+import pytest
+
+from employee_search import build_tsquery, search_employees
+
+CASES = [
+    ("jo", "'jo':*"),
+    ("Jo Do", "'jo':* & 'do':*"),
+    ("Zoë", "'zoë':*"),
+    # Punctuation: a phrase over the pieces the index splits emails into
+    ("jo@x", "'jo' <-> 'x':*"),
+    ("x.com", "'x' <-> 'com':*"),
+    ("jo@x.com", "'jo' <-> 'x' <-> 'com':*"),
+    ("o'neil", "'o':* & 'neil':*"),
+    # Empty input
+    (None, ""),
+    ("", ""),
+    ("   ", ""),
+    ("!!!", ""),
+    ("@@@", ""),
+    # tsquery operators are separators, never operators
+    ("a & b | !c", "'a':* & 'b':* & 'c':*"),
+    ("x:*", "'x':*"),
+    ("jo<->x", "'jo':* & 'x':*"),
+    ("(jo)", "'jo':*"),
+    ("\\ '; drop", "'drop':*"),
+]
+
+
+@pytest.mark.parametrize("text, query", CASES)
+def test_build_tsquery(text, query):
+    assert build_tsquery(text) == query
+
+
+def test_every_query_parses(cur):
+    for text, query in CASES:
+        if query:
+            cur.execute("SELECT to_tsquery('simple', %s)::text", (query,))
+            assert cur.fetchone()[0]
+
+
+def test_search_matches_email_prefix(cur, employee_id):
+    results = search_employees(cur, "boundary@tests.inv")
+    assert employee_id in [r["id"] for r in results]
+    assert search_employees(cur, "!!!") == []
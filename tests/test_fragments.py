@@ -0,0 +1,33 @@
+import db
+import fragments
+
+NAME = "test-fragments"
+
+
+def test_bump_invalidates_cached_fragment(cur):
+    builds = []
+
+    def build():
+        builds.append(1)
+        return f"build {len(builds)}"
+
+    version = fragments.current_version(cur, NAME)
+    assert fragments.get_or_build(NAME, "table", version, build) == "build 1"
+    assert fragments.get_or_build(NAME, "table", version, build) == "build 1"
+
+    bumped = fragments.bump(cur, NAME)
+    assert bumped == version + 1 == fragments.current_version(cur, NAME)
+    assert fragments.get_or_build(NAME, "table", bumped, build) == "build 2"
+    assert len(builds) == 2
+
+
+def test_bump_is_invisible_until_commit(cur):
+    other = db.connect()
+    try:
+        other_cur = other.cursor()
+        before = fragments.current_version(other_cur, NAME)
+        fragments.bump(cur, NAME)
+        # Another worker or host keeps the old version until the write commits
+        assert fragments.current_version(other_cur, NAME) == before
+    finally:
+        other.close()
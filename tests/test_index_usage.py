@@ -0,0 +1,20 @@
+import pytest
+
+from migrations.explain import check_index_usage, hot_queries
+
+
+@pytest.fixture
+def index_usage(cur):
+    return check_index_usage(cur.connection)
+
+
+def test_every_hot_query_is_checked(index_usage):
+    assert set(index_usage) == set(hot_queries())
+
+
+@pytest.mark.parametrize("name", sorted(hot_queries()))
+def test_hot_query_uses_an_index(index_usage, name):
+    uses_index, scans = index_usage[name]
+    assert scans, f"{name} doesn't read AttendanceRegister"
+    assert "Seq Scan" not in scans
+    assert uses_index, f"{name}: {', '.join(scans)}"
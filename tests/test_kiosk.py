@@ -0,0 +1,161 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import business_time
+import kiosk
+
+TZ = business_time.BUSINESS_TIMEZONE
+
+
+def local(*args):
+    return TZ.localize(datetime(*args))
+
+
+def record(key, event, timestamp, employee_id=7, **extra):
+    return dict(idempotency_key=key, event=event, timestamp=timestamp, employee_id=employee_id, **extra)
+
+
+# apply_in_order only reads the employees' open sessions
+class OpenSessionsCursor:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+# --- Validation ---
+@pytest.mark.parametrize("bad, reason", [
+    ("not an object", "record must be an object"),
+    (record(None, "clock_in", "2026-05-04T08:00"), "idempotency_key"),
+    (record(12, "clock_in", "2026-05-04T08:00"), "idempotency_key"),
+    (record("k" * 101, "clock_in", "2026-05-04T08:00"), "idempotency_key"),
+    (record("k1", "lunch", "2026-05-04T08:00"), "event must be clock_in or clock_out"),
+    (record("k1", "clock_in", "yesterday"), "Invalid isoformat"),
+    (record("k1", "clock_in", None), ""),
+    (record("k1", "clock_in", "2026-05-04T08:00", employee_id="seven"), "invalid literal"),
+    ({"idempotency_key": "k1", "event": "clock_in", "employee_id": 7}, "timestamp"),
+])
+def test_malformed_records_are_rejected(bad, reason):
+    events, rejected = kiosk.validate_events([bad])
+    assert events == []
+    assert [r["status"] for r in rejected] == ["rejected"]
+    assert rejected[0]["index"] == 0 and reason in rejected[0]["reason"]
+
+
+def test_valid_records_keep_their_index():
+    events, rejected = kiosk.validate_events([
+        "junk",
+        record("k1", "clock_in", "2026-05-04T08:00", attendance_type="Remote", notes="gate 2"),
+        record("k2", "clock_out", "2026-05-04T15:00:00+00:00", employee_id="7"),
+    ])
+    assert [r["index"] for r in rejected] == [0]
+    assert [(e["index"], e["key"], e["employee_id"]) for e in events] == [(1, "k1", 7), (2, "k2", 7)]
+    # Naive times are business local; offsets are kept as the same instant
+    assert events[0]["time"] == local(2026, 5, 4, 8, 0)
+    assert events[1]["time"] == datetime(2026, 5, 4, 15, 0, tzinfo=timezone.utc)
+    assert events[0]["notes"] == "(Remote) gate 2"
+    assert events[1]["notes"] == "(office) kiosk"
+
+
+# --- Pairing ---
+def events(*records):
+    valid, rejected = kiosk.validate_events(list(records))
+    assert rejected == []
+    return valid
+
+
+def test_out_of_order_events_are_paired_by_time():
+    batch = events(
+        record("out", "clock_out", "2026-05-04T17:00"),
+        record("in", "clock_in", "2026-05-04T08:00"),
+    )
+    inserts, closes, no_session, closed = kiosk.apply_in_order(OpenSessionsCursor(), batch)
+    assert [(s["clock_in"], s["clock_out"]) for s in inserts] == [(local(2026, 5, 4, 8, 0), local(2026, 5, 4, 17, 0))]
+    assert closes == [] and no_session == [] and closed == []
+
+
+def test_clock_out_closes_the_latest_existing_session():
+    existing = [(7, 1, local(2026, 5, 4, 8, 0)), (7, 2, local(2026, 5, 4, 13, 0))]
+    batch = events(record("out", "clock_out", "2026-05-04T17:00"))
+    inserts, closes, no_session, closed = kiosk.apply_in_order(OpenSessionsCursor(existing), batch)
+    assert inserts == [] and no_session == []
+    assert closes == [(2, local(2026, 5, 4, 13, 0), local(2026, 5, 4, 17, 0))]
+    assert closed == [(7, local(2026, 5, 4, 13, 0))]
+
+
+@pytest.mark.parametrize("existing", [
+    [],
+    # A clock_out never closes a session that started after it
+    [(7, 1, local(2026, 5, 4, 18, 0))],
+])
+def test_clock_out_without_open_session(existing):
+    batch = events(record("out", "clock_out", "2026-05-04T17:00"))
+    inserts, closes, no_session, closed = kiosk.apply_in_order(OpenSessionsCursor(existing), batch)
+    assert inserts == [] and closes == [] and closed == []
+    assert [e["key"] for e in no_session] == ["out"]
+
+
+def test_employees_are_paired_separately():
+    batch = events(
+        record("a-in", "clock_in", "2026-05-04T08:00", employee_id=1),
+        record("b-out", "clock_out", "2026-05-04T09:00", employee_id=2),
+        record("a-out", "clock_out", "2026-05-04T10:00", employee_id=1),
+    )
+    inserts, closes, no_session, closed = kiosk.apply_in_order(OpenSessionsCursor(), batch)
+    assert [(s["employee_id"], s["clock_out"]) for s in inserts] == [(1, local(2026, 5, 4, 10, 0))]
+    assert [e["key"] for e in no_session] == ["b-out"]
+
+
+# --- Ingestion (database) ---
+# ingest_events commits its batch; keep everything in the fixture's
+# transaction so the test leaves nothing behind
+class Uncommitted:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def cursor(self):
+        return self.conn.cursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.conn.rollback()
+
+
+def statuses(results):
+    summary = {}
+    for r in results:
+        summary[r["status"]] = summary.get(r["status"], 0) + 1
+    return summary
+
+
+def test_replayed_batch_is_reported_as_duplicate(cur, employee_id):
+    conn = Uncommitted(cur.connection)
+    batch = [
+        record("test-kiosk-in", "clock_in", "2026-05-04T08:00", employee_id=employee_id),
+        record("test-kiosk-out", "clock_out", "2026-05-04T17:00", employee_id=employee_id),
+        record("test-kiosk-stray", "clock_out", "2026-05-04T07:00", employee_id=employee_id),
+        record("test-kiosk-nobody", "clock_in", "2026-05-04T08:00", employee_id=-1),
+        {"event": "clock_in"},
+    ]
+    first = kiosk.ingest_events(conn, batch)
+    assert [r["status"] for r in first] == ["applied", "applied", "rejected", "rejected", "rejected"]
+    assert first[2]["reason"] == "no open session before this clock_out"
+    assert first[3]["reason"] == "unknown employee"
+
+    replay = kiosk.ingest_events(conn, batch)
+    assert statuses(replay) == {"duplicate": 3, "rejected": 2}
+    cur.execute("SELECT clockIn, clockOut FROM AttendanceRegister WHERE employee_id = %s", (employee_id,))
+    assert cur.fetchall() == [(local(2026, 5, 4, 8, 0), local(2026, 5, 4, 17, 0))]
+
+
+def test_key_repeated_within_a_batch_applies_once(cur, employee_id):
+    batch = [record("test-kiosk-twice", "clock_in", "2026-05-04T08:00", employee_id=employee_id)] * 2
+    results = kiosk.ingest_events(Uncommitted(cur.connection), batch)
+    assert [r["status"] for r in results] == ["applied", "duplicate"]
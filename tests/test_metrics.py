@@ -0,0 +1,104 @@
+import pytest
+from flask import Flask
+
+import clock_writer
+import db
+import metrics
+import presence
+import repository
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.Registry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    # Only what the test records shows up, whatever else ran in this process
+    for module, name in [(db, "pool_stats"), (db, "replica_stats"), (repository, "statement_stats"),
+                         (presence, "hub_stats"), (clock_writer, "batcher_stats")]:
+        monkeypatch.setattr(module, name, lambda: None)
+    return registry
+
+
+def samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+# --- Rendering ---
+def test_histogram_buckets_are_cumulative(registry):
+    registry.observe("GET", "/register", 200, 0.03, 0.004, 3)
+    registry.observe("GET", "/register", 200, 0.7, 0.2, 5)
+    rendered = samples(metrics.render_metrics())
+
+    bucket = 'maxelo_http_request_duration_seconds_bucket{method="GET",route="/register",le="%s"}'
+    assert rendered[bucket % 0.025] == "0"
+    assert rendered[bucket % 0.05] == "1"
+    assert rendered[bucket % 1.0] == "2"
+    assert rendered[bucket % "+Inf"] == "2"
+    assert float(rendered['maxelo_http_request_duration_seconds_sum{method="GET",route="/register"}']) == pytest.approx(0.73)
+    assert rendered['maxelo_http_request_db_seconds_count{method="GET",route="/register"}'] == "2"
+    assert rendered['maxelo_db_queries_total{method="GET",route="/register"}'] == "8"
+    assert rendered['maxelo_http_requests_total{method="GET",route="/register",status="200"}'] == "2"
+
+
+def test_every_series_is_declared(registry):
+    registry.observe("POST", "/clock_in", 302, 0.01, 0.0, 1)
+    text = metrics.render_metrics()
+    assert text.endswith("\n")
+    declared = {line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")}
+    for name in samples(text):
+        base = name.split("{")[0]
+        assert base in declared or base.rsplit("_", 1)[0] in declared
+
+
+def test_label_values_are_escaped():
+    assert metrics.labels(route='/a"b\\c\nd') == '{route="/a\\"b\\\\c\\nd"}'
+
+
+def test_optional_sections_render_only_when_active(registry, monkeypatch):
+    assert "maxelo_db_pool" not in metrics.render_metrics()
+
+    monkeypatch.setattr(db, "pool_stats", lambda: {
+        "in_use": 2, "idle": 3, "max_size": 10, "checkouts": 40, "wait_time_total": 0.5,
+        "exhaustion_events": 1, "timeouts": 0,
+    })
+    monkeypatch.setattr(db, "replica_stats", lambda: {
+        "lag": None, "reads": 7, "fallback_lag": 1, "fallback_error": 0, "fallback_sticky": 2,
+    })
+    rendered = samples(metrics.render_metrics())
+    assert rendered["maxelo_db_pool_in_use"] == "2"
+    assert rendered["maxelo_db_pool_checkouts_total"] == "40"
+    assert rendered["maxelo_db_replica_lag_seconds"] == "0"
+    assert rendered['maxelo_db_replica_fallbacks_total{reason="sticky"}'] == "2"
+
+
+# --- Request hooks and endpoint ---
+@pytest.fixture
+def client(registry):
+    app = Flask(__name__)
+    metrics.init_app(app)
+
+    @app.route("/employees/<int:employee_id>")
+    def employee(employee_id):
+        return "ok"
+
+    return app.test_client()
+
+
+def test_requests_are_recorded_by_route_pattern(client, registry):
+    response = client.get("/employees/7")
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+    assert 'desc="0 queries"' in response.headers["Server-Timing"]
+    client.get("/employees/8")
+    client.get("/missing")
+
+    rendered = samples(client.get("/metrics").get_data(as_text=True))
+    assert rendered['maxelo_http_requests_total{method="GET",route="/employees/<int:employee_id>",status="200"}'] == "2"
+    assert rendered['maxelo_http_requests_total{method="GET",route="<unmatched>",status="404"}'] == "1"
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200 and response.mimetype == "text/plain"
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+import db
+
+
+class FakeConnection:
+    def __init__(self, dsn):
+        self.dsn = dsn
+        self.closed = False
+        self.alive = True
+        self.pings = 0
+        self.rollbacks = 0
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def set_session(self, **kwargs):
+        self.session = kwargs
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        if not self.alive:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if not self.conn.alive:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.pings += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_connect(monkeypatch):
+    created = []
+
+    def connect(dsn=None):
+        created.append(FakeConnection(dsn))
+        return created[-1]
+
+    monkeypatch.setattr(db, "connect", connect)
+    return created
+
+
+def pool(**kwargs):
+    return db.ConnectionPool("postgresql://test", **dict({"minconn": 0, "maxconn": 2, "timeout": 0.05}, **kwargs))
+
+
+# --- Exhaustion and checkout timeout ---
+def test_checkout_times_out_when_exhausted():
+    p = pool()
+    p.getconn(), p.getconn()
+    started = time.monotonic()
+    with pytest.raises(db.PoolExhausted):
+        p.getconn()
+    assert time.monotonic() - started >= 0.05
+    stats = p.stats()
+    assert (stats["in_use"], stats["exhaustion_events"], stats["timeouts"]) == (2, 1, 1)
+
+
+def test_waiter_gets_the_returned_connection():
+    p = pool(maxconn=1, timeout=2)
+    held = p.getconn()
+    threading.Timer(0.05, p.putconn, args=(held,)).start()
+    assert p.getconn() is held
+    assert p.stats()["exhaustion_events"] == 1 and p.stats()["timeouts"] == 0
+
+
+def test_failed_connect_frees_the_slot(monkeypatch):
+    def connect(dsn=None):
+        raise psycopg2.OperationalError("down")
+
+    p = pool(maxconn=1)
+    monkeypatch.setattr(db, "connect", connect)
+    with pytest.raises(psycopg2.OperationalError):
+        p.getconn()
+    assert p.stats()["in_use"] == 0
+
+
+# --- Liveness ---
+def test_recently_used_connection_is_not_pinged():
+    p = pool(ping_after=60)
+    conn = p.getconn()
+    p.putconn(conn)
+    assert p.getconn() is conn and conn.pings == 0
+
+
+def test_idle_connection_is_pinged_and_reused():
+    p = pool(ping_after=0)
+    conn = p.getconn()
+    p.putconn(conn)
+    assert p.getconn() is conn and conn.pings == 1
+
+
+@pytest.mark.parametrize("break_it", ["dead", "closed"])
+def test_stale_connection_is_replaced(fake_connect, break_it):
+    p = pool(ping_after=0)
+    conn = p.getconn()
+    p.putconn(conn)
+    if break_it == "dead":
+        conn.alive = False
+    else:
+        conn.closed = True
+
+    fresh = p.getconn()
+    assert fresh is not conn and fresh is fake_connect[-1]
+    assert p.stats()["stale_discarded"] == 1 and p.stats()["in_use"] == 1
+
+
+# --- Return ---
+def test_unfinished_transaction_is_rolled_back_on_return():
+    p = pool()
+    conn = p.getconn()
+    conn.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    p.putconn(conn)
+    assert conn.rollbacks == 1 and p.stats()["idle"] == 1
+
+
+def test_broken_connection_is_discarded_on_return():
+    p = pool()
+    conn = p.getconn()
+    conn.status = psycopg2.extensions.TRANSACTION_STATUS_INERROR
+    conn.alive = False
+    p.putconn(conn)
+    assert conn.closed and p.stats()["idle"] == 0 and p.stats()["in_use"] == 0
+
+
+# --- Fork safety ---
+def test_pool_is_recreated_when_the_pid_changes(monkeypatch):
+    monkeypatch.setattr(db, "_pool", None)
+    parent = db.get_pool()
+    assert db.get_pool() is parent and db.pool_stats() is not None
+
+    monkeypatch.setattr(os, "getpid", lambda: parent.pid + 1)
+    # The inherited pool is invisible to the child until it makes its own
+    assert db.pool_stats() is None
+    child = db.get_pool()
+    assert child is not parent and child.pid == parent.pid + 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_child_opens_its_own_connections(monkeypatch, fake_connect):
+    monkeypatch.setattr(db, "_pool", None)
+    parent = db.get_pool()
+    parent_conn = parent.getconn()
+    parent.putconn(parent_conn)
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            child = db.get_pool()
+            ok = child is not parent and child.getconn() is not parent_conn
+        except BaseException:
+            ok = False
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert not parent_conn.closed
@@ -0,0 +1,41 @@
+import pytest
+
+from reports import pack_bits, run_lengths, unpack_bits
+
+
+def expand(runs):
+    return "".join(("1" if i % 2 == 0 else "0") * n for i, n in enumerate(runs))
+
+
+@pytest.mark.parametrize("bits, packed", [
+    ("", ""),
+    ("1", "gA=="),
+    ("0", "AA=="),
+    ("10110", "sA=="),
+    ("10000001", "gQ=="),
+    ("111111111", "/4A="),
+])
+def test_pack_bits(bits, packed):
+    assert pack_bits(bits) == packed
+
+
+@pytest.mark.parametrize("bits", [
+    "", "0", "1", "00000000", "11111111", "101010101", "0" * 23, "1" * 31 + "0", "1101" * 65,
+])
+def test_pack_round_trip(bits):
+    assert unpack_bits(pack_bits(bits), len(bits)) == bits
+
+
+@pytest.mark.parametrize("bits, runs", [
+    ("", [0]),
+    ("111", [3]),
+    # An absent first day: the leading present run is empty
+    ("000", [0, 3]),
+    ("0110", [0, 1, 2, 1]),
+    ("1000", [1, 3]),
+    ("0001", [0, 3, 1]),
+    ("1010", [1, 1, 1, 1]),
+])
+def test_run_lengths(bits, runs):
+    assert run_lengths(bits) == runs
+    assert expand(runs) == bits
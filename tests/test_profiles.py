@@ -0,0 +1,25 @@
+import fragments
+import profiles
+
+
+def test_profile_is_cached_per_directory_version(cur, employee_id):
+    version = fragments.current_version(cur, fragments.DIRECTORY)
+    assert profiles.get_profile(cur, employee_id, version).names == "Boundary"
+
+    # An edit made elsewhere: the row changes and the version is bumped
+    cur.execute("UPDATE MaxeloClientTable SET names = 'Edited' WHERE id = %s", (employee_id,))
+    assert profiles.get_profile(cur, employee_id, version).names == "Boundary"
+    version = fragments.bump(cur, fragments.DIRECTORY)
+    assert profiles.get_profile(cur, employee_id, version).names == "Edited"
+
+
+def test_invalidate_drops_every_version(cur, employee_id):
+    version = fragments.current_version(cur, fragments.DIRECTORY)
+    profiles.get_profile(cur, employee_id, version)
+    cur.execute("UPDATE MaxeloClientTable SET names = 'Edited' WHERE id = %s", (employee_id,))
+    profiles.invalidate(employee_id)
+    assert profiles.get_profile(cur, employee_id, version).names == "Edited"
+
+
+def test_missing_employee_is_not_cached(cur):
+    assert profiles.get_profile(cur, -1, 0) is None
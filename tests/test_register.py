@@ -0,0 +1,103 @@
+from datetime import date, datetime
+
+import pytest
+
+import business_time
+from app import app, decode_cursor, encode_cursor, fetch_register_page, register_filters, register_where
+from repository import AttendanceRepository
+
+
+def local(*args):
+    return business_time.BUSINESS_TIMEZONE.localize(datetime(*args))
+
+
+class Args(dict):
+    def get(self, key, default=None, type=None):
+        value = super().get(key, default)
+        return type(value) if type and value is not None else value
+
+
+def test_single_date_is_one_business_day():
+    clauses, params = register_where(register_filters(Args(date="2026-10-31")))
+    assert clauses == ["a.clockIn IS NOT NULL", "a.clockIn >= %s", "a.clockIn < %s"]
+    assert params == list(business_time.day_bounds(date(2026, 10, 31)))
+
+
+def test_range_end_date_is_inclusive():
+    clauses, params = register_where(register_filters(Args(start_date="2026-10-01", end_date="2026-10-31")))
+    assert params == [business_time.start_of_day(date(2026, 10, 1)),
+                      business_time.start_of_day(date(2026, 11, 1))]
+
+
+def test_role_and_employee_filters():
+    clauses, params = register_where(register_filters(Args(role=" Intern ", employee_id="7")))
+    assert clauses[1:] == ["LOWER(e.role) = %s", "a.employee_id = %s"]
+    assert params == ["intern", 7]
+
+
+def test_invalid_dates_are_ignored():
+    clauses, params = register_where(register_filters(Args(date="2026-02-30")))
+    assert clauses == ["a.clockIn IS NOT NULL"]
+    assert params == []
+
+
+# --- Keyset cursors ---
+def test_cursor_round_trip_is_utc():
+    clock_in = business_time.BUSINESS_TIMEZONE.localize(datetime(2026, 10, 31, 23, 59, 30, 123456))
+    cursor = encode_cursor(clock_in, 42)
+    assert cursor == "20261031T215930.123456Z_42"
+    assert decode_cursor(cursor) == (clock_in, 42)
+
+
+@pytest.mark.parametrize("cursor", [None, "", "garbage", "20261031T215930.123456Z", "20261031T215930Z_1",
+                                    "20261031T215930.123456Z_x", "20261399T000000.000000Z_1"])
+def test_malformed_cursor_is_ignored(cursor):
+    assert decode_cursor(cursor) is None
+
+
+def test_malformed_cursor_falls_back_to_first_page(cur):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+        session["role"] = "admin"
+    for args in ("after=garbage", "before=2026_x", "after=20261031T215930.123456Z_",
+                 "after=20261031T215930.123456Z_99999999999999999999", "before=00010101T000000.000000Z_1"):
+        assert client.get(f"/register?{args}").status_code == 200
+
+
+def walk(cur, filters, page_size, **cursor):
+    rows, next_cursor, prev_cursor = fetch_register_page(cur, filters, page_size, **cursor)
+    return [row[0] for row in rows], decode_cursor(next_cursor), decode_cursor(prev_cursor)
+
+
+def test_pages_break_clock_in_ties_by_id(cur, employee_id):
+    tied = local(2026, 5, 4, 8, 0)
+    attendance = AttendanceRepository(cur)
+    for at in (local(2026, 5, 4, 7, 0), tied, tied, tied, local(2026, 5, 4, 9, 0)):
+        attendance.clock_in(employee_id, at, "(Office) register test")
+    cur.execute("SELECT id FROM AttendanceRegister WHERE employee_id = %s ORDER BY clockIn DESC, id DESC",
+                (employee_id,))
+    expected = [row[0] for row in cur.fetchall()]
+    filters = register_filters(Args(employee_id=str(employee_id)))
+
+    # Forward: pages of 2 split the three tied rows without skipping or repeating one
+    first, next_cursor, prev_cursor = walk(cur, filters, 2)
+    assert first == expected[:2] and prev_cursor is None
+    second, next_cursor, prev_cursor = walk(cur, filters, 2, after=next_cursor)
+    assert second == expected[2:4] and prev_cursor is not None
+    last, end_cursor, last_prev = walk(cur, filters, 2, after=next_cursor)
+    assert last == expected[4:] and end_cursor is None
+
+    # Backward from the last page lands on the same pages
+    back, _, _ = walk(cur, filters, 2, before=last_prev)
+    assert back == second
+    back, next_cursor, prev_cursor = walk(cur, filters, 2, before=prev_cursor)
+    assert back == first and prev_cursor is None and next_cursor is not None
+
+
+def test_exact_page_has_no_next_cursor(cur, employee_id):
+    attendance = AttendanceRepository(cur)
+    for hour in (8, 9):
+        attendance.clock_in(employee_id, local(2026, 5, 4, hour, 0), "(Office) register test")
+    rows, next_cursor, prev_cursor = walk(cur, register_filters(Args(employee_id=str(employee_id))), 2)
+    assert len(rows) == 2 and next_cursor is None and prev_cursor is None
@@ -0,0 +1,195 @@
+import psycopg2
+import psycopg2.extensions
+import pytest
+from flask import Flask, session
+
+import db
+
+PRIMARY = "postgresql://primary"
+REPLICA = "postgresql://replica"
+
+
+class FakeConnection:
+    def __init__(self, dsn, servers):
+        self.dsn = dsn
+        self.servers = servers
+        self.closed = False
+
+    def set_session(self, **kwargs):
+        pass
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if sql == db.REPLICA_LAG_QUERY:
+            self.conn.servers["lag_checks"] += 1
+            if self.conn.servers["lag"] is None:
+                raise psycopg2.OperationalError("recovery conflict")
+
+    def fetchone(self):
+        return (self.conn.servers["lag"],)
+
+    def close(self):
+        pass
+
+
+# Only the connection routing is real: both servers are fakes, and "lag"
+# is what the replica reports (None makes the lag query fail)
+@pytest.fixture
+def servers(monkeypatch):
+    servers = {"lag": 0.0, "lag_checks": 0, "replica_up": True}
+
+    def connect(dsn=None):
+        if dsn == REPLICA and not servers["replica_up"]:
+            raise psycopg2.OperationalError("could not connect to the replica")
+        return FakeConnection(dsn, servers)
+
+    monkeypatch.setenv("DATABASE_URL", PRIMARY)
+    monkeypatch.setenv("DATABASE_READ_URL", REPLICA)
+    monkeypatch.setattr(db, "connect", connect)
+    monkeypatch.setattr(db, "_pool", None)
+    monkeypatch.setattr(db, "_read_pool", None)
+    monkeypatch.setattr(db, "REPLICA_LAG_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(db, "_replica_state", {key: 0 for key in db._replica_state})
+    return servers
+
+
+@pytest.fixture
+def client(servers):
+    app = Flask(__name__)
+    app.secret_key = "test"
+    db.init_app(app)
+
+    @app.route("/login")
+    def login():
+        session["user_id"] = 7
+        return "ok"
+
+    @app.route("/report")
+    @db.read_only
+    def report():
+        return db.get_db_connection().dsn
+
+    @app.route("/report/primary")
+    @db.read_only
+    def report_primary():
+        return db.get_db_connection(readonly=False).dsn
+
+    @app.route("/save")
+    def save():
+        conn = db.get_db_connection()
+        conn.commit()
+        return conn.dsn
+
+    @app.route("/page")
+    def page():
+        return db.get_db_connection().dsn
+
+    return app.test_client()
+
+
+def served_by(client, path):
+    return client.get(path).get_data(as_text=True)
+
+
+# --- Routing ---
+def test_read_only_views_use_the_replica(client):
+    assert served_by(client, "/report") == REPLICA
+    assert served_by(client, "/page") == PRIMARY
+    assert served_by(client, "/report/primary") == PRIMARY
+    assert db.replica_stats()["reads"] == 1
+
+
+def test_without_a_replica_everything_uses_the_primary(client, monkeypatch):
+    monkeypatch.delenv("DATABASE_READ_URL")
+    assert served_by(client, "/report") == PRIMARY
+    assert db.replica_stats() is None
+
+
+def test_lagging_replica_falls_back_to_the_primary(client, servers):
+    servers["lag"] = db.REPLICA_MAX_LAG + 1
+    assert served_by(client, "/report") == PRIMARY
+    servers["lag"] = 0.0
+    assert served_by(client, "/report") == REPLICA
+    assert db.replica_stats()["fallback_lag"] == 1
+
+
+def test_failed_lag_check_falls_back_to_the_primary(client, servers):
+    servers["lag"] = None
+    assert served_by(client, "/report") == PRIMARY
+    assert db.replica_stats()["fallback_error"] == 1
+
+
+def test_unreachable_replica_is_not_retried_on_every_request(client, servers):
+    servers["replica_up"] = False
+    assert served_by(client, "/report") == PRIMARY
+    servers["replica_up"] = True
+    # Still inside REPLICA_RETRY_AFTER: no connect attempt is made
+    assert served_by(client, "/report") == PRIMARY
+    assert db.replica_stats()["fallback_error"] == 2
+
+    db._replica_state["down_until"] = 0.0
+    assert served_by(client, "/report") == REPLICA
+
+
+def test_lag_is_checked_once_per_interval(client, servers, monkeypatch):
+    monkeypatch.setattr(db, "REPLICA_LAG_CHECK_INTERVAL", 60)
+    served_by(client, "/report")
+    served_by(client, "/report")
+    assert servers["lag_checks"] == 1
+
+
+# --- Read-your-writes ---
+def test_write_pins_the_user_to_the_primary(client, monkeypatch):
+    client.get("/login")
+    assert served_by(client, "/save") == PRIMARY
+    with client.session_transaction() as sess:
+        assert "primary_until" in sess
+
+    assert served_by(client, "/report") == PRIMARY
+    assert db.replica_stats()["fallback_sticky"] == 1
+
+    # Once the window has passed, reads go back to the replica
+    clock = db.time.time() + db.READ_YOUR_WRITES_SECONDS + 1
+    monkeypatch.setattr(db.time, "time", lambda: clock)
+    assert served_by(client, "/report") == REPLICA
+
+
+def test_reads_do_not_pin(client):
+    client.get("/login")
+    served_by(client, "/page")
+    with client.session_transaction() as sess:
+        assert "primary_until" not in sess
+
+
+def test_anonymous_writes_do_not_pin(client):
+    served_by(client, "/save")
+    with client.session_transaction() as sess:
+        assert "primary_until" not in sess
+    assert served_by(client, "/report") == REPLICA
+
+
+def test_no_pin_without_a_replica(client, monkeypatch):
+    monkeypatch.delenv("DATABASE_READ_URL")
+    client.get("/login")
+    served_by(client, "/save")
+    with client.session_transaction() as sess:
+        assert "primary_until" not in sess
@@ -0,0 +1,55 @@
+# --- Minimal PDF writer ---
+# Pages of monospaced text in Courier, one of the standard PDF fonts, so
+# nothing has to be embedded and no PDF library is needed. Enough for
+# tabular reports; text outside Latin-1 is replaced with "?".
+PAGE_WIDTH, PAGE_HEIGHT = 842, 595  # A4 landscape, in points
+MARGIN = 36
+
+
+def escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def line_capacity(font_size=8):
+    # Courier glyphs are 0.6 em wide
+    return int((PAGE_WIDTH - 2 * MARGIN) / (font_size * 0.6))
+
+
+def text_pdf(lines, font_size=8):
+    leading = font_size * 1.25
+    per_page = int((PAGE_HEIGHT - 2 * MARGIN) // leading)
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+    # 1: catalog, 2: page tree, 3: font, then a (page, content) pair per page
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>"]
+    page_ids = []
+    for page_lines in pages:
+        stream = [f"BT /F1 {font_size} Tf {leading} TL {MARGIN} {PAGE_HEIGHT - MARGIN - font_size} Td"]
+        for line in page_lines:
+            stream.append(f"({escape(line)}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1", errors="replace")
+
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        page_ids.append(page_id)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
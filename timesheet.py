@@ -0,0 +1,55 @@
+import os
+
+import business_time
+from cache import TTLCache
+from repository import AttendanceRepository
+
+TIMESHEET_CACHE_TTL = float(os.getenv("TIMESHEET_CACHE_TTL", "300"))
+
+_cache = TTLCache(maxsize=int(os.getenv("TIMESHEET_CACHE_SIZE", "2048")), ttl=TIMESHEET_CACHE_TTL)
+
+
+def fetch_timesheet(cur, employee_id, today):
+    month_start, month_end = business_time.month_bounds(today)
+    timesheet = AttendanceRepository(cur).month_timesheet(employee_id, month_start, month_end)
+    if timesheet is None:
+        return None
+
+    user, records, month_hours = timesheet
+    return {
+        "user": user,
+        "today": next((r for r in records if r.date == today), None),
+        "records": records,
+        "month_hours": month_hours,
+    }
+
+
+# --- Cache ---
+# The key carries the employee's timesheet version, which lives in their
+# session and is bumped by their own clock events. Whichever worker serves
+# the next dashboard therefore misses the cache after a clock-in/out, while
+# repeat visits hit it. The TTL bounds staleness from other writers
+# (kiosk batches, admin edits).
+def cache_key(employee_id, today, version):
+    return (employee_id, today, version)
+
+
+def get_timesheet(cur_factory, employee_id, version, today=None):
+    today = today or business_time.today()
+    key = cache_key(employee_id, today, version)
+    data = _cache.get(key)
+    if data is None:
+        cur = cur_factory()
+        data = fetch_timesheet(cur, employee_id, today)
+        cur.close()
+        if data is not None:
+            _cache.set(key, data)
+    return data
+
+
+def invalidate(employee_id):
+    _cache.delete_where(lambda key: key[0] == employee_id)
+
+
+def cache_stats():
+    return _cache.stats()